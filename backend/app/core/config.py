@@ -39,5 +39,16 @@ class Settings(BaseSettings):
         default=None, validation_alias="GOOGLE_CLIENT_ID"
     )
 
+    # 🧭 Matching de solicitudes -> técnicos
+    matching_enabled: bool = Field(default=True, validation_alias="MATCHING_ENABLED")
+    # cada cuánto (s) se sincroniza el índice en memoria con la DB
+    matching_refresh_seconds: float = Field(
+        default=30.0, validation_alias="MATCHING_REFRESH_SECONDS"
+    )
+    # presupuesto de latencia (ms) para solicitudes URGENT
+    matching_urgent_budget_ms: float = Field(
+        default=50.0, validation_alias="MATCHING_URGENT_BUDGET_MS"
+    )
+
 
 settings = Settings()
@@ -0,0 +1,38 @@
+# backend/app/core/routes.py
+"""
+Chequeo de arranque: cada (método, path) debe tener un solo handler.
+Dos rutas iguales hacen que FastAPI use la primera registrada en silencio.
+"""
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+_PARAM = re.compile(r"\{[^}:]+(:[^}]+)?\}")
+
+
+def _route_key(path: str) -> str:
+    # /cases/{case_id} y /cases/{id} son la misma ruta
+    return _PARAM.sub(lambda m: "{" + (m.group(1) or "") + "}", path)
+
+
+def find_duplicate_routes(app: FastAPI) -> Dict[Tuple[str, str], List[str]]:
+    seen: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        handler = f"{route.endpoint.__module__}.{route.endpoint.__name__}"
+        for method in route.methods or ():
+            seen[(method, _route_key(route.path))].append(handler)
+    return {k: v for k, v in seen.items() if len(v) > 1}
+
+
+def assert_unique_routes(app: FastAPI) -> None:
+    dupes = find_duplicate_routes(app)
+    if dupes:
+        lines = [f"{m} {p}: {', '.join(h)}" for (m, p), h in sorted(dupes.items())]
+        raise RuntimeError("Rutas duplicadas:\n" + "\n".join(lines))
@@ -0,0 +1,23 @@
+# backend/app/core/text.py
+import re
+import unicodedata
+from typing import Optional
+
+
+def normalize_key(value: Optional[str]) -> str:
+    """'Plomería ' -> 'PLOMERIA' (sin tildes, mayúsculas)."""
+    s = unicodedata.normalize("NFKD", value or "")
+    s = s.encode("ascii", "ignore").decode("ascii")
+    return " ".join(s.upper().split())
+
+
+def normalize_search_text(value: Optional[str]) -> str:
+    """
+    Normalización para búsqueda (español, sin tildes):
+    'José Pérez <JOSE@Mail.com>' -> 'jose perez jose@mail.com'
+    """
+    s = unicodedata.normalize("NFKD", value or "")
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    s = s.lower()
+    s = re.sub(r"[^a-z0-9@._\-\s]", " ", s)
+    return " ".join(s.split())
@@ -2,8 +2,9 @@
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import inspect, text
 
-from .core.database import Base, engine
+from .core.database import Base, SessionLocal, engine
 
 # ✅ Importar modelos (side effects: registrar tablas)
 from .models.user import User  # noqa: F401
@@ -15,15 +16,24 @@ from .models.technician_verification import (  # noqa: F401
     VerificationDocument,
     VerificationAuditLog,
 )
+from .models.technician_directory import (  # noqa: F401
+    TechnicianDirectoryEntry,
+    TechnicianDirectoryCategory,
+)
+from .models.search_document import SearchDocument  # noqa: F401
 
 from .routers import (
     auth,
     requests,
     worker_applications,
     technician_verification,
-    admin_technician_verification,
-    admin_worker_applications,
+    admin,
+    workers,
+    search,
 )
+from .core.routes import assert_unique_routes
+from .services.technician_directory import ensure_directory
+from .services.search import ensure_search_index  # registra el indexador (after_flush)
 
 app = FastAPI(title="SIPH API")
 
@@ -58,19 +68,49 @@ app.add_middleware(
 # ✅ Crear tablas (modo prototipo/dev)
 Base.metadata.create_all(bind=engine)
 
+# ✅ create_all tampoco agrega columnas nuevas a tablas que ya existen
+#    (todas nullable: ADD COLUMN no necesita default)
+_NEW_COLUMNS = {
+    ServiceRequest.__table__: ("assigned_tech_id", "assigned_at", "match_score"),
+    TechnicianProfile.__table__: ("lat", "lng"),
+}
+with engine.begin() as _conn:
+    for _table, _names in _NEW_COLUMNS.items():
+        _existing = {c["name"] for c in inspect(_conn).get_columns(_table.name)}
+        for _name in _names:
+            if _name in _existing:
+                continue
+            _col = _table.c[_name]
+            _ddl = f"ALTER TABLE {_table.name} ADD COLUMN {_name} {_col.type.compile(dialect=engine.dialect)}"
+            for _fk in _col.foreign_keys:
+                _ddl += f" REFERENCES {_fk.column.table.name} ({_fk.column.name})"
+            _conn.execute(text(_ddl))
+
+# ✅ create_all no agrega índices nuevos a tablas que ya existen
+for _ix in (*WorkerApplication.__table__.indexes, *ServiceRequest.__table__.indexes):
+    _ix.create(bind=engine, checkfirst=True)
+
+# ✅ Directorio público materializado (primer arranque)
+with SessionLocal() as _db:
+    ensure_directory(_db)
+    ensure_search_index(_db)
+
 # =========================
 # Routers
 # =========================
 app.include_router(auth.router)
 app.include_router(requests.router)
+app.include_router(search.router)                      # /search
+
+# PUBLIC routes
+app.include_router(workers.router)                     # /workers (directorio)
 
 # USER routes
 app.include_router(worker_applications.router)         # /worker-applications/me
 app.include_router(technician_verification.router)     # /tech/verification/me
 
-# ADMIN routes
-app.include_router(admin_worker_applications.router)        # /admin/worker-applications
-app.include_router(admin_technician_verification.router)    # /admin/tech/verification
+# ADMIN routes (/admin/worker-applications, /admin/tech/verification)
+app.include_router(admin.router)
 
 # =========================
 # Healthcheck
@@ -78,3 +118,7 @@ app.include_router(admin_technician_verification.router)    # /admin/tech/verifi
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+# ✅ falla al arrancar si dos handlers comparten método + path
+assert_unique_routes(app)
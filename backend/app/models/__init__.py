@@ -7,6 +7,8 @@ from .technician_verification import (
     VerificationDocument,
     VerificationAuditLog,
 )
+from .technician_directory import TechnicianDirectoryEntry, TechnicianDirectoryCategory
+from .search_document import SearchDocument
 
 __all__ = [
     "User",
@@ -17,4 +19,7 @@ __all__ = [
     "VerificationCase",
     "VerificationDocument",
     "VerificationAuditLog",
+    "TechnicianDirectoryEntry",
+    "TechnicianDirectoryCategory",
+    "SearchDocument",
 ]
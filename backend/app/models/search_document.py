@@ -0,0 +1,104 @@
+# backend/app/models/search_document.py
+from datetime import datetime
+
+from sqlalchemy import DDL, Column, DateTime, Index, Integer, String, Text, event
+
+from ..core.database import Base
+
+
+class SearchDocument(Base):
+    """
+    Índice de búsqueda (una fila por entidad buscable). Lo mantiene
+    app/services/search.py en el mismo flush que modifica la entidad.
+
+    - PostgreSQL: columna generada `tsv` (tsvector 'spanish') + GIN, y GIN trigram
+      sobre `content` como fallback.
+    - SQLite: tabla virtual FTS5 `search_documents_fts` sincronizada por triggers.
+    """
+
+    __tablename__ = "search_documents"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    entity_type = Column(String(30), nullable=False)  # request | worker_application | user
+    entity_id = Column(Integer, nullable=False)
+    # dueño (para que un USER solo encuentre lo suyo)
+    user_id = Column(Integer, nullable=True, index=True)
+
+    # para mostrar
+    title = Column(String(200), nullable=False)
+    subtitle = Column(String(300), nullable=True)
+
+    # normalizado (minúsculas, sin tildes) -> lo que se indexa
+    title_norm = Column(String(200), nullable=False)
+    content = Column(Text, nullable=False)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+Index(
+    "ux_search_documents_entity",
+    SearchDocument.entity_type,
+    SearchDocument.entity_id,
+    unique=True,
+)
+
+
+# =========================
+# DDL por dialecto
+# =========================
+_PG_DDL = [
+    """
+    ALTER TABLE search_documents ADD COLUMN tsv tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', coalesce(title_norm, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX ix_search_documents_tsv ON search_documents USING GIN (tsv)",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX ix_search_documents_trgm ON search_documents USING GIN (content gin_trgm_ops)",
+]
+
+_SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5(
+        title_norm, content,
+        content='search_documents', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN
+        INSERT INTO search_documents_fts(rowid, title_norm, content)
+        VALUES (new.id, new.title_norm, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN
+        INSERT INTO search_documents_fts(search_documents_fts, rowid, title_norm, content)
+        VALUES ('delete', old.id, old.title_norm, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN
+        INSERT INTO search_documents_fts(search_documents_fts, rowid, title_norm, content)
+        VALUES ('delete', old.id, old.title_norm, old.content);
+        INSERT INTO search_documents_fts(rowid, title_norm, content)
+        VALUES (new.id, new.title_norm, new.content);
+    END
+    """,
+]
+
+for _stmt in _PG_DDL:
+    event.listen(
+        SearchDocument.__table__,
+        "after_create",
+        DDL(_stmt).execute_if(dialect="postgresql"),
+    )
+for _stmt in _SQLITE_DDL:
+    event.listen(
+        SearchDocument.__table__,
+        "after_create",
+        DDL(_stmt).execute_if(dialect="sqlite"),
+    )
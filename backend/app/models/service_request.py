@@ -75,6 +75,13 @@ class ServiceRequest(Base):
 
     status = Column(Enum(RequestStatus), nullable=False, default=RequestStatus.CREATED)
 
+    # 🧭 Matching (técnico asignado por app/services/matching.py)
+    assigned_tech_id = Column(
+        Integer, ForeignKey("technician_profiles.id"), nullable=True, index=True
+    )
+    assigned_at = Column(DateTime, nullable=True)
+    match_score = Column(Float, nullable=True)
+
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -0,0 +1,96 @@
+# backend/app/models/technician_directory.py
+from datetime import datetime
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    String,
+    Text,
+)
+from sqlalchemy.orm import relationship
+
+from ..core.database import Base
+from .technician_verification import TechLevel
+
+
+class TechnicianDirectoryEntry(Base):
+    """
+    Directorio público (/workers) materializado: una fila por técnico VERIFICADO.
+    Se recalcula desde app/services/technician_directory.py al decidir un caso
+    o al actualizar el perfil; las lecturas públicas no tocan las tablas de
+    verificación.
+    """
+
+    __tablename__ = "technician_directory"
+
+    tech_id = Column(
+        Integer,
+        ForeignKey("technician_profiles.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    public_name = Column(String(120), nullable=False)
+    public_photo_url = Column(String(500), nullable=True)
+    city = Column(String(80), nullable=True)
+    city_key = Column(String(80), nullable=True, index=True)  # normalizada (sin tildes)
+    radius_km = Column(Integer, nullable=True)
+    categories = Column(JSON, default=list, nullable=False)
+
+    specialty = Column(String(120), nullable=True)
+    years_experience = Column(Integer, nullable=True)
+    bio = Column(Text, nullable=True)
+
+    badge_level = Column(Enum(TechLevel), default=TechLevel.BASIC, nullable=False)
+
+    # reputación (aún no hay reseñas en el backend -> None / 0)
+    rating = Column(Float, nullable=True)
+    reviews_count = Column(Integer, default=0, nullable=False)
+
+    # orden del listado (badge + rating), precalculado para keyset pagination
+    sort_key = Column(Integer, default=0, nullable=False)
+
+    verified_at = Column(DateTime, nullable=True)
+    expires_at = Column(DateTime, nullable=True)
+    refreshed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    category_keys = relationship(
+        "TechnicianDirectoryCategory",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+
+class TechnicianDirectoryCategory(Base):
+    __tablename__ = "technician_directory_categories"
+
+    tech_id = Column(
+        Integer,
+        ForeignKey("technician_directory.tech_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    category_key = Column(String(80), primary_key=True)
+
+
+# Índices del listado
+Index(
+    "ix_directory_sort",
+    TechnicianDirectoryEntry.sort_key,
+    TechnicianDirectoryEntry.tech_id,
+)
+Index(
+    "ix_directory_city_sort",
+    TechnicianDirectoryEntry.city_key,
+    TechnicianDirectoryEntry.sort_key,
+    TechnicianDirectoryEntry.tech_id,
+)
+Index(
+    "ix_directory_category",
+    TechnicianDirectoryCategory.category_key,
+    TechnicianDirectoryCategory.tech_id,
+)
@@ -8,6 +8,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
     Integer,
     String,
@@ -75,6 +76,9 @@ class TechnicianProfile(Base):
     public_photo_url = Column(String(500), nullable=True)
     city = Column(String(80), nullable=True)
     radius_km = Column(Integer, default=5, nullable=False)
+    # 📍 Geo (centro de la zona de cobertura; lo usa el matching)
+    lat = Column(Float, nullable=True)
+    lng = Column(Float, nullable=True)
     categories = Column(JSON, default=list, nullable=False)
 
     badge_level = Column(Enum(TechLevel), default=TechLevel.BASIC, nullable=False)
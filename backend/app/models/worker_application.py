@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from ..core.database import Base
@@ -44,3 +44,8 @@ class WorkerApplication(Base):
 
     def touch(self):
         self.updated_at = datetime.utcnow()
+
+
+# Índices del listado admin (filtro por estado + orden por actualización)
+Index("ix_worker_apps_status_updated", WorkerApplication.status, WorkerApplication.updated_at)
+Index("ix_worker_apps_updated", WorkerApplication.updated_at)
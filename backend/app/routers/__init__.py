@@ -6,6 +6,9 @@ from . import (
     technician_verification,
     admin_technician_verification,
     admin_worker_applications,
+    admin,
+    workers,
+    search,
 )
 
 __all__ = [
@@ -15,4 +18,7 @@ __all__ = [
     "admin_worker_applications",
     "technician_verification",
     "admin_technician_verification",
+    "admin",
+    "workers",
+    "search",
 ]
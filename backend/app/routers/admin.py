@@ -0,0 +1,14 @@
+# backend/app/routers/admin.py
+"""
+Capa admin: una sola implementación por ruta.
+
+- /admin/worker-applications  -> admin_worker_applications
+- /admin/tech/verification    -> admin_technician_verification
+"""
+from fastapi import APIRouter
+
+from . import admin_technician_verification, admin_worker_applications
+
+router = APIRouter()
+router.include_router(admin_worker_applications.router)
+router.include_router(admin_technician_verification.router)
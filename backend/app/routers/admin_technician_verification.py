@@ -7,7 +7,7 @@ from pathlib import Path
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import FileResponse, RedirectResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
 
 from ..core.database import get_db
 from ..core.deps import get_current_user, require_roles
@@ -20,6 +20,7 @@ from ..models.technician_verification import (
     TechStatus,
     TechLevel,
 )
+from ..services.technician_directory import refresh_directory_entry
 
 router = APIRouter(prefix="/admin/tech/verification", tags=["Admin Tech Verification"])
 
@@ -140,7 +141,15 @@ def list_cases(
 ):
     require_roles("ADMIN", "VERIFIER")(user)
 
-    q = db.query(VerificationCase)
+    # una sola consulta (sin N+1 ni selectin de documents/logs)
+    q = db.query(
+        VerificationCase.id,
+        VerificationCase.tech_id,
+        VerificationCase.target_level,
+        VerificationCase.status,
+        VerificationCase.created_at,
+        TechnicianProfile.public_name,
+    ).outerjoin(TechnicianProfile, TechnicianProfile.id == VerificationCase.tech_id)
     if status:
         try:
             q = q.filter(VerificationCase.status == TechStatus(status))
@@ -150,26 +159,19 @@ def list_cases(
                 detail="status inválido (PENDING|IN_REVIEW|VERIFIED|REJECTED).",
             )
 
-    cases = q.order_by(VerificationCase.created_at.desc()).limit(min(limit, 200)).all()
+    rows = q.order_by(VerificationCase.created_at.desc()).limit(min(limit, 200)).all()
 
-    out = []
-    for c in cases:
-        tech = (
-            db.query(TechnicianProfile)
-            .filter(TechnicianProfile.id == c.tech_id)
-            .first()
-        )
-        out.append(
-            {
-                "caseId": c.id,
-                "techId": c.tech_id,
-                "publicName": tech.public_name if tech else "—",
-                "targetLevel": c.target_level.value,
-                "status": c.status.value,
-                "createdAt": c.created_at.isoformat(),
-            }
-        )
-    return out
+    return [
+        {
+            "caseId": r.id,
+            "techId": r.tech_id,
+            "publicName": r.public_name or "—",
+            "targetLevel": r.target_level.value,
+            "status": r.status.value,
+            "createdAt": r.created_at.isoformat(),
+        }
+        for r in rows
+    ]
 
 
 @router.get("/cases/by-user/{user_id}")
@@ -180,24 +182,18 @@ def latest_case_by_user(
 ):
     require_roles("ADMIN", "VERIFIER")(user)
 
-    tech = (
-        db.query(TechnicianProfile)
+    case_id = (
+        db.query(VerificationCase.id)
+        .join(TechnicianProfile, TechnicianProfile.id == VerificationCase.tech_id)
         .filter(TechnicianProfile.user_id == user_id)
-        .first()
-    )
-    if not tech:
-        return {"hasCase": False}
-
-    c = (
-        db.query(VerificationCase)
-        .filter(VerificationCase.tech_id == tech.id)
         .order_by(VerificationCase.created_at.desc())
-        .first()
+        .limit(1)
+        .scalar()
     )
-    if not c:
+    if case_id is None:
         return {"hasCase": False}
 
-    return case_detail(c.id, db, user)
+    return case_detail(case_id, db, user)
 
 
 @router.get("/cases/{case_id}")
@@ -208,15 +204,22 @@ def case_detail(
 ):
     require_roles("ADMIN", "VERIFIER")(user)
 
-    c = db.query(VerificationCase).filter(VerificationCase.id == case_id).first()
-    if not c:
-        raise HTTPException(status_code=404, detail="Caso no encontrado.")
-
-    tech = (
-        db.query(TechnicianProfile)
-        .filter(TechnicianProfile.id == c.tech_id)
+    row = (
+        db.query(
+            VerificationCase,
+            TechnicianProfile.public_name,
+            TechnicianProfile.city,
+            TechnicianProfile.specialty,
+            TechnicianProfile.user_id,
+        )
+        .outerjoin(TechnicianProfile, TechnicianProfile.id == VerificationCase.tech_id)
+        .options(lazyload("*"))
+        .filter(VerificationCase.id == case_id)
         .first()
     )
+    if not row:
+        raise HTTPException(status_code=404, detail="Caso no encontrado.")
+    c, tech = row[0], row
 
     docs = (
         db.query(VerificationDocument)
@@ -239,10 +242,10 @@ def case_detail(
         "expiresAt": c.expires_at.isoformat() if getattr(c, "expires_at", None) else None,
         "decidedBy": getattr(c, "decided_by", None),
         "tech": {
-            "publicName": tech.public_name if tech else "—",
-            "city": tech.city if tech else "—",
-            "specialty": tech.specialty if tech else "—",
-            "userId": tech.user_id if tech else None,
+            "publicName": tech.public_name or "—",
+            "city": tech.city or "—",
+            "specialty": tech.specialty or "—",
+            "userId": tech.user_id,
         },
         "documents": [
             {
@@ -379,7 +382,12 @@ def decide_case(
 ):
     require_roles("ADMIN", "VERIFIER")(user)
 
-    c = db.query(VerificationCase).filter(VerificationCase.id == case_id).first()
+    c = (
+        db.query(VerificationCase)
+        .options(lazyload("*"))
+        .filter(VerificationCase.id == case_id)
+        .first()
+    )
     if not c:
         raise HTTPException(status_code=404, detail="Caso no encontrado.")
 
@@ -390,7 +398,12 @@ def decide_case(
         c.reason = None
         c.verified_at = _now()
 
-        tech = db.query(TechnicianProfile).filter(TechnicianProfile.id == c.tech_id).first()
+        tech = (
+            db.query(TechnicianProfile)
+            .options(lazyload("*"))
+            .filter(TechnicianProfile.id == c.tech_id)
+            .first()
+        )
         if tech:
             tech.badge_level = c.target_level
 
@@ -418,6 +431,9 @@ def decide_case(
         "DECIDE",
         {"decision": dec, "reason": c.reason, "notes": decision_notes},
     )
+
+    # ✅ directorio público (/workers)
+    refresh_directory_entry(db, c.tech_id)
     db.commit()
 
     return {
@@ -439,6 +455,7 @@ def case_logs(
 
     logs = (
         db.query(VerificationAuditLog)
+        .options(lazyload("*"))
         .filter(VerificationAuditLog.case_id == case_id)
         .order_by(VerificationAuditLog.created_at.asc())
         .all()
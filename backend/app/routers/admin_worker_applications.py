@@ -1,33 +1,60 @@
 # backend/app/routers/admin_worker_applications.py
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
 
 from ..core.database import get_db
 from ..core.deps import require_roles
-from ..models import User, WorkerApplication
-from ..schemas.worker_application import AdminWorkerApplicationOut, WorkerApplicationDecision
+from ..models import User, WorkerApplication, WorkerApplicationStatus
+from ..schemas.worker_application import (
+    AdminWorkerApplicationOut,
+    WorkerApplicationAdminPage,
+    WorkerApplicationDecision,
+)
+from ..services.worker_applications import DEFAULT_LIMIT, MAX_LIMIT, list_applications_page
 
 router = APIRouter(prefix="/admin/worker-applications", tags=["admin-worker-applications"])
 
 
-@router.get("", response_model=List[AdminWorkerApplicationOut])
+@router.get("", response_model=WorkerApplicationAdminPage)
 def list_apps(
     status_filter: Optional[str] = Query(default=None, description="PENDING|APPROVED|REJECTED"),
+    q: Optional[str] = Query(default=None, max_length=200, description="nombre, email, ciudad, especialidad o bio"),
+    sort: str = Query(default="updated_at", description="updated_at|name|status|years_experience"),
+    order: str = Query(default="desc", description="asc|desc"),
+    limit: int = Query(default=DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     _: User = Depends(require_roles("ADMIN")),
 ):
-    q = db.query(WorkerApplication).options(joinedload(WorkerApplication.user))
+    return list_applications_page(
+        db,
+        status_filter=status_filter,
+        q=q,
+        sort=sort,
+        order=order,
+        limit=limit,
+        cursor=cursor,
+    )
 
-    if status_filter:
-        st = status_filter.upper().strip()
-        if st not in ("PENDING", "APPROVED", "REJECTED"):
-            raise HTTPException(status_code=400, detail="status_filter inválido")
-        q = q.filter(WorkerApplication.status == st)
 
-    return q.order_by(WorkerApplication.created_at.desc()).all()
+@router.get("/{app_id}", response_model=AdminWorkerApplicationOut)
+def get_app(
+    app_id: int,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_roles("ADMIN")),
+):
+    app = (
+        db.query(WorkerApplication)
+        .options(joinedload(WorkerApplication.user))
+        .filter(WorkerApplication.id == app_id)
+        .first()
+    )
+    if not app:
+        raise HTTPException(status_code=404, detail="Solicitud no encontrada.")
+    return app
 
 
 @router.patch("/{app_id}", response_model=AdminWorkerApplicationOut)
@@ -46,27 +73,18 @@ def decide_app(
     if not app:
         raise HTTPException(status_code=404, detail="Solicitud no encontrada.")
 
-    dec = payload.decision.upper().strip()
-
-    if dec == "APPROVE":
-        app.status = "APPROVED"
-        app.admin_notes = payload.admin_notes
-        app.reviewed_by = admin.id
-        app.reviewed_at = datetime.utcnow()
-        app.touch()
+    # acepta decision (APPROVE|REJECT) o status (APPROVED|REJECTED)
+    new_status = WorkerApplicationStatus(payload.normalized_status())
 
-        # ✅ PROMOVER A WORKER
-        if app.user and app.user.role != "ADMIN":
-            app.user.role = "WORKER"
+    app.status = new_status.value
+    app.admin_notes = payload.admin_notes
+    app.reviewed_by = admin.id
+    app.reviewed_at = datetime.utcnow()
+    app.touch()
 
-    elif dec == "REJECT":
-        app.status = "REJECTED"
-        app.admin_notes = payload.admin_notes
-        app.reviewed_by = admin.id
-        app.reviewed_at = datetime.utcnow()
-        app.touch()
-    else:
-        raise HTTPException(status_code=400, detail="decision inválida (APPROVE|REJECT).")
+    # ✅ PROMOVER A WORKER
+    if new_status == WorkerApplicationStatus.APPROVED and app.user and app.user.role != "ADMIN":
+        app.user.role = "WORKER"
 
     db.commit()
     db.refresh(app)
@@ -4,10 +4,12 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from ..core.config import settings
 from ..core.database import get_db
 from ..core.deps import get_current_user
 from ..models.service_request import ServiceRequest, RequestStatus
 from ..schemas.request import ServiceRequestCreate, ServiceRequestOut, ServiceRequestListItem
+from ..services.matching import match_request, release_request
 
 router = APIRouter(prefix="/requests", tags=["requests"])
 
@@ -46,6 +48,12 @@ def create_request(
     )
     db.add(req)
     db.commit()
+
+    # 🧭 Matching: CREATED -> MATCHING -> ASSIGNED (si hay técnico disponible)
+    if settings.matching_enabled:
+        match_request(db, req)
+        db.commit()
+
     db.refresh(req)
     return req
 
@@ -100,6 +108,7 @@ def cancel_request(
             detail="No puedes cancelar una solicitud finalizada.",
         )
 
+    release_request(req)
     req.status = RequestStatus.CANCELED
     db.commit()
     db.refresh(req)
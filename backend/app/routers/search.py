@@ -0,0 +1,68 @@
+# backend/app/routers/search.py
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from ..core.database import get_db
+from ..core.deps import get_current_user
+from ..models import User
+from ..schemas.search import SearchHitOut, SearchResponse
+from ..services.search import ENTITY_REQUEST, ENTITY_TYPES, search_documents
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=SearchResponse)
+def search(
+    q: str = Query(..., min_length=2, max_length=200),
+    types: Optional[str] = Query(
+        default=None, description="request,worker_application,user (separados por coma)"
+    ),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, le=10000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    requested = [t.strip().lower() for t in (types or "").split(",") if t.strip()]
+    invalid = [t for t in requested if t not in ENTITY_TYPES]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"types inválido: {', '.join(invalid)} (request|worker_application|user).",
+        )
+
+    # ✅ ADMIN busca en todo; el resto solo en sus propias solicitudes
+    owner_id = None
+    if (current_user.role or "USER").upper() != "ADMIN":
+        if any(t != ENTITY_REQUEST for t in requested):
+            raise HTTPException(status_code=403, detail="No tienes permisos para esta acción.")
+        requested = [ENTITY_REQUEST]
+        owner_id = current_user.id
+
+    hits, has_more, engine = search_documents(
+        db,
+        q,
+        types=requested or ENTITY_TYPES,
+        user_id=owner_id,
+        limit=limit,
+        offset=offset,
+    )
+
+    return SearchResponse(
+        items=[
+            SearchHitOut(
+                type=h.entity_type,
+                id=h.entity_id,
+                user_id=h.user_id,
+                title=h.title,
+                subtitle=h.subtitle,
+                rank=round(h.rank, 6),
+            )
+            for h in hits
+        ],
+        limit=limit,
+        offset=offset,
+        has_more=has_more,
+        engine=engine,
+    )
@@ -1,5 +1,6 @@
 # backend/app/routers/technician_verification.py
 import json
+import math
 import hashlib
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -28,6 +29,7 @@ from ..schemas.technician_verification import (
     OkResponse,
     UploadDocResponse,
 )
+from ..services.technician_directory import refresh_directory_entry
 
 router = APIRouter(prefix="/tech/verification", tags=["Tech Verification"])
 
@@ -60,6 +62,21 @@ def _safe_ext(file: UploadFile) -> str:
     return ""
 
 
+def _coordinate(value: Any, limit: float, field: str) -> Optional[float]:
+    """None si no viene; float dentro de ±limit o 400."""
+    if value is None or value == "":
+        return None
+    try:
+        if isinstance(value, bool):
+            raise TypeError(field)
+        out = float(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"{field} debe ser un número.")
+    if not math.isfinite(out) or abs(out) > limit:
+        raise HTTPException(status_code=400, detail=f"{field} fuera de rango (±{limit:g}).")
+    return out
+
+
 def _log(db: Session, case_id: int, actor_id: Optional[int], action: str, detail: Dict[str, Any]):
     db.add(
         VerificationAuditLog(
@@ -146,6 +163,12 @@ def upsert_profile(
             detail="Debes aceptar Términos, Privacidad y autorizar verificación de documentos.",
         )
 
+    # 📍 el índice espacial del matching necesita números válidos (o ninguno)
+    lat = _coordinate(pub.get("lat"), 90.0, "public.lat")
+    lng = _coordinate(pub.get("lng"), 180.0, "public.lng")
+    if (lat is None) != (lng is None):
+        raise HTTPException(status_code=400, detail="public.lat y public.lng van juntos.")
+
     profile = db.query(TechnicianProfile).filter(TechnicianProfile.user_id == user.id).first()
     if not profile:
         profile = TechnicianProfile(user_id=user.id)
@@ -155,6 +178,8 @@ def upsert_profile(
     profile.city = pub["city"]
     profile.radius_km = int(pub.get("radius_km") or 5)
     profile.categories = pub.get("categories") or []
+    profile.lat = lat
+    profile.lng = lng
 
     profile.doc_type = priv["doc_type"]
     profile.doc_number = priv["doc_number"]
@@ -177,6 +202,10 @@ def upsert_profile(
     db.commit()
     db.refresh(profile)
 
+    # ✅ datos públicos -> directorio /workers (solo si ya está verificado)
+    refresh_directory_entry(db, profile.id)
+    db.commit()
+
     case = _latest_case_db(db, profile.id)
     if case:
         _log(
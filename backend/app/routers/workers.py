@@ -0,0 +1,139 @@
+# backend/app/routers/workers.py
+"""
+Directorio público de técnicos (/workers).
+
+Lee solo de `technician_directory` (materializado), nunca de las tablas de
+verificación. Respuestas con ETag + Cache-Control.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import and_, exists, or_
+from sqlalchemy.orm import Session
+
+from ..core.database import get_db
+from ..core.text import normalize_key
+from ..models.technician_directory import (
+    TechnicianDirectoryCategory,
+    TechnicianDirectoryEntry,
+)
+from ..schemas.worker_directory import WorkerDirectoryPage, WorkerPublicOut
+
+router = APIRouter(prefix="/workers", tags=["workers"])
+
+CACHE_MAX_AGE = 60
+CACHE_CONTROL = f"public, max-age={CACHE_MAX_AGE}, stale-while-revalidate={CACHE_MAX_AGE * 5}"
+
+
+def _encode_cursor(sort_key: int, tech_id: int) -> str:
+    raw = f"{sort_key}:{tech_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_key, tech_id = base64.urlsafe_b64decode(padded).decode().split(":", 1)
+        return int(sort_key), int(tech_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="cursor inválido.")
+
+
+def _cached_json(request: Request, payload: dict) -> Response:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+    if_none_match = request.headers.get("if-none-match") or ""
+    if etag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _visible(now: datetime):
+    return or_(
+        TechnicianDirectoryEntry.expires_at.is_(None),
+        TechnicianDirectoryEntry.expires_at > now,
+    )
+
+
+@router.get("", response_model=WorkerDirectoryPage)
+def list_workers(
+    request: Request,
+    city: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    q = db.query(TechnicianDirectoryEntry).filter(_visible(datetime.utcnow()))
+
+    if city and normalize_key(city):
+        q = q.filter(TechnicianDirectoryEntry.city_key == normalize_key(city))
+
+    if category and normalize_key(category):
+        q = q.filter(
+            exists().where(
+                TechnicianDirectoryCategory.tech_id == TechnicianDirectoryEntry.tech_id,
+                TechnicianDirectoryCategory.category_key == normalize_key(category),
+            )
+        )
+
+    if cursor:
+        sort_key, tech_id = _decode_cursor(cursor)
+        q = q.filter(
+            or_(
+                TechnicianDirectoryEntry.sort_key < sort_key,
+                and_(
+                    TechnicianDirectoryEntry.sort_key == sort_key,
+                    TechnicianDirectoryEntry.tech_id < tech_id,
+                ),
+            )
+        )
+
+    rows = (
+        q.order_by(
+            TechnicianDirectoryEntry.sort_key.desc(),
+            TechnicianDirectoryEntry.tech_id.desc(),
+        )
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].sort_key, rows[-1].tech_id)
+
+    page = WorkerDirectoryPage(
+        items=[WorkerPublicOut.model_validate(r) for r in rows],
+        next_cursor=next_cursor,
+    )
+    return _cached_json(request, page.model_dump(mode="json"))
+
+
+@router.get("/{tech_id}", response_model=WorkerPublicOut)
+def get_worker(
+    tech_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    entry = (
+        db.query(TechnicianDirectoryEntry)
+        .filter(
+            TechnicianDirectoryEntry.tech_id == tech_id,
+            _visible(datetime.utcnow()),
+        )
+        .first()
+    )
+    if not entry:
+        raise HTTPException(status_code=404, detail="Técnico no encontrado.")
+
+    return _cached_json(request, WorkerPublicOut.model_validate(entry).model_dump(mode="json"))
@@ -91,6 +91,11 @@ class ServiceRequestOut(BaseModel):
     contact_pref: Optional[str] = None
 
     status: str
+
+    assigned_tech_id: Optional[int] = None
+    assigned_at: Optional[datetime] = None
+    match_score: Optional[float] = None
+
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class SearchHitOut(BaseModel):
+    type: str  # request | worker_application | user
+    id: int
+    user_id: Optional[int] = None
+    title: str
+    subtitle: Optional[str] = None
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    items: List[SearchHitOut]
+    limit: int
+    offset: int
+    has_more: bool
+    engine: str  # postgres-fts | postgres-trgm | sqlite-fts5 | like
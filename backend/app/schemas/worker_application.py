@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 
 from pydantic import BaseModel, ConfigDict, model_validator
 
@@ -55,6 +55,21 @@ class WorkerApplicationAdminOut(WorkerApplicationOut):
 AdminWorkerApplicationOut = WorkerApplicationAdminOut
 
 
+class WorkerApplicationStatusCounts(BaseModel):
+    PENDING: int = 0
+    APPROVED: int = 0
+    REJECTED: int = 0
+    total: int = 0
+
+
+class WorkerApplicationAdminPage(BaseModel):
+    items: List[WorkerApplicationAdminOut]
+    # keyset pagination: pásalo como ?cursor=... (mismo sort/order)
+    next_cursor: Optional[str] = None
+    # conteo global por estado (no depende de status_filter)
+    counts: WorkerApplicationStatusCounts
+
+
 class WorkerApplicationDecision(BaseModel):
     # compatibilidad vieja
     decision: Optional[Literal["APPROVE", "REJECT"]] = None
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class WorkerPublicOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    tech_id: int
+    public_name: str
+    public_photo_url: Optional[str] = None
+    city: Optional[str] = None
+    radius_km: Optional[int] = None
+    categories: List[str] = []
+
+    specialty: Optional[str] = None
+    years_experience: Optional[int] = None
+    bio: Optional[str] = None
+
+    badge_level: str
+    rating: Optional[float] = None
+    reviews_count: int = 0
+
+    verified_at: Optional[datetime] = None
+
+
+class WorkerDirectoryPage(BaseModel):
+    items: List[WorkerPublicOut]
+    # keyset pagination: pásalo como ?cursor=... para la siguiente página
+    next_cursor: Optional[str] = None
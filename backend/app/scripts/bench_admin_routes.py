@@ -0,0 +1,242 @@
+# backend/app/scripts/bench_admin_routes.py
+"""
+Benchmark de las rutas admin consolidadas: consultas SQL y latencia por request.
+
+Levanta la app sobre una SQLite temporal (no toca la DB configurada), siembra
+datos sintéticos y llama cada ruta con un token ADMIN. Sale con código 1 si
+alguna ruta supera su presupuesto de consultas.
+
+Uso (desde backend/):
+    python -m app.scripts.bench_admin_routes --cases 2000 --apps 2000 --iterations 50
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# La DB se define antes de importar la app (engine se crea al importar)
+_TMP_DIR = tempfile.mkdtemp(prefix="siph-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP_DIR, 'bench.db')}"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event, insert  # noqa: E402
+
+from app.core.database import engine  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.technician_verification import (  # noqa: E402
+    DocType,
+    TechLevel,
+    TechStatus,
+    TechnicianProfile,
+    VerificationAuditLog,
+    VerificationCase,
+    VerificationDocument,
+)
+from app.models.user import User  # noqa: E402
+from app.models.worker_application import WorkerApplication  # noqa: E402
+
+ADMIN_EMAIL = "bench-admin@siph.local"
+CITIES = ["Bogotá", "Soacha", "Chía", "Mosquera"]
+STATUSES = list(TechStatus)
+APP_STATUSES = ["PENDING", "APPROVED", "REJECTED"]
+
+# (nombre, path, máximo de consultas por request; incluye la del usuario autenticado)
+ROUTES = [
+    ("worker-apps list", "/admin/worker-applications?limit=50", 3),
+    ("worker-apps list (PENDING, name)", "/admin/worker-applications?status_filter=PENDING&sort=name&limit=50", 3),
+    ("worker-app detail", "/admin/worker-applications/{app_id}", 2),
+    ("verification cases", "/admin/tech/verification/cases?status=IN_REVIEW&limit=50", 2),
+    ("verification case detail", "/admin/tech/verification/cases/{case_id}", 3),
+    ("verification case by user", "/admin/tech/verification/cases/by-user/{user_id}", 4),
+    ("verification case logs", "/admin/tech/verification/cases/{case_id}/logs", 2),
+]
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(pct / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def _seed(rng: random.Random, n_cases: int, n_apps: int, docs_per_case: int) -> dict:
+    now = datetime.utcnow()
+    n_users = max(n_cases, n_apps)
+
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User.__table__),
+            [
+                {
+                    "first_name": "Admin",
+                    "last_name": "Bench",
+                    "email": ADMIN_EMAIL,
+                    "password_hash": "x",
+                    "role": "ADMIN",
+                    "is_active": True,
+                }
+            ]
+            + [
+                {
+                    "first_name": f"Nombre{i}",
+                    "last_name": f"Apellido{i}",
+                    "email": f"user{i}@siph.local",
+                    "password_hash": "x",
+                    "role": "USER",
+                    "is_active": True,
+                }
+                for i in range(1, n_users + 1)
+            ],
+        )
+        # ids 2..n_users+1 (el admin es el 1)
+        user_ids = list(range(2, n_users + 2))
+
+        conn.execute(
+            insert(WorkerApplication.__table__),
+            [
+                {
+                    "user_id": user_ids[i],
+                    "city": rng.choice(CITIES),
+                    "specialty": "Electricidad",
+                    "years_experience": rng.randint(0, 20),
+                    "status": rng.choice(APP_STATUSES),
+                    "created_at": now - timedelta(minutes=i),
+                    "updated_at": now - timedelta(minutes=rng.randint(0, 10000)),
+                }
+                for i in range(n_apps)
+            ],
+        )
+
+        conn.execute(
+            insert(TechnicianProfile.__table__),
+            [
+                {
+                    "user_id": user_ids[i],
+                    "public_name": f"Técnico {i}",
+                    "city": rng.choice(CITIES),
+                    "radius_km": 5,
+                    "categories": ["Electricidad"],
+                    "badge_level": TechLevel.BASIC,
+                    "activities": [],
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(n_cases)
+            ],
+        )
+
+        # un caso por técnico (tech_id == i + 1)
+        conn.execute(
+            insert(VerificationCase.__table__),
+            [
+                {
+                    "tech_id": i + 1,
+                    "target_level": TechLevel.BASIC,
+                    "status": rng.choice(STATUSES),
+                    "created_at": now - timedelta(minutes=i),
+                    "updated_at": now,
+                }
+                for i in range(n_cases)
+            ],
+        )
+        doc_types = list(DocType)
+        conn.execute(
+            insert(VerificationDocument.__table__),
+            [
+                {
+                    "case_id": c,
+                    "doc_type": doc_types[d % len(doc_types)],
+                    "content_type": "image/png",
+                    "meta": {},
+                    "received_at": now,
+                    "storage_ref": f"private/case-{c}/doc-{d}.png",
+                }
+                for c in range(1, n_cases + 1)
+                for d in range(docs_per_case)
+            ],
+        )
+        conn.execute(
+            insert(VerificationAuditLog.__table__),
+            [
+                {
+                    "case_id": c,
+                    "actor_id": 1,
+                    "action": "UPLOAD_DOC",
+                    "detail": {"n": d},
+                    "created_at": now,
+                }
+                for c in range(1, n_cases + 1)
+                for d in range(docs_per_case)
+            ],
+        )
+
+    return {
+        "app_id": rng.randint(1, n_apps),
+        "case_id": rng.randint(1, n_cases),
+        "user_id": user_ids[rng.randint(0, n_cases - 1)],
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de rutas admin SIPH")
+    ap.add_argument("--cases", type=int, default=1000)
+    ap.add_argument("--apps", type=int, default=1000)
+    ap.add_argument("--docs-per-case", type=int, default=4)
+    ap.add_argument("--iterations", type=int, default=30)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    t0 = time.perf_counter()
+    ids = _seed(rng, args.cases, args.apps, args.docs_per_case)
+    print(f"✅ Datos sintéticos: {args.cases} casos, {args.apps} postulaciones "
+          f"({(time.perf_counter() - t0) * 1000:.0f} ms)")
+
+    counter = {"n": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(*_a, **_kw):
+        counter["n"] += 1
+
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token(ADMIN_EMAIL)}"}
+
+    failed = False
+    for name, path, budget in ROUTES:
+        url = path.format(**ids)
+        client.get(url, headers=headers)  # warmup
+
+        queries, latencies = [], []
+        for _ in range(args.iterations):
+            counter["n"] = 0
+            t0 = time.perf_counter()
+            resp = client.get(url, headers=headers)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            queries.append(counter["n"])
+            if resp.status_code != 200:
+                print(f"❌ {name}: HTTP {resp.status_code} {resp.text[:200]}")
+                failed = True
+                break
+
+        if not latencies:
+            continue
+        q_max = max(queries)
+        ok = q_max <= budget
+        failed = failed or not ok
+        print(
+            f"   {'✅' if ok else '❌'} {name:<34} queries={q_max} (máx {budget}) "
+            f"p50={_percentile(latencies, 50):.2f} ms p95={_percentile(latencies, 95):.2f} ms "
+            f"media={statistics.fmean(latencies):.2f} ms"
+        )
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# backend/app/scripts/bench_matching.py
+"""
+Benchmark del motor de matching con carga sintética (sin DB).
+
+Uso (desde backend/):
+    python -m app.scripts.bench_matching --techs 20000 --requests 5000 --urgent-ratio 0.2
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.models.technician_verification import TechLevel
+from app.core.text import normalize_key
+from app.services.matching import MatchingEngine, TechSnapshot
+
+# Bogotá aprox.
+LAT_RANGE = (4.45, 4.85)
+LNG_RANGE = (-74.25, -73.95)
+CITIES = ["Bogotá", "Soacha", "Chía", "Mosquera"]
+CATEGORIES = [
+    "Electricidad",
+    "Plomería",
+    "Carpintería",
+    "Aires acondicionados",
+    "Pintura",
+    "Gas",
+    "Electrodomésticos",
+    "Herrería",
+    "Jardinería",
+    "Techos",
+]
+LEVELS = list(TechLevel)
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(pct / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def _synthetic_tech(rng: random.Random, tech_id: int, geo_ratio: float) -> TechSnapshot:
+    has_geo = rng.random() < geo_ratio
+    return TechSnapshot(
+        tech_id=tech_id,
+        lat=rng.uniform(*LAT_RANGE) if has_geo else None,
+        lng=rng.uniform(*LNG_RANGE) if has_geo else None,
+        city=normalize_key(rng.choice(CITIES)),
+        categories=frozenset(normalize_key(c) for c in rng.sample(CATEGORIES, rng.randint(1, 3))),
+        badge_level=rng.choice(LEVELS),
+        radius_km=float(rng.choice([3, 5, 10, 15, 25])),
+        load=rng.randint(0, 4),
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark del matching SIPH")
+    ap.add_argument("--techs", type=int, default=10000)
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--urgent-ratio", type=float, default=0.2)
+    ap.add_argument("--geo-ratio", type=float, default=0.9, help="técnicos con coordenadas")
+    ap.add_argument("--updates", type=int, default=1000, help="upserts incrementales a medir")
+    ap.add_argument("--budget-ms", type=float, default=50.0)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    engine = MatchingEngine(urgent_budget_ms=args.budget_ms)
+
+    # 1) construcción del índice
+    t0 = time.perf_counter()
+    for i in range(1, args.techs + 1):
+        engine.index.upsert(_synthetic_tech(rng, i, args.geo_ratio))
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    # 2) refresco incremental (upserts sueltos, como tras decide_case)
+    t0 = time.perf_counter()
+    for _ in range(args.updates):
+        tid = rng.randint(1, args.techs)
+        engine.index.upsert(_synthetic_tech(rng, tid, args.geo_ratio))
+    update_us = (time.perf_counter() - t0) * 1e6 / max(args.updates, 1)
+
+    # 3) ranking
+    lat_normal, lat_urgent = [], []
+    evaluated, assigned, exhausted = [], 0, 0
+    for _ in range(args.requests):
+        urgent = rng.random() < args.urgent_ratio
+        with_geo = rng.random() < 0.85
+        res = engine.rank(
+            lat=rng.uniform(*LAT_RANGE) if with_geo else None,
+            lng=rng.uniform(*LNG_RANGE) if with_geo else None,
+            city=rng.choice(CITIES),
+            category=rng.choice(CATEGORIES + ["GENERAL"]),
+            urgent=urgent,
+            limit=1,
+        )
+        (lat_urgent if urgent else lat_normal).append(res.elapsed_ms)
+        evaluated.append(res.evaluated)
+        exhausted += int(res.budget_exhausted)
+        if res.best:
+            assigned += 1
+            engine.note_assigned(res.best.tech_id)
+
+    print(f"✅ Técnicos indexados: {len(engine.index)} (build {build_ms:.1f} ms)")
+    print(f"   Upsert incremental: {update_us:.1f} µs/op")
+    print(f"   Solicitudes: {args.requests} | asignadas: {assigned} ({assigned / max(args.requests, 1):.1%})")
+    print(f"   Candidatos evaluados (media): {statistics.fmean(evaluated) if evaluated else 0:.1f}")
+    for label, values in (("NORMAL", lat_normal), ("URGENT", lat_urgent)):
+        if values:
+            print(
+                f"   {label}: n={len(values)} p50={_percentile(values, 50):.3f} ms "
+                f"p95={_percentile(values, 95):.3f} ms p99={_percentile(values, 99):.3f} ms "
+                f"max={max(values):.3f} ms"
+            )
+    print(f"   URGENT con presupuesto agotado ({args.budget_ms} ms): {exhausted}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
 from app.core.security import hash_password
 from app.models.user import User
+import app.services.search  # noqa: F401  (indexa el usuario en /search)
 
 
 def main():
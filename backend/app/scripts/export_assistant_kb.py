@@ -0,0 +1,219 @@
+# backend/app/scripts/export_assistant_kb.py
+"""
+Genera las secciones de la KB del asistente a partir del código del backend.
+
+Lee el esquema OpenAPI de app.main (solo routers montados), los enums de
+estados/documentos y los modelos SQLAlchemy, y escribe una sección Markdown por
+tema en qwen-local-chatbot/kb/generated/ (mismo formato que kb/*.md).
+
+Solo se reescriben los archivos cuyo contenido cambió, así el asistente
+(KBWatcher + índice vectorial incremental) recompila y re-embebe únicamente
+esas secciones. Las secciones que ya no se generan se borran.
+
+Uso (desde backend/):
+    python -m app.scripts.export_assistant_kb
+    python -m app.scripts.export_assistant_kb --out ../qwen-local-chatbot/kb/generated --check
+"""
+import argparse
+import os
+import sys
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List
+
+# La DB se define antes de importar la app (engine se crea al importar).
+# main() la usa como context manager: el directorio se borra al terminar
+# (si solo se importa el módulo, lo borra el finalizador de TemporaryDirectory).
+_TMP_DIR = tempfile.TemporaryDirectory(prefix="siph-kb-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP_DIR.name, 'kb.db')}"
+
+from app.core.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.service_request import ContactPref, RequestStatus, RequestUrgency  # noqa: E402
+from app.models.technician_verification import DocType, Role, TechLevel, TechStatus  # noqa: E402
+from app.models.worker_application import WorkerApplicationStatus  # noqa: E402
+
+DEFAULT_OUT = Path(__file__).resolve().parents[3] / "qwen-local-chatbot" / "kb" / "generated"
+HEADER_NOTE = "# generado por backend/app/scripts/export_assistant_kb.py: no editar a mano"
+HTTP_METHODS = ("get", "post", "put", "patch", "delete")
+
+
+# =========================
+# Secciones
+# =========================
+def _enum_values(enum_cls) -> List[str]:
+    return [e.value for e in enum_cls]
+
+
+def _routes_by_tag(schema: Dict) -> "OrderedDict[str, List[str]]":
+    groups: "OrderedDict[str, List[str]]" = OrderedDict()
+    for path, ops in schema.get("paths", {}).items():
+        for method in HTTP_METHODS:
+            op = ops.get(method)
+            if op is None:
+                continue
+            tag = (op.get("tags") or ["general"])[0]
+            groups.setdefault(tag, []).append(f"- {method.upper()} {path} -> {op.get('summary', '')}")
+    return groups
+
+
+def section_api_routes(schema: Dict) -> Dict:
+    groups = _routes_by_tag(schema)
+    paragraphs = [
+        "Endpoints confirmados de la API del backend SIPH (FastAPI), agrupados por módulo:"
+    ]
+    for tag, lines in groups.items():
+        paragraphs.append(f"Módulo {tag}:\n" + "\n".join(lines))
+
+    keywords = ["endpoint", "endpoints", "api", "rutas backend", "rutas api"]
+    keywords += [t.lower() for t in groups]
+    keywords += sorted({p.split("/")[1] for p in schema.get("paths", {}) if len(p) > 1})
+    return {
+        "id": "api_routes",
+        "title": "Endpoints de la API del backend",
+        "keywords": list(dict.fromkeys(keywords)),
+        "content": "\n\n".join(paragraphs),
+    }
+
+
+def section_backend(schema: Dict) -> Dict:
+    tags = list(_routes_by_tag(schema))
+    models = sorted(
+        (m.class_.__name__, m.local_table.name)
+        for m in Base.registry.mappers
+        if m.local_table is not None
+    )
+    content = (
+        "Backend confirmado:\n- FastAPI + SQLAlchemy\n\n"
+        "Módulos (routers) montados en la API:\n"
+        + "\n".join(f"- {t}" for t in tags)
+        + "\n\nModelos de datos (tabla):\n"
+        + "\n".join(f"- {name} ({table})" for name, table in models)
+    )
+    keywords = ["backend", "fastapi", "routers", "api", "modelos", "models", "tablas"]
+    keywords += [name.lower() for name, _ in models]
+    return {
+        "id": "backend",
+        "title": "Backend y modelos principales",
+        "keywords": keywords,
+        "content": content,
+    }
+
+
+def section_documents(schema: Dict) -> Dict:
+    docs = _enum_values(DocType)
+    upload_routes = [
+        f"- {method.upper()} {path}"
+        for path, ops in schema.get("paths", {}).items()
+        if "documents" in path
+        for method in HTTP_METHODS
+        if method in ops
+    ]
+    content = (
+        "Tipos de documento de verificación confirmados en SIPH:\n"
+        + "\n".join(f"- {d}" for d in docs)
+        + "\n\nEndpoints relacionados con documentos:\n"
+        + "\n".join(upload_routes)
+    )
+    keywords = ["documentos", "documento", "subir documentos", "verificacion documental", "verificación documental"]
+    keywords += [d.lower() for d in docs]
+    return {
+        "id": "documents",
+        "title": "Documentos de verificación",
+        "keywords": keywords,
+        "content": content,
+    }
+
+
+def section_states() -> Dict:
+    blocks = [
+        ("Estados de una solicitud de servicio (RequestStatus)", RequestStatus),
+        ("Urgencia de una solicitud (RequestUrgency)", RequestUrgency),
+        ("Preferencia de contacto (ContactPref)", ContactPref),
+        ("Estados de una postulación de técnico (WorkerApplicationStatus)", WorkerApplicationStatus),
+        ("Estados de la verificación de técnico (TechStatus)", TechStatus),
+        ("Niveles de verificación de técnico (TechLevel)", TechLevel),
+        ("Roles de usuario (Role)", Role),
+    ]
+    paragraphs = [f"{title}:\n" + "\n".join(f"- {v}" for v in _enum_values(e)) for title, e in blocks]
+    keywords = ["estados", "estado", "status", "niveles", "roles", "urgencia"]
+    for _, e in blocks:
+        keywords += [v.lower() for v in _enum_values(e)]
+    return {
+        "id": "backend_enums",
+        "title": "Estados, niveles y roles definidos en el backend",
+        "keywords": list(dict.fromkeys(keywords)),
+        "content": "\n\n".join(paragraphs),
+    }
+
+
+def build_sections() -> List[Dict]:
+    schema = app.openapi()
+    return [
+        section_backend(schema),
+        section_api_routes(schema),
+        section_documents(schema),
+        section_states(),
+    ]
+
+
+# =========================
+# Escritura
+# =========================
+def render_section(section: Dict) -> str:
+    head = ["---", HEADER_NOTE, f"id: {section['id']}", f"title: {section['title']}", "keywords:"]
+    head.extend(f"  - {k}" for k in section["keywords"])
+    head.append("---")
+    return "\n".join(head) + "\n" + section["content"].strip("\n") + "\n"
+
+
+def write_sections(sections: List[Dict], out_dir: Path, check: bool = False) -> Dict[str, List[str]]:
+    """Escribe solo lo que cambió. Con check=True no toca nada, solo informa."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    result: Dict[str, List[str]] = {"changed": [], "unchanged": [], "removed": []}
+    wanted = set()
+    for n, section in enumerate(sections, start=1):
+        path = out_dir / f"{n:02d}-{section['id'].replace('_', '-')}.md"
+        wanted.add(path.name)
+        text = render_section(section)
+        if path.exists() and path.read_text(encoding="utf-8") == text:
+            result["unchanged"].append(path.name)
+            continue
+        result["changed"].append(path.name)
+        if not check:
+            tmp = path.with_suffix(".md.tmp")
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, path)
+
+    for path in sorted(out_dir.glob("*.md")):
+        if path.name not in wanted:
+            result["removed"].append(path.name)
+            if not check:
+                path.unlink()
+    return result
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Genera la KB del asistente desde el backend")
+    ap.add_argument("--out", default=str(DEFAULT_OUT))
+    ap.add_argument("--check", action="store_true", help="solo informa; sale con 1 si la KB está desactualizada")
+    args = ap.parse_args()
+
+    with _TMP_DIR:
+        try:
+            result = write_sections(build_sections(), Path(args.out), check=args.check)
+        finally:
+            engine.dispose()  # suelta kb.db antes de borrar el directorio (Windows)
+    print(
+        f"✅ KB generada en {args.out}: {len(result['changed'])} cambiadas, "
+        f"{len(result['unchanged'])} sin cambios, {len(result['removed'])} borradas"
+    )
+    for name in result["changed"] + result["removed"]:
+        print(f"   - {name}")
+    if args.check and (result["changed"] or result["removed"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
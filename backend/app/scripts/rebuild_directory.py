@@ -0,0 +1,22 @@
+# backend/app/scripts/rebuild_directory.py
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.services.technician_directory import rebuild_directory
+
+
+def main():
+    db: Session = SessionLocal()
+    try:
+        count = rebuild_directory(db)
+        db.commit()
+        print(f"✅ Directorio de técnicos reconstruido: {count} técnicos verificados")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+# backend/app/scripts/rebuild_search_index.py
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.services.search import rebuild_search_index
+
+
+def main():
+    db: Session = SessionLocal()
+    try:
+        count = rebuild_search_index(db)
+        db.commit()
+        print(f"✅ Índice de búsqueda reconstruido: {count} documentos")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,591 @@
+# backend/app/services/matching.py
+"""
+Matching de solicitudes (ServiceRequest) -> técnicos verificados (TechnicianProfile).
+
+- Índice espacial en memoria (grilla lat/lng + índice por ciudad) con los técnicos
+  verificados activos; se sincroniza de forma incremental con la DB.
+- Score = distancia + categorías + badge_level + carga actual.
+- Las solicitudes URGENT se resuelven con presupuesto de latencia.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.text import normalize_key
+from ..models.service_request import RequestStatus, RequestUrgency, ServiceRequest
+from ..models.technician_verification import (
+    TechLevel,
+    TechnicianProfile,
+    TechStatus,
+    VerificationCase,
+)
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEG_LAT = 111.32
+
+# ~5.5 km por celda (en latitud)
+CELL_DEG = 0.05
+
+# solapamiento del watermark: re-leer un poco hacia atrás es idempotente
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+# solicitudes que cuentan como carga del técnico
+ACTIVE_STATUSES = (RequestStatus.ASSIGNED, RequestStatus.IN_PROGRESS)
+
+BADGE_SCORE = {
+    TechLevel.BASIC: 0.0,
+    TechLevel.TRUST: 0.4,
+    TechLevel.PRO: 0.8,
+    TechLevel.PAY: 1.0,
+}
+
+WEIGHTS = {"distance": 0.45, "category": 0.25, "badge": 0.15, "load": 0.15}
+# en URGENT pesa más la cercanía
+URGENT_WEIGHTS = {"distance": 0.6, "category": 0.2, "badge": 0.1, "load": 0.1}
+
+# score de distancia cuando solo hay coincidencia por ciudad (sin coordenadas)
+CITY_ONLY_DISTANCE_SCORE = 0.5
+
+# cada cuántos candidatos se revisa el deadline en URGENT
+DEADLINE_CHECK_EVERY = 32
+
+# solicitudes en MATCHING sin técnico que se reintentan por cada refresh con cambios
+RETRY_BATCH = 200
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+@dataclass(slots=True)
+class TechSnapshot:
+    tech_id: int
+    lat: Optional[float]
+    lng: Optional[float]
+    city: str
+    categories: FrozenSet[str]
+    badge_level: TechLevel
+    radius_km: float
+    expires_at: Optional[datetime] = None
+    load: int = 0
+
+    @property
+    def has_geo(self) -> bool:
+        return self.lat is not None and self.lng is not None
+
+
+@dataclass(slots=True)
+class MatchCandidate:
+    tech_id: int
+    score: float
+    distance_km: Optional[float]
+
+
+@dataclass(slots=True)
+class MatchResult:
+    candidates: List[MatchCandidate] = field(default_factory=list)
+    evaluated: int = 0
+    elapsed_ms: float = 0.0
+    budget_exhausted: bool = False
+
+    @property
+    def best(self) -> Optional[MatchCandidate]:
+        return self.candidates[0] if self.candidates else None
+
+
+# =========================
+# Índice espacial
+# =========================
+class SpatialIndex:
+    """
+    Grilla uniforme lat/lng -> ids de técnicos, más índice por ciudad
+    (para técnicos o solicitudes sin coordenadas). Upsert/remove son O(1).
+    """
+
+    def __init__(self, cell_deg: float = CELL_DEG):
+        self.cell_deg = cell_deg
+        self.techs: Dict[int, TechSnapshot] = {}
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._by_city: Dict[str, Set[int]] = {}
+        # subconjunto sin coordenadas (solo se encuentran por ciudad)
+        self._by_city_nogeo: Dict[str, Set[int]] = {}
+        # radio -> cuántos técnicos lo usan (para saber el radio máximo sin recorrer todo)
+        self._radii: Dict[float, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.techs)
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg))
+
+    @property
+    def max_radius_km(self) -> float:
+        return max(self._radii) if self._radii else 0.0
+
+    def upsert(self, snap: TechSnapshot) -> None:
+        old = self.techs.get(snap.tech_id)
+        if old is not None:
+            # conserva la carga conocida si el snapshot nuevo no la trae
+            if not snap.load:
+                snap.load = old.load
+            self.remove(snap.tech_id)
+
+        self.techs[snap.tech_id] = snap
+        if snap.has_geo:
+            self._cells.setdefault(self._cell(snap.lat, snap.lng), set()).add(snap.tech_id)
+        if snap.city:
+            self._by_city.setdefault(snap.city, set()).add(snap.tech_id)
+            if not snap.has_geo:
+                self._by_city_nogeo.setdefault(snap.city, set()).add(snap.tech_id)
+        self._radii[snap.radius_km] = self._radii.get(snap.radius_km, 0) + 1
+
+    def remove(self, tech_id: int) -> None:
+        snap = self.techs.pop(tech_id, None)
+        if snap is None:
+            return
+        if snap.has_geo:
+            key = self._cell(snap.lat, snap.lng)
+            bucket = self._cells.get(key)
+            if bucket is not None:
+                bucket.discard(tech_id)
+                if not bucket:
+                    del self._cells[key]
+        if snap.city:
+            for by_city in (self._by_city, self._by_city_nogeo):
+                bucket = by_city.get(snap.city)
+                if bucket is not None:
+                    bucket.discard(tech_id)
+                    if not bucket:
+                        del by_city[snap.city]
+        n = self._radii.get(snap.radius_km, 0) - 1
+        if n > 0:
+            self._radii[snap.radius_km] = n
+        else:
+            self._radii.pop(snap.radius_km, None)
+
+    def clear(self) -> None:
+        self.techs.clear()
+        self._cells.clear()
+        self._by_city.clear()
+        self._by_city_nogeo.clear()
+        self._radii.clear()
+
+    def rings(self, lat: float, lng: float) -> Iterator[Tuple[float, List[int]]]:
+        """
+        Devuelve (distancia_mínima_km, ids) por anillos de celdas alrededor del punto,
+        del más cercano al más lejano, hasta cubrir el radio máximo de cobertura.
+        """
+        max_r = self.max_radius_km
+        if not self._cells or max_r <= 0:
+            return
+
+        cell_km_lat = self.cell_deg * KM_PER_DEG_LAT
+        cell_km_lng = cell_km_lat * max(math.cos(math.radians(lat)), 0.01)
+        span_i = math.ceil(max_r / cell_km_lat)
+        span_j = math.ceil(max_r / cell_km_lng)
+
+        cell_km_min = min(cell_km_lat, cell_km_lng)
+
+        ci, cj = self._cell(lat, lng)
+        for k in range(max(span_i, span_j) + 1):
+            ids: List[int] = []
+            for di in range(-min(k, span_i), min(k, span_i) + 1):
+                for dj in range(-min(k, span_j), min(k, span_j) + 1):
+                    if max(abs(di), abs(dj)) != k:
+                        continue
+                    bucket = self._cells.get((ci + di, cj + dj))
+                    if bucket:
+                        ids.extend(bucket)
+            if ids:
+                yield max(k - 1, 0) * cell_km_min, ids
+
+    def in_city(self, city: str, only_without_geo: bool = False) -> List[int]:
+        by_city = self._by_city_nogeo if only_without_geo else self._by_city
+        return list(by_city.get(city, ()))
+
+
+# =========================
+# Scoring
+# =========================
+def score_tech(
+    tech: TechSnapshot,
+    *,
+    lat: Optional[float],
+    lng: Optional[float],
+    city: str,
+    category: str,
+    weights: Dict[str, float],
+    now: datetime,
+) -> Optional[Tuple[float, Optional[float]]]:
+    """(score, distancia_km) o None si el técnico no aplica."""
+    if tech.expires_at is not None and tech.expires_at <= now:
+        return None
+
+    # categorías
+    if not category or category == "GENERAL" or not tech.categories:
+        cat_score = 0.5
+    elif category in tech.categories:
+        cat_score = 1.0
+    else:
+        return None
+
+    # distancia (o ciudad como respaldo)
+    distance: Optional[float] = None
+    if lat is not None and lng is not None and tech.has_geo:
+        distance = haversine_km(lat, lng, tech.lat, tech.lng)
+        if distance > tech.radius_km:
+            return None
+        dist_score = 1.0 - distance / max(tech.radius_km, 0.1)
+    elif city and tech.city == city:
+        dist_score = CITY_ONLY_DISTANCE_SCORE
+    else:
+        return None
+
+    badge_score = BADGE_SCORE.get(tech.badge_level, 0.0)
+    load_score = 1.0 / (1.0 + max(tech.load, 0))
+
+    score = (
+        weights["distance"] * dist_score
+        + weights["category"] * cat_score
+        + weights["badge"] * badge_score
+        + weights["load"] * load_score
+    )
+    return score, distance
+
+
+# =========================
+# Motor
+# =========================
+class MatchingEngine:
+    def __init__(self, refresh_seconds: float = 30.0, urgent_budget_ms: float = 50.0):
+        self.index = SpatialIndex()
+        self.refresh_seconds = refresh_seconds
+        self.urgent_budget_ms = urgent_budget_ms
+        self._lock = threading.RLock()
+        self._watermark: Optional[datetime] = None
+        self._last_refresh = 0.0
+
+    @property
+    def is_warm(self) -> bool:
+        return self._watermark is not None
+
+    # ---------- sincronización con la DB ----------
+    def refresh(self, db: Session, force: bool = False) -> int:
+        """
+        Sincroniza el índice. La primera vez carga todo; después solo los técnicos
+        cuyo perfil o casos cambiaron desde el último watermark. Devuelve cuántos
+        técnicos se revisaron.
+        """
+        with self._lock:
+            mono = time.monotonic()
+            if (
+                not force
+                and self.is_warm
+                and mono - self._last_refresh < self.refresh_seconds
+            ):
+                return 0
+
+            started = datetime.utcnow()
+
+            if self._watermark is None:
+                changed_ids: Optional[Set[int]] = None
+            else:
+                since = self._watermark - REFRESH_OVERLAP
+                changed_ids = {
+                    r[0]
+                    for r in db.query(TechnicianProfile.id)
+                    .filter(TechnicianProfile.updated_at >= since)
+                    .all()
+                }
+                changed_ids |= {
+                    r[0]
+                    for r in db.query(VerificationCase.tech_id)
+                    .filter(VerificationCase.updated_at >= since)
+                    .all()
+                }
+
+            snaps = self._load_snapshots(db, changed_ids, started)
+
+            if changed_ids is None:
+                self.index.clear()
+                for snap in snaps.values():
+                    self.index.upsert(snap)
+                touched = len(snaps)
+            else:
+                for tech_id in changed_ids:
+                    snap = snaps.get(tech_id)
+                    if snap is None:
+                        self.index.remove(tech_id)
+                    else:
+                        self.index.upsert(snap)
+                touched = len(changed_ids)
+
+            self._sync_loads(db)
+
+            self._watermark = started
+            self._last_refresh = mono
+            return touched
+
+    def _load_snapshots(
+        self, db: Session, tech_ids: Optional[Set[int]], now: datetime
+    ) -> Dict[int, TechSnapshot]:
+        if tech_ids is not None and not tech_ids:
+            return {}
+
+        # solo columnas: evita el joined `user` y los `cases` selectin del modelo
+        q = (
+            db.query(
+                TechnicianProfile.id,
+                TechnicianProfile.lat,
+                TechnicianProfile.lng,
+                TechnicianProfile.city,
+                TechnicianProfile.categories,
+                TechnicianProfile.badge_level,
+                TechnicianProfile.radius_km,
+                func.max(VerificationCase.expires_at),
+                func.count(VerificationCase.id).filter(VerificationCase.expires_at.is_(None)),
+            )
+            .join(VerificationCase, VerificationCase.tech_id == TechnicianProfile.id)
+            .filter(
+                VerificationCase.status == TechStatus.VERIFIED,
+                or_(VerificationCase.expires_at.is_(None), VerificationCase.expires_at > now),
+            )
+            .group_by(TechnicianProfile.id)
+        )
+        if tech_ids is not None:
+            q = q.filter(TechnicianProfile.id.in_(tech_ids))
+
+        out: Dict[int, TechSnapshot] = {}
+        for tid, lat, lng, city, cats, badge, radius, max_exp, no_exp in q.all():
+            out[tid] = TechSnapshot(
+                tech_id=tid,
+                lat=lat,
+                lng=lng,
+                city=normalize_key(city),
+                categories=frozenset(normalize_key(c) for c in (cats or []) if c),
+                badge_level=badge or TechLevel.BASIC,
+                radius_km=float(radius or 0),
+                expires_at=None if no_exp else max_exp,
+            )
+        return out
+
+    def _sync_loads(self, db: Session) -> None:
+        rows = (
+            db.query(ServiceRequest.assigned_tech_id, func.count(ServiceRequest.id))
+            .filter(
+                ServiceRequest.assigned_tech_id.isnot(None),
+                ServiceRequest.status.in_(ACTIVE_STATUSES),
+            )
+            .group_by(ServiceRequest.assigned_tech_id)
+            .all()
+        )
+        loads = dict(rows)
+        for tech_id, snap in self.index.techs.items():
+            snap.load = int(loads.get(tech_id, 0))
+
+    # ---------- carga en memoria ----------
+    def note_assigned(self, tech_id: int) -> None:
+        with self._lock:
+            snap = self.index.techs.get(tech_id)
+            if snap is not None:
+                snap.load += 1
+
+    def note_released(self, tech_id: int) -> None:
+        with self._lock:
+            snap = self.index.techs.get(tech_id)
+            if snap is not None and snap.load > 0:
+                snap.load -= 1
+
+    # ---------- ranking ----------
+    def rank(
+        self,
+        *,
+        lat: Optional[float],
+        lng: Optional[float],
+        city: Optional[str],
+        category: Optional[str],
+        urgent: bool = False,
+        limit: int = 5,
+        now: Optional[datetime] = None,
+    ) -> MatchResult:
+        """
+        Rankea técnicos para una solicitud. En URGENT recorre los anillos del más
+        cercano hacia afuera y corta al agotar `urgent_budget_ms`, devolviendo el
+        mejor encontrado hasta ese momento.
+        """
+        t0 = time.perf_counter()
+        deadline = t0 + self.urgent_budget_ms / 1000.0 if urgent else None
+        weights = URGENT_WEIGHTS if urgent else WEIGHTS
+        now = now or datetime.utcnow()
+        city_key = normalize_key(city)
+        cat_key = normalize_key(category)
+
+        result = MatchResult()
+        scored: List[MatchCandidate] = []
+        # min-heap con los `limit` mejores scores (para podar anillos lejanos)
+        top: List[float] = []
+        limit = max(limit, 1)
+        seen: Set[int] = set()
+        # máximo posible sin contar distancia
+        non_distance_max = weights["category"] + weights["badge"] + weights["load"]
+
+        with self._lock:
+            max_r = self.index.max_radius_km
+            if lat is not None and lng is not None:
+                batches: Iterator[Tuple[float, List[int]]] = self.index.rings(lat, lng)
+                # con coordenadas, por ciudad solo entran los técnicos sin coordenadas
+                city_ids = self.index.in_city(city_key, only_without_geo=True) if city_key else []
+            else:
+                batches = iter(())
+                city_ids = self.index.in_city(city_key) if city_key else []
+
+            def reachable(ring: Tuple[float, List[int]]) -> bool:
+                # poda: ¿algún técnico de este anillo puede superar a los `limit` mejores?
+                min_km = ring[0]
+                if len(top) < limit or max_r <= 0 or min_km <= 0:
+                    return True
+                upper = weights["distance"] * max(0.0, 1.0 - min_km / max_r) + non_distance_max
+                return top[0] < upper
+
+            # rings() entrega los anillos con min_km creciente y la cota solo baja:
+            # el primer anillo podado corta los que siguen (takewhile), pero el lote
+            # por ciudad (técnicos sin coordenadas) se evalúa igual
+            for _, batch in itertools.chain(
+                itertools.takewhile(reachable, batches), [(0.0, city_ids)]
+            ):
+                for tech_id in batch:
+                    if tech_id in seen:
+                        continue
+                    seen.add(tech_id)
+                    result.evaluated += 1
+
+                    scored_tech = score_tech(
+                        self.index.techs[tech_id],
+                        lat=lat,
+                        lng=lng,
+                        city=city_key,
+                        category=cat_key,
+                        weights=weights,
+                        now=now,
+                    )
+                    if scored_tech is not None:
+                        scored.append(MatchCandidate(tech_id, scored_tech[0], scored_tech[1]))
+                        if len(top) < limit:
+                            heapq.heappush(top, scored_tech[0])
+                        elif scored_tech[0] > top[0]:
+                            heapq.heapreplace(top, scored_tech[0])
+
+                    if (
+                        deadline is not None
+                        and result.evaluated % DEADLINE_CHECK_EVERY == 0
+                        and time.perf_counter() > deadline
+                    ):
+                        result.budget_exhausted = True
+                        break
+                if result.budget_exhausted:
+                    break
+                # con candidatos ya encontrados y sin tiempo, no sigas al siguiente anillo
+                if deadline is not None and scored and time.perf_counter() > deadline:
+                    result.budget_exhausted = True
+                    break
+
+        scored.sort(key=lambda c: (-c.score, c.distance_km if c.distance_km is not None else math.inf))
+        result.candidates = scored[:limit]
+        result.elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        return result
+
+
+engine = MatchingEngine(
+    refresh_seconds=settings.matching_refresh_seconds,
+    urgent_budget_ms=settings.matching_urgent_budget_ms,
+)
+
+
+# =========================
+# API usada por los routers
+# =========================
+def _is_urgent(req: ServiceRequest) -> bool:
+    return req.urgency == RequestUrgency.URGENT or req.urgency == "URGENT"
+
+
+def _assign(req: ServiceRequest, urgent: bool) -> Optional[MatchCandidate]:
+    """MATCHING -> ASSIGNED con el mejor técnico del índice (o queda en MATCHING)."""
+    req.status = RequestStatus.MATCHING
+
+    result = engine.rank(
+        lat=req.lat,
+        lng=req.lng,
+        city=req.city,
+        category=req.category,
+        urgent=urgent,
+        limit=1,
+    )
+    best = result.best
+    if best is None:
+        return None
+
+    req.assigned_tech_id = best.tech_id
+    req.assigned_at = datetime.utcnow()
+    req.match_score = round(best.score, 4)
+    req.status = RequestStatus.ASSIGNED
+    engine.note_assigned(best.tech_id)
+    return best
+
+
+def retry_pending(db: Session) -> int:
+    """
+    Re-encola las solicitudes que quedaron en MATCHING sin candidato (las más
+    antiguas primero). Se llama cuando el refresh trajo técnicos nuevos o
+    actualizados. No hace commit. Devuelve cuántas quedaron asignadas.
+    """
+    pending = (
+        db.query(ServiceRequest)
+        .filter(
+            ServiceRequest.status == RequestStatus.MATCHING,
+            ServiceRequest.assigned_tech_id.is_(None),
+        )
+        .order_by(ServiceRequest.created_at)
+        .limit(RETRY_BATCH)
+        # dos requests concurrentes no reintentan la misma fila (Postgres; SQLite lo ignora)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    return sum(1 for req in pending if _assign(req, _is_urgent(req)) is not None)
+
+
+def match_request(db: Session, req: ServiceRequest) -> Optional[MatchCandidate]:
+    """
+    CREATED -> MATCHING -> ASSIGNED (si hay técnico). No hace commit.
+    En URGENT no se consulta la DB si el índice ya está caliente
+    (el refresh periódico lo hacen las solicitudes normales).
+    Si el refresh cambió el índice, también se reintentan las solicitudes
+    que habían quedado en MATCHING sin técnico.
+    """
+    urgent = _is_urgent(req)
+
+    if not urgent or not engine.is_warm:
+        if engine.refresh(db):
+            retry_pending(db)
+
+    return _assign(req, urgent)
+
+
+def release_request(req: ServiceRequest) -> None:
+    """Libera la carga del técnico asignado (cancelación / cierre)."""
+    if req.assigned_tech_id and req.status in ACTIVE_STATUSES:
+        engine.note_released(req.assigned_tech_id)
@@ -0,0 +1,332 @@
+# backend/app/services/search.py
+"""
+Búsqueda de texto completo sobre solicitudes, postulaciones y usuarios.
+
+Indexación: un listener `after_flush` mantiene `search_documents` en la misma
+transacción que modifica ServiceRequest / WorkerApplication / User.
+
+Consulta según el dialecto:
+- postgresql: tsvector 'spanish' (ts_rank_cd); si no hay coincidencias, trigram.
+- sqlite: FTS5 (bm25) — para pruebas locales.
+- otros: LIKE sobre el texto normalizado.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, event, insert, select, text
+from sqlalchemy.orm import Session
+
+from ..core.text import normalize_search_text
+from ..models.search_document import SearchDocument
+from ..models.service_request import ServiceRequest
+from ..models.user import User
+from ..models.worker_application import WorkerApplication
+
+ENTITY_REQUEST = "request"
+ENTITY_APPLICATION = "worker_application"
+ENTITY_USER = "user"
+ENTITY_TYPES = (ENTITY_REQUEST, ENTITY_APPLICATION, ENTITY_USER)
+
+TRGM_MIN_SIMILARITY = 0.3
+
+_docs = SearchDocument.__table__
+_users = User.__table__
+_apps = WorkerApplication.__table__
+
+
+def _join(*parts: Optional[Any]) -> str:
+    return " ".join(str(p).strip() for p in parts if p is not None and str(p).strip())
+
+
+def _enum_value(v: Any) -> Any:
+    return getattr(v, "value", v)
+
+
+# =========================
+# Documentos
+# =========================
+def request_doc(r: Any) -> Dict[str, Any]:
+    title = (r.title or "").strip() or f"Solicitud #{r.id}"
+    return {
+        "entity_type": ENTITY_REQUEST,
+        "entity_id": r.id,
+        "user_id": r.user_id,
+        "title": title[:200],
+        "subtitle": _join(r.category, r.city, r.neighborhood, _enum_value(r.status))[:300],
+        "title_norm": normalize_search_text(title)[:200],
+        "content": normalize_search_text(
+            _join(title, r.description, r.category, r.city, r.neighborhood)
+        ),
+    }
+
+
+def application_doc(a: Any, user: Optional[Any]) -> Dict[str, Any]:
+    name = _join(getattr(user, "first_name", None), getattr(user, "last_name", None))
+    email = getattr(user, "email", None)
+    title = name or email or f"Postulación #{a.id}"
+    return {
+        "entity_type": ENTITY_APPLICATION,
+        "entity_id": a.id,
+        "user_id": a.user_id,
+        "title": title[:200],
+        "subtitle": _join(email, a.city, a.specialty, a.status)[:300],
+        "title_norm": normalize_search_text(title)[:200],
+        "content": normalize_search_text(_join(name, email, a.city, a.specialty, a.bio)),
+    }
+
+
+def user_doc(u: Any) -> Dict[str, Any]:
+    name = _join(u.first_name, u.last_name)
+    return {
+        "entity_type": ENTITY_USER,
+        "entity_id": u.id,
+        "user_id": u.id,
+        "title": (name or u.email)[:200],
+        "subtitle": _join(u.email, u.role)[:300],
+        "title_norm": normalize_search_text(name or u.email)[:200],
+        "content": normalize_search_text(_join(name, u.email, u.role)),
+    }
+
+
+def _write_docs(conn, docs: Sequence[Dict[str, Any]]) -> None:
+    now = datetime.utcnow()
+    for d in docs:
+        conn.execute(
+            delete(_docs).where(
+                _docs.c.entity_type == d["entity_type"],
+                _docs.c.entity_id == d["entity_id"],
+            )
+        )
+        conn.execute(insert(_docs).values(**d, updated_at=now))
+
+
+def _delete_docs(conn, keys: Iterable[Tuple[str, int]]) -> None:
+    for entity_type, entity_id in keys:
+        conn.execute(
+            delete(_docs).where(
+                _docs.c.entity_type == entity_type,
+                _docs.c.entity_id == entity_id,
+            )
+        )
+
+
+def _user_rows(conn, user_ids: Iterable[int]) -> Dict[int, Any]:
+    ids = {i for i in user_ids if i is not None}
+    if not ids:
+        return {}
+    rows = conn.execute(
+        select(_users.c.id, _users.c.first_name, _users.c.last_name, _users.c.email).where(
+            _users.c.id.in_(ids)
+        )
+    ).all()
+    return {r.id: r for r in rows}
+
+
+# =========================
+# Indexación automática
+# =========================
+@event.listens_for(Session, "after_flush")
+def _index_after_flush(session: Session, flush_context) -> None:
+    requests: Dict[int, ServiceRequest] = {}
+    apps: Dict[int, WorkerApplication] = {}
+    users: Dict[int, User] = {}
+    removed: List[Tuple[str, int]] = []
+
+    for obj in list(session.new) + [o for o in session.dirty if session.is_modified(o)]:
+        if isinstance(obj, ServiceRequest):
+            requests[obj.id] = obj
+        elif isinstance(obj, WorkerApplication):
+            apps[obj.id] = obj
+        elif isinstance(obj, User):
+            users[obj.id] = obj
+
+    for obj in session.deleted:
+        if isinstance(obj, ServiceRequest):
+            removed.append((ENTITY_REQUEST, obj.id))
+        elif isinstance(obj, WorkerApplication):
+            removed.append((ENTITY_APPLICATION, obj.id))
+        elif isinstance(obj, User):
+            removed.append((ENTITY_USER, obj.id))
+
+    if not (requests or apps or users or removed):
+        return
+
+    conn = session.connection()
+    docs: List[Dict[str, Any]] = [request_doc(r) for r in requests.values()]
+    docs += [user_doc(u) for u in users.values()]
+
+    # nombre/email del usuario viven en User: re-indexa sus postulaciones
+    if users:
+        for row in conn.execute(select(_apps).where(_apps.c.user_id.in_(users.keys()))).all():
+            if row.id not in apps:
+                apps[row.id] = row
+
+    if apps:
+        known = {uid: u for uid, u in users.items()}
+        missing = {a.user_id for a in apps.values()} - known.keys()
+        known.update(_user_rows(conn, missing))
+        docs += [application_doc(a, known.get(a.user_id)) for a in apps.values()]
+
+    _delete_docs(conn, removed)
+    _write_docs(conn, docs)
+
+
+def rebuild_search_index(db: Session) -> int:
+    """Reindexa todo. No hace commit. Devuelve cuántos documentos quedaron."""
+    conn = db.connection()
+    conn.execute(delete(_docs))
+
+    users = {u.id: u for u in db.query(User).all()}
+    docs: List[Dict[str, Any]] = [user_doc(u) for u in users.values()]
+    docs += [request_doc(r) for r in db.query(ServiceRequest).all()]
+    docs += [
+        application_doc(a, users.get(a.user_id))
+        for a in db.query(WorkerApplication).all()
+    ]
+    for d in docs:
+        conn.execute(insert(_docs).values(**d, updated_at=datetime.utcnow()))
+    return len(docs)
+
+
+def ensure_search_index(db: Session) -> None:
+    """Primer arranque: si el índice está vacío pero hay datos, lo construye."""
+    if db.query(SearchDocument.id).first() is not None:
+        return
+    if db.query(User.id).first() is None:
+        return
+    rebuild_search_index(db)
+    db.commit()
+
+
+# =========================
+# Consulta
+# =========================
+@dataclass
+class SearchHit:
+    entity_type: str
+    entity_id: int
+    user_id: Optional[int]
+    title: str
+    subtitle: Optional[str]
+    rank: float
+
+
+def _fts5_query(q_norm: str) -> str:
+    # cada término como prefijo literal: "plom"* "bogota"*
+    terms = [t for t in re.split(r"[^a-z0-9@._\-]+", q_norm) if t]
+    return " ".join('"' + t.replace('"', "") + '"*' for t in terms)
+
+
+def _filters_sql(types: Sequence[str], user_id: Optional[int], params: Dict[str, Any]) -> str:
+    clauses = []
+    if types:
+        names = []
+        for i, t in enumerate(types):
+            params[f"type_{i}"] = t
+            names.append(f":type_{i}")
+        clauses.append(f"d.entity_type IN ({', '.join(names)})")
+    if user_id is not None:
+        params["owner_id"] = user_id
+        clauses.append("d.user_id = :owner_id")
+    return "".join(f" AND {c}" for c in clauses)
+
+
+_SELECT = "SELECT d.entity_type, d.entity_id, d.user_id, d.title, d.subtitle"
+
+
+def search_documents(
+    db: Session,
+    q: str,
+    *,
+    types: Sequence[str] = ENTITY_TYPES,
+    user_id: Optional[int] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> Tuple[List[SearchHit], bool, str]:
+    """
+    Devuelve (hits, has_more, engine). `user_id` restringe a documentos de ese dueño.
+    """
+    q_norm = normalize_search_text(q)
+    if not q_norm:
+        return [], False, "none"
+
+    dialect = db.get_bind().dialect.name
+    params: Dict[str, Any] = {"q": q_norm, "limit": limit + 1, "offset": offset}
+    where = _filters_sql(types, user_id, params)
+
+    if dialect == "postgresql":
+        fts_from = (
+            " FROM search_documents d, websearch_to_tsquery('spanish', :q) query"
+            " WHERE d.tsv @@ query" + where
+        )
+        rows = db.execute(
+            text(
+                _SELECT + ", ts_rank_cd(d.tsv, query) AS rank" + fts_from
+                + " ORDER BY rank DESC, d.id DESC LIMIT :limit OFFSET :offset"
+            ),
+            params,
+        ).all()
+        engine = "postgres-fts"
+
+        no_fts_match = not rows and (
+            offset == 0
+            or db.execute(text("SELECT 1" + fts_from + " LIMIT 1"), params).first() is None
+        )
+        if no_fts_match:
+            # fallback: emails, nombres parciales, errores de tipeo
+            params["min_sim"] = TRGM_MIN_SIMILARITY
+            rows = db.execute(
+                text(
+                    _SELECT + ", word_similarity(:q, d.content) AS rank"
+                    " FROM search_documents d"
+                    " WHERE :q <% d.content AND word_similarity(:q, d.content) >= :min_sim"
+                    + where
+                    + " ORDER BY rank DESC, d.id DESC LIMIT :limit OFFSET :offset"
+                ),
+                params,
+            ).all()
+            engine = "postgres-trgm"
+
+    elif dialect == "sqlite":
+        params["q"] = _fts5_query(q_norm)
+        rows = db.execute(
+            text(
+                _SELECT + ", -bm25(search_documents_fts, 2.0, 1.0) AS rank"
+                " FROM search_documents_fts"
+                " JOIN search_documents d ON d.id = search_documents_fts.rowid"
+                " WHERE search_documents_fts MATCH :q" + where
+                + " ORDER BY rank DESC, d.id DESC LIMIT :limit OFFSET :offset"
+            ),
+            params,
+        ).all()
+        engine = "sqlite-fts5"
+
+    else:
+        params["like"] = f"%{q_norm}%"
+        rows = db.execute(
+            text(
+                _SELECT + ", 0.0 AS rank FROM search_documents d"
+                " WHERE d.content LIKE :like" + where
+                + " ORDER BY d.id DESC LIMIT :limit OFFSET :offset"
+            ),
+            params,
+        ).all()
+        engine = "like"
+
+    has_more = len(rows) > limit
+    hits = [
+        SearchHit(
+            entity_type=r.entity_type,
+            entity_id=r.entity_id,
+            user_id=r.user_id,
+            title=r.title,
+            subtitle=r.subtitle,
+            rank=float(r.rank or 0.0),
+        )
+        for r in rows[:limit]
+    ]
+    return hits, has_more, engine
@@ -0,0 +1,146 @@
+# backend/app/services/technician_directory.py
+"""
+Mantiene la tabla `technician_directory` (directorio público de /workers).
+
+El directorio es una copia de lectura: solo técnicos con un caso VERIFIED
+vigente, con los campos públicos ya normalizados y el orden precalculado.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, noload
+
+from ..core.text import normalize_key
+from ..models.technician_directory import (
+    TechnicianDirectoryCategory,
+    TechnicianDirectoryEntry,
+)
+from ..models.technician_verification import (
+    TechLevel,
+    TechnicianProfile,
+    TechStatus,
+    VerificationCase,
+)
+
+BADGE_RANK = {
+    TechLevel.BASIC: 1,
+    TechLevel.TRUST: 2,
+    TechLevel.PRO: 3,
+    TechLevel.PAY: 4,
+}
+
+
+def directory_sort_key(badge_level: Optional[TechLevel], rating: Optional[float]) -> int:
+    # badge primero, luego rating (0..5 -> 0..500)
+    return BADGE_RANK.get(badge_level, 0) * 1000 + int(round((rating or 0) * 100))
+
+
+def _current_verified_case(
+    db: Session, tech_id: int, now: datetime
+) -> Optional[VerificationCase]:
+    return (
+        db.query(VerificationCase)
+        .options(
+            noload(VerificationCase.documents),
+            noload(VerificationCase.logs),
+            noload(VerificationCase.decided_by_user),
+        )
+        .filter(
+            VerificationCase.tech_id == tech_id,
+            VerificationCase.status == TechStatus.VERIFIED,
+            or_(VerificationCase.expires_at.is_(None), VerificationCase.expires_at > now),
+        )
+        .order_by(VerificationCase.verified_at.desc())
+        .first()
+    )
+
+
+def _sync_categories(entry: TechnicianDirectoryEntry, categories) -> None:
+    wanted = {normalize_key(c) for c in (categories or []) if c and normalize_key(c)}
+    current = {c.category_key: c for c in entry.category_keys}
+
+    for key, row in current.items():
+        if key not in wanted:
+            entry.category_keys.remove(row)
+    for key in sorted(wanted - current.keys()):
+        entry.category_keys.append(TechnicianDirectoryCategory(category_key=key))
+
+
+def refresh_directory_entry(db: Session, tech_id: int) -> Optional[TechnicianDirectoryEntry]:
+    """
+    Recalcula la fila del técnico (la crea, la actualiza o la borra si ya no está
+    verificado). No hace commit.
+    """
+    # autoflush=False en SessionLocal: que se vean los cambios pendientes
+    db.flush()
+    now = datetime.utcnow()
+
+    profile = (
+        db.query(TechnicianProfile)
+        .options(noload(TechnicianProfile.user), noload(TechnicianProfile.cases))
+        .filter(TechnicianProfile.id == tech_id)
+        .first()
+    )
+    case = _current_verified_case(db, tech_id, now) if profile else None
+    entry = db.get(TechnicianDirectoryEntry, tech_id)
+
+    if profile is None or case is None:
+        if entry is not None:
+            db.delete(entry)
+        return None
+
+    if entry is None:
+        entry = TechnicianDirectoryEntry(tech_id=tech_id)
+        db.add(entry)
+
+    entry.public_name = profile.public_name or "Técnico SIPH"
+    entry.public_photo_url = profile.public_photo_url
+    entry.city = profile.city
+    entry.city_key = normalize_key(profile.city) or None
+    entry.radius_km = profile.radius_km
+    entry.categories = list(profile.categories or [])
+    entry.specialty = profile.specialty
+    entry.years_experience = profile.years_experience
+    entry.bio = profile.bio
+    entry.badge_level = profile.badge_level or TechLevel.BASIC
+    entry.sort_key = directory_sort_key(entry.badge_level, entry.rating)
+    entry.verified_at = case.verified_at
+    entry.expires_at = case.expires_at
+    entry.refreshed_at = now
+    _sync_categories(entry, profile.categories)
+    return entry
+
+
+def rebuild_directory(db: Session) -> int:
+    """Reconstruye todo el directorio. No hace commit. Devuelve cuántas filas quedan."""
+    now = datetime.utcnow()
+    verified_ids = {
+        r[0]
+        for r in db.query(VerificationCase.tech_id)
+        .filter(
+            VerificationCase.status == TechStatus.VERIFIED,
+            or_(VerificationCase.expires_at.is_(None), VerificationCase.expires_at > now),
+        )
+        .distinct()
+        .all()
+    }
+    stale_ids = {
+        r[0] for r in db.query(TechnicianDirectoryEntry.tech_id).all()
+    } - verified_ids
+
+    for tech_id in stale_ids:
+        refresh_directory_entry(db, tech_id)
+
+    count = 0
+    for tech_id in verified_ids:
+        if refresh_directory_entry(db, tech_id) is not None:
+            count += 1
+    return count
+
+
+def ensure_directory(db: Session) -> None:
+    """Primer arranque: si el directorio está vacío, lo construye una vez."""
+    if db.query(TechnicianDirectoryEntry.tech_id).first() is None:
+        rebuild_directory(db)
+        db.commit()
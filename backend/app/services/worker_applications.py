@@ -0,0 +1,161 @@
+# backend/app/services/worker_applications.py
+"""
+Listado admin de postulaciones: búsqueda y orden en servidor, keyset
+pagination y conteo por estado en la misma respuesta.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session, contains_eager
+
+from ..core.text import normalize_search_text
+from ..models import User, WorkerApplication, WorkerApplicationStatus
+from ..models.search_document import SearchDocument
+from .search import ENTITY_APPLICATION
+
+SORT_KEYS = ("updated_at", "name", "status", "years_experience")
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def _sort_expr(sort: str):
+    if sort == "name":
+        return func.lower(User.first_name + " " + User.last_name)
+    if sort == "status":
+        return WorkerApplication.status
+    if sort == "years_experience":
+        return func.coalesce(WorkerApplication.years_experience, 0)
+    return WorkerApplication.updated_at
+
+
+def encode_cursor(sort: str, value: Any, app_id: int) -> str:
+    raw = json.dumps([sort, value, app_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        c_sort, value, app_id = json.loads(base64.urlsafe_b64decode(padded))
+        if c_sort != sort:
+            raise ValueError("sort distinto")
+        if sort == "updated_at":
+            value = datetime.fromisoformat(value)
+        return value, int(app_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="cursor inválido.")
+
+
+def parse_status_filter(status_filter: Optional[str]) -> Optional[str]:
+    if not status_filter:
+        return None
+    try:
+        return WorkerApplicationStatus(status_filter.upper().strip()).value
+    except Exception:
+        raise HTTPException(
+            status_code=400,
+            detail="status_filter inválido. Usa PENDING, APPROVED o REJECTED.",
+        )
+
+
+def search_filter(q_norm: str):
+    """
+    Postulaciones cuyo documento de búsqueda (nombre, email, ciudad,
+    especialidad, bio) contiene todos los términos de `q_norm` (ya normalizado).
+    Es un filtro más: no cambia el orden ni el cursor.
+    """
+    docs = select(SearchDocument.entity_id).where(
+        SearchDocument.entity_type == ENTITY_APPLICATION,
+        *[SearchDocument.content.contains(t, autoescape=True) for t in q_norm.split()],
+    )
+    return WorkerApplication.id.in_(docs)
+
+
+def status_counts(db: Session) -> Dict[str, int]:
+    counts = {s.value: 0 for s in WorkerApplicationStatus}
+    for st, n in (
+        db.query(WorkerApplication.status, func.count(WorkerApplication.id))
+        .group_by(WorkerApplication.status)
+        .all()
+    ):
+        counts[st] = int(n)
+    counts["total"] = sum(v for k, v in counts.items() if k != "total")
+    return counts
+
+
+def list_applications_page(
+    db: Session,
+    *,
+    status_filter: Optional[str] = None,
+    q: Optional[str] = None,
+    sort: str = "updated_at",
+    order: str = "desc",
+    limit: int = DEFAULT_LIMIT,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    if sort not in SORT_KEYS:
+        raise HTTPException(
+            status_code=400,
+            detail="sort inválido (updated_at|name|status|years_experience).",
+        )
+    order = (order or "desc").lower()
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order inválido (asc|desc).")
+    limit = max(1, min(limit, MAX_LIMIT))
+    q_norm = normalize_search_text(q or "")
+
+    expr = _sort_expr(sort)
+    desc = order == "desc"
+
+    # el valor de orden sale de la misma consulta (cursor consistente con la DB)
+    query = (
+        db.query(WorkerApplication, expr.label("sort_value"))
+        .join(User, User.id == WorkerApplication.user_id)
+        .options(contains_eager(WorkerApplication.user))
+    )
+
+    st = parse_status_filter(status_filter)
+    if st:
+        query = query.filter(WorkerApplication.status == st)
+
+    if q_norm:
+        query = query.filter(search_filter(q_norm))
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort)
+        if desc:
+            query = query.filter(
+                or_(expr < value, and_(expr == value, WorkerApplication.id < last_id))
+            )
+        else:
+            query = query.filter(
+                or_(expr > value, and_(expr == value, WorkerApplication.id > last_id))
+            )
+
+    if desc:
+        query = query.order_by(expr.desc(), WorkerApplication.id.desc())
+    else:
+        query = query.order_by(expr.asc(), WorkerApplication.id.asc())
+
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_app, last_value = rows[-1]
+        if isinstance(last_value, datetime):
+            last_value = last_value.isoformat()
+        next_cursor = encode_cursor(sort, last_value, last_app.id)
+
+    items: List[WorkerApplication] = [app for app, _ in rows]
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
+        "counts": status_counts(db),
+    }
@@ -0,0 +1,261 @@
+import asyncio
+import json
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Literal, Optional, Sequence
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
+
+# =========================================================
+# API HTTP DEL ASISTENTE
+# =========================================================
+# Corre en su propio puerto (API_PORT) junto a la UI de Gradio.
+# - /health: el proceso responde (siempre 200 mientras esté vivo).
+# - /ready: 200 cuando el modelo terminó de cargar y calentar; 503 mientras tanto.
+# - POST /v1/chat: respuesta JSON, o SSE si stream=true / Accept: text/event-stream.
+#   Con session_id el historial lo guarda el servidor y `history` se ignora.
+# - /metrics: métricas en formato de texto Prometheus (si se pasa `metrics`).
+#
+# Concurrencia acotada: como mucho `max_concurrency` respuestas en curso y
+# `max_queue` esperando turno; más allá -> 429. La generación en sí pasa por el
+# BatchScheduler de app.py, igual que la UI.
+
+
+class ChatMessage(BaseModel):
+    role: Literal["user", "assistant"]
+    content: str
+
+
+class ChatRequest(BaseModel):
+    message: str = Field(..., min_length=1, max_length=4000)
+    history: List[ChatMessage] = Field(default_factory=list)
+    session_id: Optional[str] = Field(None, min_length=1, max_length=128)
+    stream: bool = False
+
+
+class ChatResponse(BaseModel):
+    answer: str
+    elapsed_ms: float
+
+
+class ConcurrencyGate:
+    """Semáforo con cola acotada y tiempo máximo de espera en la cola."""
+
+    def __init__(self, max_active: int, max_queue: int, queue_timeout: float):
+        self.max_active = max(1, max_active)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self._sem = asyncio.Semaphore(self.max_active)
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    async def acquire(self) -> None:
+        if self._sem.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(429, detail="Asistente ocupado: cola llena, intenta de nuevo.")
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._sem.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise HTTPException(503, detail="Asistente ocupado: se agotó la espera en cola.")
+        finally:
+            self.waiting -= 1
+        self.active += 1
+
+    def release(self) -> None:
+        self.active -= 1
+        self._sem.release()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "max_active": self.max_active,
+            "max_queue": self.max_queue,
+        }
+
+
+def _sse(data: Dict, event: Optional[str] = None) -> str:
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+_STREAM_END = object()
+
+
+def _release_when_done(gate: ConcurrencyGate) -> Callable[[asyncio.Future], None]:
+    def callback(fut: asyncio.Future) -> None:
+        gate.release()
+        # si nadie esperaba el resultado (504), que el error no quede sin recoger
+        if not fut.cancelled():
+            fut.exception()
+
+    return callback
+
+
+def create_api(
+    readiness: Callable[[], Dict],
+    generate: Optional[Callable[[List[Dict], str], str]] = None,
+    stream: Optional[Callable[[List[Dict], str], Iterator[str]]] = None,
+    stream_session: Optional[Callable[[str, str], Iterator[str]]] = None,
+    clean: Callable[[str], str] = lambda text: text,
+    max_concurrency: int = 4,
+    max_queue: int = 16,
+    queue_timeout: float = 30.0,
+    request_timeout: float = 120.0,
+    stream_timeout: float = 120.0,
+    cors_origins: Sequence[str] = (),
+    metrics: Optional[Callable[[], str]] = None,
+) -> FastAPI:
+    api = FastAPI(title="Asistente SIPH API")
+    gate = ConcurrencyGate(max_concurrency, max_queue, queue_timeout)
+
+    if cors_origins:
+        api.add_middleware(
+            CORSMiddleware,
+            allow_origins=list(cors_origins),
+            allow_methods=["GET", "POST"],
+            allow_headers=["*"],
+        )
+
+    @api.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    @api.get("/ready")
+    def ready():
+        state = dict(readiness(), api=gate.stats())
+        return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+    if metrics is not None:
+
+        @api.get("/metrics")
+        def prometheus_metrics():
+            text = metrics()
+            stats = gate.stats()
+            text += "".join(
+                f"# TYPE siph_api_{k} gauge\nsiph_api_{k} {stats[k]}\n" for k in ("active", "waiting")
+            )
+            text += f"# TYPE siph_api_rejected_total counter\nsiph_api_rejected_total {stats['rejected']}\n"
+            return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
+
+    if generate is None or stream is None:
+        return api
+
+    @api.post("/v1/chat", response_model=ChatResponse)
+    async def chat(payload: ChatRequest, request: Request):
+        state = readiness()
+        if not state["ready"]:
+            raise HTTPException(503, detail=f"Modelo cargando (fase: {state['phase']})")
+
+        history = [m.model_dump() for m in payload.history]
+        use_session = payload.session_id is not None and stream_session is not None
+
+        def open_stream() -> Iterator[str]:
+            if use_session:
+                return stream_session(payload.session_id, payload.message)
+            return stream(history, payload.message)
+
+        def run_generate() -> str:
+            if not use_session:
+                return generate(history, payload.message)
+            text = ""
+            for text in open_stream():
+                pass
+            return clean(text)
+
+        wants_sse = payload.stream or "text/event-stream" in request.headers.get("accept", "")
+
+        await gate.acquire()
+        t0 = time.perf_counter()
+
+        if not wants_sse:
+            # El hilo no se puede interrumpir: si vence el plazo el cliente recibe
+            # 504, pero el cupo se libera recién cuando run_generate termina de verdad.
+            work = asyncio.ensure_future(run_in_threadpool(run_generate))
+            work.add_done_callback(_release_when_done(gate))
+            try:
+                answer = await asyncio.wait_for(asyncio.shield(work), timeout=request_timeout)
+            except asyncio.TimeoutError:
+                raise HTTPException(504, detail=f"Sin respuesta en {request_timeout:.0f} s")
+            return ChatResponse(answer=answer, elapsed_ms=round((time.perf_counter() - t0) * 1000, 1))
+
+        # Un hilo consume el generador y pasa los trozos por una cola: así cada
+        # espera tiene su propio plazo (lo que quede de request_timeout, como mucho
+        # stream_timeout) aunque generate se quede colgado sin entregar nada.
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+
+        def pump() -> None:
+            gen = None
+            try:
+                gen = open_stream()
+                for text in gen:
+                    loop.call_soon_threadsafe(chunks.put_nowait, text)
+                    if stop.is_set():
+                        break
+            except Exception as e:
+                loop.call_soon_threadsafe(chunks.put_nowait, e)
+            finally:
+                if gen is not None:
+                    gen.close()
+                loop.call_soon_threadsafe(chunks.put_nowait, _STREAM_END)
+
+        work = asyncio.ensure_future(run_in_threadpool(pump))
+        work.add_done_callback(_release_when_done(gate))
+
+        async def events():
+            # stream_reply entrega el texto acumulado: al cliente solo va lo nuevo
+            sent = ""
+            deadline = t0 + request_timeout
+            try:
+                while True:
+                    wait = min(deadline - time.perf_counter(), stream_timeout)
+                    try:
+                        text = await asyncio.wait_for(chunks.get(), timeout=max(wait, 0.0))
+                    except asyncio.TimeoutError:
+                        if time.perf_counter() >= deadline:
+                            detail = f"Sin terminar en {request_timeout:.0f} s"
+                        else:
+                            detail = f"Sin tokens en {stream_timeout:.0f} s"
+                        yield _sse({"detail": detail}, "error")
+                        return
+                    if text is _STREAM_END:
+                        break
+                    if isinstance(text, Exception):
+                        yield _sse({"detail": "Error en la generación"}, "error")
+                        return
+                    delta = text[len(sent) :] if text.startswith(sent) else text
+                    sent = text
+                    if delta:
+                        yield _sse({"delta": delta})
+                elapsed_ms = round((time.perf_counter() - t0) * 1000, 1)
+                yield _sse({"answer": clean(sent), "elapsed_ms": elapsed_ms}, "done")
+            finally:
+                # el cupo lo libera pump al salir; aquí solo se le pide que corte
+                stop.set()
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    return api
+
+
+def serve_in_thread(api: FastAPI, host: str, port: int) -> threading.Thread:
+    server = uvicorn.Server(uvicorn.Config(api, host=host, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="api-server", daemon=True)
+    thread.start()
+    print(f"[BOOT] API en http://{host}:{port} (/health, /ready, /v1/chat, /metrics)")
+    return thread
@@ -0,0 +1,205 @@
+import threading
+import time
+from collections import deque
+from queue import Queue
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from transformers.generation.streamers import BaseStreamer
+
+# =========================================================
+# SCHEDULER DE BATCHES
+# =========================================================
+# Un solo hilo trabajador consume la cola: toma la primera petición, espera
+# hasta `window_ms` por más (máximo `max_batch_size`) y ejecuta un único
+# generate para todas. Cada petición recibe su texto por su propia cola, así
+# el streaming por usuario se mantiene.
+
+_END = object()
+
+
+class PendingRequest:
+    def __init__(self, payload: Any):
+        self.payload = payload
+        self.queue: Queue = Queue()
+        self.enqueued_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        # telemetría: primer token generado, fin, tokens generados y tamaño del batch
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.new_tokens = 0
+        self.batch_size = 0
+        # eos | budget | stop_sequence | structure ("" = no se sabe: error o sin terminar)
+        self.stop_reason = ""
+
+    # --- lado del trabajador ---
+    def push(self, text: str) -> None:
+        self.queue.put(text)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Cierra el stream (una sola vez: el primer cierre es el que vale)."""
+        if self.finished_at is not None:
+            return
+        self.finished_at = time.perf_counter()
+        self.queue.put(error if error is not None else _END)
+
+    # --- lado del que llama ---
+    def stream(self, timeout: Optional[float] = None) -> Iterator[str]:
+        """Fragmentos de texto hasta terminar. Lanza queue.Empty si pasa `timeout` sin datos."""
+        while True:
+            item = self.queue.get(timeout=timeout)
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+
+class BatchScheduler:
+    def __init__(
+        self,
+        run_batch: Callable[[List[PendingRequest]], None],
+        max_batch_size: int = 4,
+        window_ms: float = 30.0,
+    ):
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.window_s = max(0.0, window_ms) / 1000.0
+
+        self._pending: Deque[PendingRequest] = deque()
+        self._cond = threading.Condition()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "batches": 0,
+            "batched_requests": 0,
+            "max_batch": 0,
+            "queue_wait_ms_total": 0.0,
+            "batch_ms_total": 0.0,
+        }
+
+        self._worker = threading.Thread(target=self._loop, name="batch-scheduler", daemon=True)
+        self._worker.start()
+
+    def submit(self, payload: Any) -> PendingRequest:
+        req = PendingRequest(payload)
+        with self._cond:
+            self._pending.append(req)
+            self._stats["submitted"] += 1
+            self._cond.notify()
+        return req
+
+    def _collect(self) -> List[PendingRequest]:
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = time.perf_counter() + self.window_s
+            while len(self._pending) < self.max_batch_size:
+                left = deadline - time.perf_counter()
+                if left <= 0:
+                    break
+                self._cond.wait(timeout=left)
+            n = min(len(self._pending), self.max_batch_size)
+            return [self._pending.popleft() for _ in range(n)]
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._collect()
+            t0 = time.perf_counter()
+            for req in batch:
+                req.started_at = t0
+                req.batch_size = len(batch)
+            try:
+                self.run_batch(batch)
+                ok = True
+            except Exception as e:
+                # las filas que ya terminaron (EOS) conservan su respuesta; al resto
+                # les llega el error en vez de un fin normal con texto a medias
+                print(f"[BATCH] Error en batch de {len(batch)}: {e}")
+                for req in batch:
+                    req.finish(e)
+                ok = False
+
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+            with self._cond:
+                s = self._stats
+                s["batches"] += 1
+                s["batched_requests"] += len(batch)
+                s["max_batch"] = max(s["max_batch"], len(batch))
+                s["batch_ms_total"] += elapsed_ms
+                s["queue_wait_ms_total"] += sum((t0 - r.enqueued_at) * 1000 for r in batch)
+                s["completed" if ok else "failed"] += len(batch)
+
+    def metrics(self) -> Dict[str, float]:
+        with self._cond:
+            s = dict(self._stats)
+            s["queue_depth"] = len(self._pending)
+        batches = s["batches"] or 1
+        requests = s["batched_requests"] or 1
+        s["avg_batch_size"] = s["batched_requests"] / batches
+        s["avg_queue_wait_ms"] = s["queue_wait_ms_total"] / requests
+        s["avg_batch_ms"] = s["batch_ms_total"] / batches
+        return s
+
+
+# =========================================================
+# STREAMER POR FILA
+# =========================================================
+class BatchStreamer(BaseStreamer):
+    """
+    Recibe los tokens de un generate por lotes (un tensor [batch] por paso) y
+    entrega a cada petición solo el texto nuevo de su fila.
+    """
+
+    def __init__(self, tokenizer, requests: List[PendingRequest], eos_token_ids: List[int]):
+        self.tokenizer = tokenizer
+        self.requests = requests
+        self.eos = set(eos_token_ids)
+        self.ids: List[List[int]] = [[] for _ in requests]
+        self.sent: List[int] = [0] * len(requests)
+        self.done: List[bool] = [False] * len(requests)
+        self._prompt_seen = False
+
+    def put(self, value) -> None:
+        # la primera llamada trae los input_ids del prompt
+        if not self._prompt_seen:
+            self._prompt_seen = True
+            return
+
+        # generate normal: [batch] (un token por fila); asistida: [batch, k] (varios aceptados)
+        rows = value.tolist() if value.dim() > 1 else [[t] for t in value.tolist()]
+        for row, tokens in enumerate(rows):
+            for tok in tokens:
+                if self.done[row]:
+                    break
+                if tok in self.eos:
+                    self._flush(row)
+                    self.done[row] = True
+                    # antes de finish(): quien espera el stream ya lo ve al terminar
+                    self.requests[row].stop_reason = "eos"
+                    self.requests[row].finish()
+                    break
+                self.ids[row].append(tok)
+                req = self.requests[row]
+                req.new_tokens += 1
+                if req.first_token_at is None:
+                    req.first_token_at = time.perf_counter()
+            if not self.done[row]:
+                self._flush(row)
+
+    def _flush(self, row: int) -> None:
+        text = self.tokenizer.decode(self.ids[row], skip_special_tokens=True)
+        # no cortar un carácter multibyte a la mitad
+        if text.endswith("�"):
+            return
+        if len(text) > self.sent[row]:
+            self.requests[row].push(text[self.sent[row] :])
+            self.sent[row] = len(text)
+
+    def end(self) -> None:
+        for row, req in enumerate(self.requests):
+            if not self.done[row]:
+                self._flush(row)
+                self.done[row] = True
+                req.finish()
+
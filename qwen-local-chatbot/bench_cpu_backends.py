@@ -0,0 +1,145 @@
+import argparse
+import difflib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# =========================================================
+# BENCHMARK DE BACKENDS CPU (fp32 / bf16 / int8)
+# =========================================================
+# Cada backend corre en su propio proceso (RSS limpio). Decodificación greedy
+# para que la comparación contra fp32 sea determinista.
+# Uso:
+#   python bench_cpu_backends.py --backends fp32,bf16,int8 --max-new-tokens 96
+
+QUESTIONS = [
+    "¿Cómo creo una solicitud en SIPH?",
+    "¿Qué significan los estados CREATED, MATCHING y DONE?",
+    "¿Cómo funciona la postulación para trabajar como técnico?",
+    "¿Qué documentos se usan en la verificación?",
+    "¿Qué puede hacer el admin en solicitudes de técnico?",
+]
+
+SYSTEM = (
+    "Eres el asistente oficial del proyecto SIPH (Servicios Inmediatos para el Hogar). "
+    "Responde en español, breve y solo con la información del contexto.\n\n"
+)
+
+
+def _rss_mb() -> float:
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss / 1e6
+    except ImportError:
+        import resource
+
+        # Linux: KB (pico del proceso)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def run_worker(backend: str, model_name: str, max_new_tokens: int, out_path: str) -> None:
+    import torch
+
+    from kb_index import KBIndex
+    from model_loader import load_model, load_tokenizer
+    from project_kb import DEFAULT_CONTEXT_IDS, PROJECT_KB
+
+    t0 = time.perf_counter()
+    tokenizer = load_tokenizer(model_name)
+    model, effective = load_model(model_name, use_cuda=False, cpu_backend=backend)
+    load_s = time.perf_counter() - t0
+    rss_mb = _rss_mb()
+
+    index = KBIndex(PROJECT_KB, DEFAULT_CONTEXT_IDS)
+    answers, gen_tokens, gen_s = [], 0, 0.0
+    for q in QUESTIONS:
+        context = index.render(index.select(q, top_k=3))
+        prompt = tokenizer.apply_chat_template(
+            [{"role": "system", "content": SYSTEM + context}, {"role": "user", "content": q}],
+            tokenize=False,
+            add_generation_prompt=True,
+        )
+        inputs = tokenizer(prompt, return_tensors="pt")
+        t0 = time.perf_counter()
+        with torch.inference_mode():
+            out = model.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                do_sample=False,
+                pad_token_id=tokenizer.pad_token_id,
+                eos_token_id=tokenizer.eos_token_id,
+            )
+        gen_s += time.perf_counter() - t0
+        new = out[0][inputs["input_ids"].shape[-1] :]
+        gen_tokens += int(new.shape[-1])
+        answers.append(tokenizer.decode(new, skip_special_tokens=True).strip())
+
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "backend": effective,
+                "load_s": load_s,
+                "rss_mb": max(rss_mb, _rss_mb()),
+                "tokens": gen_tokens,
+                "tokens_per_s": gen_tokens / gen_s if gen_s else 0.0,
+                "answers": answers,
+            },
+            f,
+            ensure_ascii=False,
+        )
+
+
+def agreement(base: list, other: list) -> tuple:
+    exact = sum(a == b for a, b in zip(base, other)) / max(len(base), 1)
+    ratio = sum(difflib.SequenceMatcher(None, a, b).ratio() for a, b in zip(base, other))
+    return exact, ratio / max(len(base), 1)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de backends CPU del asistente SIPH")
+    ap.add_argument("--backends", default="fp32,bf16,int8")
+    ap.add_argument("--model", default=os.getenv("MODEL_NAME", "Qwen/Qwen2.5-1.5B-Instruct"))
+    ap.add_argument("--max-new-tokens", type=int, default=96)
+    ap.add_argument("--worker", default="", help=argparse.SUPPRESS)
+    ap.add_argument("--out", default="", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.model, args.max_new_tokens, args.out)
+        return
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    if "fp32" not in backends:
+        backends.insert(0, "fp32")  # línea base para la concordancia
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in backends:
+            out = os.path.join(tmp, f"{backend}.json")
+            cmd = [
+                sys.executable, os.path.abspath(__file__),
+                "--worker", backend, "--out", out,
+                "--model", args.model, "--max-new-tokens", str(args.max_new_tokens),
+            ]
+            print(f"[BENCH] {backend}...")
+            subprocess.run(cmd, check=True, env=dict(os.environ, CUDA_VISIBLE_DEVICES=""))
+            with open(out, "r", encoding="utf-8") as f:
+                results[backend] = json.load(f)
+
+    base = results["fp32"]["answers"]
+    print(f"\n[BENCH] Modelo: {args.model} | {len(QUESTIONS)} preguntas, greedy, max {args.max_new_tokens} tokens")
+    print(f"{'backend':<8} {'efectivo':<10} {'carga s':>8} {'RSS MB':>8} {'tok/s':>7} {'exactas':>8} {'similitud':>9}")
+    for backend, r in results.items():
+        exact, ratio = agreement(base, r["answers"])
+        print(
+            f"{backend:<8} {r['backend']:<10} {r['load_s']:>8.1f} {r['rss_mb']:>8.0f} "
+            f"{r['tokens_per_s']:>7.2f} {exact:>8.0%} {ratio:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import random
+import statistics
+import time
+
+from kb_index import KBIndex
+
+# =========================================================
+# BENCHMARK DEL ÍNDICE DE LA KB (sin cargar el modelo)
+# =========================================================
+# Uso:
+#   python bench_retrieval.py --sections 5000 --queries 2000
+
+VOCAB = (
+    "solicitud servicio tecnico trabajador admin usuario estado documento verificacion "
+    "nivel basic trust pro pay ruta formulario mapa ciudad barrio categoria urgente "
+    "resena calificacion postulacion aprobar rechazar cedula antecedentes certificado "
+    "plomeria electricidad gas pintura carpinteria cerradura jardineria limpieza "
+    "de la el en que como para con por los las un una se su al lo mas"
+).split()
+
+
+# vocabulario con distribución tipo Zipf (como texto real)
+VOCAB += [f"termino{i}" for i in range(20000)]
+WEIGHTS = [1.0 / (rank + 1) for rank in range(len(VOCAB))]
+
+
+def _words(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choices(VOCAB, weights=WEIGHTS, k=n))
+
+
+def synthetic_kb(rng: random.Random, n: int):
+    return [
+        {
+            "id": f"s{i}",
+            "title": _words(rng, 5),
+            "keywords": [_words(rng, rng.randint(1, 3)) for _ in range(rng.randint(3, 10))],
+            "content": _words(rng, rng.randint(60, 220)),
+        }
+        for i in range(n)
+    ]
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(pct / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de recuperación de la KB SIPH")
+    ap.add_argument("--sections", type=int, default=5000)
+    ap.add_argument("--queries", type=int, default=2000)
+    ap.add_argument("--top-k", type=int, default=6)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    kb = synthetic_kb(rng, args.sections)
+
+    t0 = time.perf_counter()
+    index = KBIndex(kb, default_ids={"s0", "s1"})
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    queries = [f"¿{_words(rng, rng.randint(3, 14))}?" for _ in range(args.queries)]
+    latencies = []
+    for q in queries:
+        t0 = time.perf_counter()
+        index.render(index.select(q, top_k=args.top_k))
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    print(f"[BENCH] Secciones: {len(index)} | compilación: {build_ms:.0f} ms")
+    print(
+        f"[BENCH] Consultas: {len(queries)} | p50={_percentile(latencies, 50):.3f} ms "
+        f"p95={_percentile(latencies, 95):.3f} ms p99={_percentile(latencies, 99):.3f} ms "
+        f"media={statistics.fmean(latencies):.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
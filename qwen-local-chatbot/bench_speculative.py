@@ -0,0 +1,102 @@
+import argparse
+import os
+import statistics
+import time
+
+# =========================================================
+# BENCHMARK DE DECODIFICACIÓN ESPECULATIVA (assistant_model)
+# =========================================================
+# Mismo prompt real que la app (assemble_prompt) para EXAMPLE_QUESTIONS, greedy,
+# sin y con modelo borrador. Reporta tokens/s y tasa de aceptación estimada:
+#   - cada forward del modelo grande verifica candidatos y agrega aceptados + 1,
+#     así que aceptados = tokens nuevos - forwards del grande;
+#   - cada forward del borrador propone un candidato.
+# Uso:
+#   python bench_speculative.py --draft Qwen/Qwen2.5-0.5B-Instruct --max-new-tokens 128
+
+
+def _count_calls(module):
+    counter = {"n": 0}
+
+    def hook(_module, _inputs, _output):
+        counter["n"] += 1
+
+    return counter, module.register_forward_hook(hook)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Decodificación especulativa del asistente SIPH")
+    ap.add_argument("--draft", default=os.getenv("DRAFT_MODEL_NAME", "Qwen/Qwen2.5-0.5B-Instruct"))
+    ap.add_argument("--draft-tokens", type=int, default=int(os.getenv("DRAFT_NUM_TOKENS", "5")))
+    ap.add_argument("--max-new-tokens", type=int, default=128)
+    args = ap.parse_args()
+
+    # antes de importar app: la app lee su config al importarse
+    os.environ["DRAFT_MODEL_NAME"] = args.draft
+    os.environ["DRAFT_NUM_TOKENS"] = str(args.draft_tokens)
+    os.environ["TEMPERATURE"] = "0"  # greedy: salida comparable entre modos
+    os.environ.setdefault("KB_WATCH", "0")
+    os.environ.setdefault("RESPONSE_CACHE_SIZE", "0")
+
+    import torch
+
+    import app
+
+    if not app.wait_until_ready():
+        print(f"[BENCH] El modelo no cargó: {app.LOAD_STATE['error']}")
+        return
+    if app.DRAFT_MODEL is None:
+        print(f"[BENCH] No se pudo cargar el borrador {args.draft}")
+        return
+
+    prompts = [app.assemble_prompt([], q)[0] for q in app.EXAMPLE_QUESTIONS]
+
+    @torch.inference_mode()
+    def run(prompt: str, assistant):
+        inputs, _ = app.prepare_inputs(prompt, use_prefix=False)
+        n_prompt = inputs["input_ids"].shape[-1]
+        t0 = time.perf_counter()
+        out = app.model.generate(
+            **app.generation_kwargs(inputs, None, args.max_new_tokens, assistant_model=assistant)
+        )
+        elapsed = time.perf_counter() - t0
+        new = out[0][n_prompt:]
+        return app.tokenizer.decode(new, skip_special_tokens=True), int(new.shape[-1]), elapsed
+
+    run(prompts[0], None)  # warmup de ambos caminos
+    run(prompts[0], app.DRAFT_MODEL)
+
+    base_tps, spec_tps, same = [], [], 0
+    accepted_total, drafted_total = 0, 0
+    for q, prompt in zip(app.EXAMPLE_QUESTIONS, prompts):
+        base_text, base_n, base_s = run(prompt, None)
+
+        main_calls, h1 = _count_calls(app.model)
+        draft_calls, h2 = _count_calls(app.DRAFT_MODEL)
+        try:
+            spec_text, spec_n, spec_s = run(prompt, app.DRAFT_MODEL)
+        finally:
+            h1.remove()
+            h2.remove()
+
+        accepted = max(0, spec_n - main_calls["n"])
+        accepted_total += accepted
+        drafted_total += draft_calls["n"]
+        base_tps.append(base_n / base_s)
+        spec_tps.append(spec_n / spec_s)
+        same += base_text == spec_text
+        print(
+            f"[BENCH] {q[:48]:<48} base={base_n / base_s:6.2f} tok/s "
+            f"borrador={spec_n / spec_s:6.2f} tok/s aceptados={accepted}/{draft_calls['n']}"
+        )
+
+    base = statistics.fmean(base_tps)
+    spec = statistics.fmean(spec_tps)
+    print(f"\n[BENCH] Modelo: {app.MODEL_NAME} ({app.INFERENCE_BACKEND}) | borrador: {args.draft}")
+    print(f"[BENCH] tok/s medio: base={base:.2f} borrador={spec:.2f} (x{spec / base:.2f})")
+    print(f"[BENCH] Tasa de aceptación estimada: {accepted_total / max(drafted_total, 1):.0%}")
+    print(f"[BENCH] Respuestas idénticas a greedy base: {same}/{len(prompts)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+# =========================================================
+# SUITE DE BENCHMARK / REGRESIÓN DEL ASISTENTE
+# =========================================================
+# Reproduce bench_questions.json (EXAMPLE_QUESTIONS + algunas más, cada una con
+# las secciones KB que deberían recuperarse) y escribe un reporte JSON:
+#   - recuperación: secciones elegidas, acierto/recall, tiempo (ms) y si la
+#     pregunta se responde directo desde el KB (fast_path.py, sin modelo)
+#   - modelo: tokens del prompt, TTFT, tokens nuevos, tokens/s (por el mismo
+#     camino que la UI: stream_reply -> scheduler), presupuesto de tokens y
+#     motivo de fin (eos / budget / stop_sequence / structure)
+#   - proceso: RSS pico, configuración y commit
+# Los reportes se comparan con --compare (sale con 1 si hay regresión).
+# Uso:
+#   python bench_suite.py --retrieval-only --out reports/keywords.json
+#   python bench_suite.py --label int8 --out reports/int8.json        (CPU_BACKEND=int8)
+#   python bench_suite.py --compare reports/base.json reports/int8.json
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_QUESTIONS = os.path.join(HERE, "bench_questions.json")
+
+# variables de entorno que definen una "configuración" del asistente
+CONFIG_ENV = (
+    "MODEL_NAME", "CPU_BACKEND", "DRAFT_MODEL_NAME", "DRAFT_NUM_TOKENS", "MAX_NEW_TOKENS",
+    "TEMPERATURE", "PROMPT_TOKEN_BUDGET", "CONTEXT_TOKEN_SHARE", "RETRIEVAL_TOP_K",
+    "HYBRID_ALPHA", "PREFIX_CACHE", "BATCH_MAX_SIZE", "BATCH_WINDOW_MS",
+    "TORCH_NUM_THREADS", "TORCH_INTEROP_THREADS", "CPU_AFFINITY", "THREADS_AUTOTUNE",
+    "ADAPTIVE_MAX_TOKENS", "STOP_SEQUENCES", "FAST_PATH", "FAST_PATH_MIN_SCORE",
+)
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(pct / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def _peak_rss_mb() -> float:
+    import resource
+
+    # Linux: KB (pico del proceso)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True
+        )
+        return out.stdout.strip()
+    except OSError:
+        return ""
+
+
+# =========================================================
+# EJECUCIÓN
+# =========================================================
+def time_retrieval(select, question: str, rounds: int) -> Tuple[List[int], float]:
+    ranked, times = [], []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        ranked = select(question)
+        times.append((time.perf_counter() - t0) * 1000)
+    return ranked, statistics.median(times)
+
+
+def run_suite(questions: List[Dict], retrieval_only: bool, rounds: int) -> Tuple[Dict, List[Dict]]:
+    if retrieval_only:
+        # sin modelo ni UI: solo el índice de keywords
+        from fast_path import FastPathIndex
+        from kb_index import KBIndex
+        from project_kb import DEFAULT_CONTEXT_IDS, PROJECT_KB
+
+        top_k = int(os.getenv("RETRIEVAL_TOP_K", "4"))
+        index = KBIndex(PROJECT_KB, DEFAULT_CONTEXT_IDS)
+        select = lambda q: index.select(q, top_k=top_k)  # noqa: E731
+        sections = index.sections
+        fast_path = (
+            FastPathIndex(PROJECT_KB, min_score=float(os.getenv("FAST_PATH_MIN_SCORE", "0.5")))
+            if os.getenv("FAST_PATH", "1") == "1"
+            else None
+        )
+        app = None
+        mode = "keywords"
+    else:
+        os.environ.setdefault("RESPONSE_CACHE_SIZE", "0")  # medir el modelo, no la caché
+        os.environ.setdefault("KB_WATCH", "0")
+        import app
+
+        if not app.wait_until_ready():
+            raise SystemExit(f"[BENCH] El modelo no cargó: {app.LOAD_STATE['error']}")
+        app.LOADER.join()  # el índice vectorial se carga después de READY
+        retriever = app.RETRIEVER
+        select = lambda q: retriever.select(q, top_k=app.RETRIEVAL_TOP_K)  # noqa: E731
+        sections = retriever.kb_index.sections
+        fast_path = app.FAST_PATH_INDEX
+        mode = "hybrid" if retriever.vector_index is not None else "keywords"
+        # warmup fuera de la medición
+        for _ in app.stream_reply([], questions[0]["question"]):
+            pass
+
+    rows = []
+    for q in questions:
+        ranked, retrieval_ms = time_retrieval(select, q["question"], rounds)
+        retrieved = [sections[i]["id"] for i in ranked]
+        expected = q.get("expected", [])
+        found = [sid for sid in expected if sid in retrieved]
+        row = {
+            "id": q["id"],
+            "question": q["question"],
+            "expected": expected,
+            "retrieved": retrieved,
+            "hit": bool(found) if expected else None,
+            "recall": len(found) / len(expected) if expected else None,
+            "retrieval_ms": round(retrieval_ms, 3),
+            "fast_path": None,
+        }
+        hit = fast_path.match(q["question"], ranked) if fast_path is not None else None
+        if hit is not None:
+            row["fast_path"] = hit[0][0].section["id"]
+        if app is not None:
+            row.update(run_generation(app, q["question"], ranked))
+        rows.append(row)
+        if app is None:
+            detail = ""
+        elif row["outcome"] == "fast_path":
+            detail = f" ttft={row['ttft_ms']:.1f} ms (directa)"
+        else:
+            detail = f" ttft={row['ttft_ms']:.0f} ms {row['tokens_per_s']:.2f} tok/s"
+        print(
+            f"[BENCH] {q['id']:<20} {'OK ' if row['hit'] else 'MAL'} {retrieved} "
+            f"{row['retrieval_ms']:.2f} ms" + (f" directa={row['fast_path']}" if row["fast_path"] else "")
+            + detail
+        )
+
+    meta = {"mode": mode}
+    if app is not None:
+        meta["backend"] = app.INFERENCE_BACKEND
+        meta["boot_timings"] = app.LOAD_STATE["timings"]
+        meta["threads"] = app.THREAD_CONFIG
+    return meta, rows
+
+
+def run_generation(app, question: str, ranked: List[int]) -> Dict:
+    prompt, _ = app.assemble_prompt([], question, ranked=ranked)
+    t0 = time.perf_counter()
+    ttft = None
+    text = ""
+    turn: Dict = {}
+    # stream_reply recupera de nuevo (mismo resultado) y pasa por el scheduler como la UI
+    for text in app.stream_reply([], question, turn=turn):
+        if ttft is None:
+            ttft = time.perf_counter() - t0
+    total = time.perf_counter() - t0
+    if turn.get("outcome") == "fast_path":
+        # sin modelo: cuenta en la latencia, no en las métricas de generación
+        return {
+            "outcome": "fast_path",
+            "ttft_ms": round((ttft or total) * 1000, 1),
+            "total_ms": round(total * 1000, 1),
+            "answer": text,
+        }
+    new_tokens = app.count_tokens(text)
+    decode_s = max(total - (ttft or 0.0), 1e-9)
+    return {
+        "outcome": turn.get("outcome"),
+        "prompt_tokens": app.count_tokens(prompt),
+        "ttft_ms": round((ttft or total) * 1000, 1),
+        "total_ms": round(total * 1000, 1),
+        "new_tokens": new_tokens,
+        "tokens_per_s": round(max(new_tokens - 1, 0) / decode_s, 2),
+        # pasos de decode reales (incluye lo recortado después de un corte)
+        "decode_steps": turn.get("new_tokens"),
+        "question_kind": turn.get("question_kind"),
+        "token_budget": turn.get("token_budget"),
+        "stop_reason": turn.get("stop_reason"),
+        "answer": app.clean_output(text),
+    }
+
+
+def summarize(rows: List[Dict]) -> Dict:
+    def values(key):
+        return [r[key] for r in rows if r.get(key) is not None]
+
+    scored = [r for r in rows if r["hit"] is not None]
+    summary = {
+        "questions": len(rows),
+        "hit_rate": round(sum(r["hit"] for r in scored) / max(len(scored), 1), 4),
+        "recall_mean": round(statistics.fmean(values("recall")), 4) if values("recall") else None,
+        "retrieval_ms_p50": _percentile(values("retrieval_ms"), 50),
+        "retrieval_ms_p95": _percentile(values("retrieval_ms"), 95),
+        "fast_path_rate": round(sum(bool(r["fast_path"]) for r in rows) / max(len(rows), 1), 4),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+    if values("ttft_ms"):
+        summary.update(
+            {
+                "prompt_tokens_mean": round(statistics.fmean(values("prompt_tokens")), 1),
+                "ttft_ms_p50": _percentile(values("ttft_ms"), 50),
+                "ttft_ms_p95": _percentile(values("ttft_ms"), 95),
+                "new_tokens_mean": round(statistics.fmean(values("new_tokens")), 1),
+                "decode_steps_mean": (
+                    round(statistics.fmean(values("decode_steps")), 1) if values("decode_steps") else None
+                ),
+                "stop_reasons": {
+                    reason: sum(r.get("stop_reason") == reason for r in rows)
+                    for reason in sorted({r["stop_reason"] for r in rows if r.get("stop_reason")})
+                },
+                "tokens_per_s_mean": round(statistics.fmean(values("tokens_per_s")), 2),
+            }
+        )
+    return summary
+
+
+# =========================================================
+# COMPARACIÓN ENTRE REPORTES
+# =========================================================
+# (métrica, mayor es mejor)
+COMPARED = (
+    ("hit_rate", True),
+    ("recall_mean", True),
+    ("retrieval_ms_p50", False),
+    ("prompt_tokens_mean", False),
+    ("ttft_ms_p50", False),
+    ("ttft_ms_p95", False),
+    ("new_tokens_mean", False),
+    ("decode_steps_mean", False),
+    ("tokens_per_s_mean", True),
+    ("peak_rss_mb", False),
+)
+# las métricas de calidad no toleran caídas; las de rendimiento, hasta `tolerance`
+QUALITY = {"hit_rate", "recall_mean"}
+
+
+def compare(base: Dict, new: Dict, tolerance: float) -> List[str]:
+    """Imprime la comparación y devuelve las regresiones encontradas."""
+    regressions = []
+    print(f"[BENCH] {base['meta'].get('label')} -> {new['meta'].get('label')}")
+    for key, higher_is_better in COMPARED:
+        a, b = base["summary"].get(key), new["summary"].get(key)
+        if a is None or b is None:
+            continue
+        change = (b - a) / a if a else 0.0
+        worse = change < 0 if higher_is_better else change > 0
+        limit = 0.0 if key in QUALITY else tolerance
+        flag = ""
+        if worse and abs(change) > limit:
+            flag = "  <-- regresión"
+            regressions.append(key)
+        print(f"  {key:<20} {a:>10} -> {b:>10} ({change:+.1%}){flag}")
+
+    before = {r["id"]: r for r in base["questions"]}
+    for r in new["questions"]:
+        old = before.get(r["id"])
+        if old and old["hit"] and not r["hit"]:
+            print(f"  pregunta {r['id']}: antes {old['retrieved']} ahora {r['retrieved']}")
+    return regressions
+
+
+# =========================================================
+# CLI
+# =========================================================
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark / regresión del asistente SIPH")
+    ap.add_argument("--questions", default=DEFAULT_QUESTIONS)
+    ap.add_argument("--out", default="", help="ruta del reporte JSON")
+    ap.add_argument("--label", default="")
+    ap.add_argument("--retrieval-only", action="store_true", help="sin cargar el modelo")
+    ap.add_argument("--rounds", type=int, default=20, help="repeticiones para medir la recuperación")
+    ap.add_argument("--compare", nargs=2, metavar=("BASE", "NUEVO"))
+    ap.add_argument("--tolerance", type=float, default=0.15, help="empeoramiento aceptado en rendimiento")
+    args = ap.parse_args()
+
+    if args.compare:
+        with open(args.compare[0], "r", encoding="utf-8") as f:
+            base = json.load(f)
+        with open(args.compare[1], "r", encoding="utf-8") as f:
+            new = json.load(f)
+        regressions = compare(base, new, args.tolerance)
+        if regressions:
+            print(f"[BENCH] Regresiones: {', '.join(regressions)}")
+            sys.exit(1)
+        print("[BENCH] Sin regresiones")
+        return
+
+    with open(args.questions, "r", encoding="utf-8") as f:
+        questions = json.load(f)
+
+    meta, rows = run_suite(questions, args.retrieval_only, args.rounds)
+    report = {
+        "meta": dict(
+            meta,
+            label=args.label or meta["mode"],
+            created_at=time.strftime("%Y-%m-%dT%H:%M:%S"),
+            git_commit=_git_commit(),
+            python=platform.python_version(),
+            machine=platform.machine(),
+            cpus=os.cpu_count(),
+            config={k: os.environ[k] for k in CONFIG_ENV if k in os.environ},
+        ),
+        "summary": summarize(rows),
+        "questions": rows,
+    }
+    print(f"[BENCH] Resumen: {json.dumps(report['summary'], ensure_ascii=False)}")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            # claves ordenadas + indentado: los reportes se pueden comparar con diff
+            json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"[BENCH] Reporte: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import statistics
+import time
+
+import torch
+
+import app
+
+# =========================================================
+# BENCHMARK TTFT: con y sin KV-cache del prefijo estático
+# =========================================================
+# TTFT = prefill + primer token (generate con max_new_tokens=1).
+# Uso:
+#   python bench_ttft.py --rounds 5
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(pct / 100 * (len(values) - 1))))
+    return values[k]
+
+
+@torch.inference_mode()
+def ttft_ms(prompt: str, use_prefix: bool) -> float:
+    t0 = time.perf_counter()
+    inputs, past_key_values = app.prepare_inputs(prompt, use_prefix=use_prefix)
+    app.model.generate(**app.generation_kwargs(inputs, past_key_values, max_new_tokens=1))
+    return (time.perf_counter() - t0) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser(description="TTFT del asistente SIPH con/sin prefijo en caché")
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args()
+
+    if not app.wait_until_ready():
+        print(f"[BENCH] El modelo no cargó: {app.LOAD_STATE['error']}")
+        return
+    if app.PREFIX is None:
+        print("[BENCH] El KV-cache de prefijo no está activo (PREFIX_CACHE=0 o no soportado).")
+        return
+
+    prompts = [app.assemble_prompt([], q)[0] for q in app.EXAMPLE_QUESTIONS]
+    ttft_ms(prompts[0], use_prefix=False)  # warmup
+
+    results = {}
+    for label, use_prefix in (("sin cache", False), ("con cache", True)):
+        values = [ttft_ms(p, use_prefix) for _ in range(args.rounds) for p in prompts]
+        results[label] = values
+
+    print(f"[BENCH] Modelo: {app.MODEL_NAME} | CUDA: {app.USE_CUDA}")
+    print(f"[BENCH] Prefijo en caché: {app.PREFIX['ids'].shape[-1]} tokens")
+    for label, values in results.items():
+        print(
+            f"[BENCH] TTFT {label}: p50={_percentile(values, 50):.0f} ms "
+            f"p95={_percentile(values, 95):.0f} ms media={statistics.fmean(values):.0f} ms"
+        )
+    base = statistics.fmean(results["sin cache"])
+    cached = statistics.fmean(results["con cache"])
+    print(f"[BENCH] Mejora media: {base - cached:.0f} ms ({(1 - cached / base):.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import argparse
+import os
+import time
+
+from kb_vectors import DEFAULT_EMBED_MODEL, build_vector_index
+from project_kb import PROJECT_KB
+
+# =========================================================
+# CONSTRUCCIÓN OFFLINE DEL ÍNDICE VECTORIAL
+# =========================================================
+# Correr cada vez que cambie el contenido de kb/ (app.py avisa si quedó desactualizado).
+# Solo se embeben los chunks nuevos o modificados; el resto se reutiliza.
+#   python build_kb_vectors.py
+#   python build_kb_vectors.py --model intfloat/multilingual-e5-small --out kb_vectors
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Construye el índice vectorial de la KB SIPH")
+    ap.add_argument("--model", default=os.getenv("EMBED_MODEL_NAME", DEFAULT_EMBED_MODEL))
+    ap.add_argument(
+        "--out",
+        default=os.getenv("KB_VECTORS_DIR", os.path.join(os.path.dirname(__file__), "kb_vectors")),
+    )
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    n_chunks, dim, n_embedded = build_vector_index(PROJECT_KB, args.out, model_name=args.model)
+    print(
+        f"[BUILD] {len(PROJECT_KB)} secciones -> {n_chunks} chunks (dim {dim}), "
+        f"{n_embedded} embebidos y {n_chunks - n_embedded} reutilizados "
+        f"en {args.out} ({time.perf_counter() - t0:.1f} s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import os
+import statistics
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import torch
+
+# =========================================================
+# HILOS Y AFINIDAD DE CPU PARA LA INFERENCIA
+# =========================================================
+# En los servidores compartidos el modelo compite por núcleos con uvicorn y con
+# otros procesos. Aquí se configura:
+# - afinidad: a qué núcleos se fija el proceso (CPU_AFFINITY="0-7,12");
+# - hilos intra-op (torch.set_num_threads): los que usa cada matmul;
+# - hilos inter-op (torch.set_num_interop_threads): solo se puede fijar una vez
+#   y antes de cualquier trabajo paralelo, por eso va al importar app.py;
+# - autotune: prueba varios valores intra-op con un generate corto y deja el más rápido.
+
+
+def parse_cpu_list(spec: str) -> List[int]:
+    """'0-3,6,8-9' -> [0, 1, 2, 3, 6, 8, 9]."""
+    cpus = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            cpus.update(range(int(start), int(end) + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+def available_cpus() -> int:
+    """Núcleos que el proceso puede usar (respeta la afinidad y los cgroups de taskset)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def apply_affinity(spec: str) -> Optional[List[int]]:
+    """Fija el proceso (y los hilos que cree después) a los núcleos de `spec`."""
+    if not spec:
+        return None
+    cpus = parse_cpu_list(spec)
+    if not hasattr(os, "sched_setaffinity"):
+        print("[BOOT] CPU_AFFINITY no está soportado en esta plataforma: se ignora")
+        return None
+    try:
+        os.sched_setaffinity(0, cpus)
+    except OSError as e:
+        print(f"[BOOT] No se pudo fijar CPU_AFFINITY={spec}: {e}")
+        return None
+    return cpus
+
+
+def configure_threads(num_threads: int, interop_threads: int) -> Dict:
+    """0 = dejar el valor de torch. Devuelve la configuración efectiva."""
+    if num_threads > 0:
+        torch.set_num_threads(num_threads)
+    if interop_threads > 0:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError as e:
+            # torch ya arrancó su pool inter-op: queda el valor anterior
+            print(f"[BOOT] TORCH_INTEROP_THREADS ignorado: {e}")
+    return {
+        "intra_op": torch.get_num_threads(),
+        "inter_op": torch.get_num_interop_threads(),
+    }
+
+
+def autotune_candidates(available: int) -> List[int]:
+    """Todos los núcleos, 3/4, la mitad y un cuarto (sin repetidos, de mayor a menor)."""
+    values = {available, available * 3 // 4, available // 2, available // 4}
+    return sorted((v for v in values if v >= 1), reverse=True)
+
+
+def autotune_threads(
+    run: Callable[[], None], candidates: Sequence[int], rounds: int = 2
+) -> Tuple[int, Dict[int, float]]:
+    """
+    Mide `run` (un generate corto) con cada valor de hilos intra-op y deja
+    configurado el más rápido. Devuelve (elegido, {hilos: mediana en ms}).
+    """
+    results: Dict[int, float] = {}
+    for n in candidates:
+        torch.set_num_threads(n)
+        run()  # la primera pasada con un número nuevo de hilos no cuenta
+        times = []
+        for _ in range(max(1, rounds)):
+            t0 = time.perf_counter()
+            run()
+            times.append((time.perf_counter() - t0) * 1000)
+        results[n] = round(statistics.median(times), 1)
+    # empate: menos hilos (deja núcleos libres para la API)
+    best = min(results, key=lambda n: (results[n], n))
+    torch.set_num_threads(best)
+    return best, results
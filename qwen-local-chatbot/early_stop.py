@@ -0,0 +1,195 @@
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import torch
+from transformers import StoppingCriteria
+
+from kb_index import normalize_text
+
+# =========================================================
+# CORTE TEMPRANO DE LA GENERACIÓN
+# =========================================================
+# Las preguntas cortas ("¿Qué estados existen?") no necesitan MAX_NEW_TOKENS.
+# Tres mecanismos, todos por fila del batch:
+# - presupuesto adaptativo: tokens máximos según el tipo de pregunta y cuánto
+#   domina la mejor sección del KB en el ranking;
+# - secuencias de parada: el modelo empieza a inventar el siguiente turno;
+# - estructura cerrada: en respuestas de consulta/lista, la lista (o el primer
+#   párrafo) ya terminó y lo que sigue es relleno; ese resto se recorta del texto final.
+
+# (tipo, patrón sobre la pregunta normalizada); gana el primero que coincide
+QUESTION_KINDS: Tuple[Tuple[str, "re.Pattern"], ...] = (
+    ("howto", re.compile(r"\b(como|pasos|proceso|flujo|procedimiento)\b")),
+    # "qué estados/roles/campos..." también piden una enumeración
+    (
+        "list",
+        re.compile(
+            r"\b(cuales|lista|listar|enumera|existen|hay|tipos"
+            r"|estados|roles|campos|rutas|documentos)\b"
+        ),
+    ),
+    ("lookup", re.compile(r"^(que|cual|quien|donde|cuando|cuanto|cuantos|significa)\b")),
+)
+# tokens máximos por tipo ("open" = MAX_NEW_TOKENS)
+KIND_BUDGETS = {"lookup": 128, "list": 192, "howto": 288}
+# sin coincidencias en el KB la respuesta correcta es "no lo tengo confirmado"
+NO_MATCH_BUDGET = 96
+# una sola sección domina el ranking: la respuesta sale de ahí, se recorta más
+DOMINANT_SHARE = 0.6
+DOMINANT_FACTOR = 0.75
+# preguntas largas suelen pedir más que un dato
+SHORT_QUESTION_WORDS = 14
+# tipos en los que se corta al cerrar la lista / el primer párrafo
+STRUCTURED_KINDS = ("lookup", "list")
+MIN_STRUCTURED_TOKENS = 24
+# cortes que dejan la respuesta completa; "budget" no, y sin motivo ("") tampoco se sabe
+COMPLETE_STOP_REASONS = ("eos", "stop_sequence", "structure")
+
+_LIST_ITEM = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+\S")
+
+
+def classify_question(question: str) -> str:
+    norm = normalize_text(question)
+    if len(norm.split()) > SHORT_QUESTION_WORDS:
+        return "open"
+    for kind, pattern in QUESTION_KINDS:
+        if pattern.search(norm):
+            return kind
+    return "open"
+
+
+def kb_confidence(scores: Sequence[float]) -> float:
+    """Parte del score total que se lleva la mejor sección (0 = solo secciones por defecto)."""
+    total = sum(s for s in scores if s > 0)
+    if total <= 0:
+        return 0.0
+    return max(scores) / total
+
+
+def token_budget(question: str, scores: Sequence[float], max_new_tokens: int) -> Tuple[str, int]:
+    """(tipo de pregunta, tokens máximos para la respuesta)."""
+    kind = classify_question(question)
+    confidence = kb_confidence(scores)
+    if confidence == 0.0:
+        budget = NO_MATCH_BUDGET
+    else:
+        budget = KIND_BUDGETS.get(kind, max_new_tokens)
+        if kind != "open" and confidence >= DOMINANT_SHARE:
+            budget = int(budget * DOMINANT_FACTOR)
+    return kind, max(MIN_STRUCTURED_TOKENS, min(budget, max_new_tokens))
+
+
+def cut_at_stop(text: str, stop_sequences: Sequence[str]) -> str:
+    """Texto hasta la primera secuencia de parada (el streamer ya la pudo haber enviado)."""
+    cut = len(text)
+    for stop in stop_sequences:
+        pos = text.find(stop)
+        if pos != -1:
+            cut = min(cut, pos)
+    return text[:cut]
+
+
+def _is_list_block(block: str) -> bool:
+    return sum(1 for line in block.splitlines() if _LIST_ITEM.match(line)) >= 2
+
+
+def closed_prefix(text: str, kind: str) -> Optional[int]:
+    """
+    Largo del texto hasta donde la respuesta cerró su estructura, o None:
+    - una lista (2+ ítems) terminó con línea en blanco (tipos lookup y list);
+    - el primer párrafo terminó en punto, sin lista (solo lookup).
+    Se espera a que el bloque siguiente empiece con texto normal: si es otro
+    ítem, un encabezado ("**Técnico:**", "#") o una línea que presenta algo
+    (termina en ":"), la respuesta sigue.
+    """
+    blocks = text.split("\n\n")
+    if len(blocks) < 2:
+        return None
+    current = blocks[-1].lstrip()  # bloque a medio generar
+    first_line = current.split("\n", 1)[0].rstrip()
+    if (
+        len(current.split()) < 3
+        or _LIST_ITEM.match(current)
+        or current.startswith(("#", "**"))
+        or first_line.endswith(":")
+    ):
+        return None
+    closed = [b for b in blocks[:-1] if b.strip()]
+    if not closed:
+        return None
+    end = len(text) - len(blocks[-1])
+    if any(_is_list_block(b) for b in closed):
+        return end
+    if kind == "lookup" and len(closed) == 1 and closed[0].rstrip().endswith((".", "!")):
+        has_item = any(_LIST_ITEM.match(line) for line in closed[0].splitlines())
+        return None if has_item else end
+    return None
+
+
+class EarlyStop(StoppingCriteria):
+    """
+    Criterio por fila: presupuesto propio, secuencias de parada y estructura cerrada.
+    `reasons[row]` queda con el motivo del corte ("eos" = terminó sola). Una fila
+    que ya emitió EOS no se vuelve a revisar: generate le sigue agregando padding
+    y eso no debe convertirse en un corte tardío por presupuesto o estructura.
+    """
+
+    def __init__(
+        self,
+        tokenizer,
+        prompt_len: int,
+        budgets: List[int],
+        kinds: List[str],
+        stop_sequences: Sequence[str] = (),
+        on_stop: Optional[Callable[[int, str], None]] = None,
+        eos_token_ids: Sequence[Optional[int]] = (),
+    ):
+        self.tokenizer = tokenizer
+        self.eos = {t for t in eos_token_ids if t is not None}
+        self.prompt_len = prompt_len
+        self.budgets = budgets
+        self.kinds = kinds
+        self.stop_sequences = [s for s in stop_sequences if s]
+        self.on_stop = on_stop
+        self.reasons: List[str] = [""] * len(budgets)
+
+    def _check(self, row: int, ids) -> Optional[str]:
+        n = len(ids)
+        if n >= self.budgets[row]:
+            return "budget"
+        structured = self.kinds[row] in STRUCTURED_KINDS and n >= MIN_STRUCTURED_TOKENS
+        if not self.stop_sequences and not structured:
+            return None
+        text = self.tokenizer.decode(ids, skip_special_tokens=True)
+        if self.stop_sequences and cut_at_stop(text, self.stop_sequences) != text:
+            return "stop_sequence"
+        if structured and closed_prefix(text, self.kinds[row]) is not None:
+            return "structure"
+        return None
+
+    def __call__(self, input_ids, scores, **kwargs):
+        done = []
+        for row in range(input_ids.shape[0]):
+            if self.reasons[row]:
+                done.append(True)
+                continue
+            ids = input_ids[row, self.prompt_len :].tolist()
+            if ids and ids[-1] in self.eos:
+                # sin on_stop: BatchStreamer ya anotó "eos" en la petición al cerrar la fila
+                self.reasons[row] = "eos"
+                done.append(True)
+                continue
+            reason = self._check(row, ids)
+            if reason:
+                self.reasons[row] = reason
+                if self.on_stop is not None:
+                    self.on_stop(row, reason)
+            done.append(reason is not None)
+        return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+
+    def summary(self) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        for reason in self.reasons:
+            reason = reason or "sin_motivo"  # no se marcó "eos" ni un corte
+            out[reason] = out.get(reason, 0) + 1
+        return out
@@ -0,0 +1,151 @@
+import re
+from typing import FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from kb_index import Section, normalize_text
+
+# =========================================================
+# RESPUESTAS DIRECTAS DESDE EL KB (sin pasar por el modelo)
+# =========================================================
+# Preguntas de consulta como "¿Qué roles existen?" o "¿Cuáles son las rutas del
+# frontend?" se responden con una sola lista del KB. Al compilar la KB se
+# extraen los bloques "Encabezado:" + ítems "- ..." de cada sección; una
+# pregunta entra por aquí solo si:
+#   - todas sus palabras de contenido están en el vocabulario del bloque
+#     (encabezado + título + keywords de la sección): "cómo", "significa",
+#     "pasos"... no lo están, así que esas preguntas siguen yendo al modelo;
+#   - al menos una coincide con el encabezado, y el mejor bloque supera al
+#     resto (empates dentro de la misma sección se responden juntos; entre
+#     secciones distintas la pregunta es ambigua y va al modelo).
+# La respuesta es el bloque tal cual, con la sección citada: no se inventa nada.
+
+# palabras de la pregunta que no aportan contenido
+STOPWORDS = frozenset(
+    """
+    que cual cuales cuantos cuantas quien quienes son es hay existen existe tiene tienen
+    tengo pide piden usa usan se incluye incluyen lista listar enumera enumerame dime
+    muestrame mostrar puedes podrias por favor me mi mis el la los las lo un una unos unas
+    de del al en con para y o a todos todas disponibles posibles actuales siph sistema
+    plataforma proyecto app aplicacion
+    """.split()
+)
+# calificativos de los encabezados del KB ("Roles confirmados") que no cambian el tema
+HEADING_QUALIFIERS = frozenset(
+    "confirmado confirmada observado observada tipico tipica visible mostrado mostrada".split()
+)
+MIN_ITEMS = 2
+
+_LIST_ITEM = re.compile(r"^\s*-\s+\S")
+
+
+def _stem(token: str) -> str:
+    """Plural simple del español: roles -> rol, estados -> estado, solicitudes -> solicitud."""
+    if len(token) > 4 and token.endswith("es") and token[-3] in "lnrdz":
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s"):
+        return token[:-1]
+    return token
+
+
+def terms(text: str) -> Set[str]:
+    out = set()
+    for raw in normalize_text(text).split():
+        token = raw.strip(":/._#-+")
+        if token and token not in STOPWORDS:
+            out.add(_stem(token))
+    return out
+
+
+class Block:
+    __slots__ = ("section", "position", "heading", "lines", "heading_terms", "vocabulary")
+
+    def __init__(
+        self, section: Section, position: int, heading: str, lines: List[str], vocabulary: Set[str]
+    ):
+        self.section = section
+        self.position = position
+        self.heading = heading
+        self.lines = lines
+        self.heading_terms: FrozenSet[str] = frozenset(terms(heading) - HEADING_QUALIFIERS)
+        self.vocabulary: FrozenSet[str] = frozenset(vocabulary | self.heading_terms)
+
+    def render(self) -> str:
+        return f"**{self.heading}**\n" + "\n".join(self.lines)
+
+
+def extract_blocks(section: Section, position: int) -> List[Block]:
+    """Bloques 'Encabezado:' seguidos de 2+ ítems (con sus líneas de continuación)."""
+    vocabulary = terms(str(section["title"]))
+    for kw in section.get("keywords", []) or []:
+        vocabulary |= terms(str(kw))
+
+    blocks: List[Block] = []
+    lines = str(section["content"]).split("\n")
+    i = 0
+    while i < len(lines):
+        line = lines[i].rstrip()
+        opens_list = i + 1 < len(lines) and _LIST_ITEM.match(lines[i + 1])
+        if line.endswith(":") and not _LIST_ITEM.match(line) and opens_list:
+            items: List[str] = []
+            j = i + 1
+            # ítems y sus líneas de continuación indentadas ("- Categoría:\n  GENERAL, ...")
+            while j < len(lines) and (
+                _LIST_ITEM.match(lines[j]) or (items and lines[j].startswith("  "))
+            ):
+                items.append(lines[j].rstrip())
+                j += 1
+            if sum(1 for item in items if _LIST_ITEM.match(item)) >= MIN_ITEMS:
+                blocks.append(Block(section, position, line[:-1].strip(), items, vocabulary))
+            i = j
+            continue
+        i += 1
+    return blocks
+
+
+class FastPathIndex:
+    def __init__(self, sections: Sequence[Section], min_score: float = 0.5):
+        self.min_score = min_score
+        self.blocks: List[Block] = []
+        for position, section in enumerate(sections):
+            self.blocks.extend(extract_blocks(section, position))
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def match(
+        self, question: str, allowed_sections: Optional[Sequence[int]] = None
+    ) -> Optional[Tuple[List[Block], float]]:
+        """
+        (bloques, score) si la pregunta es una consulta que un bloque responde entero.
+        `allowed_sections`: posiciones que el retriever también eligió (si se pasa,
+        el bloque tiene que salir de una de ellas).
+        """
+        wanted = terms(question)
+        if not wanted:
+            return None
+        scored: List[Tuple[float, Block]] = []
+        for block in self.blocks:
+            if allowed_sections is not None and block.position not in allowed_sections:
+                continue
+            if not wanted <= block.vocabulary:
+                continue
+            hits = len(wanted & block.heading_terms)
+            if hits == 0:
+                continue
+            # parte del encabezado cubierta: "Roles confirmados" gana a "Roles de usuario (Role)"
+            scored.append((hits / len(block.heading_terms), block))
+        if not scored:
+            return None
+
+        best = max(score for score, _ in scored)
+        if best < self.min_score:
+            return None
+        top = [block for score, block in scored if score == best]
+        if len({block.position for block in top}) > 1:
+            return None  # ambigua entre secciones
+        return top, round(best, 3)
+
+    @staticmethod
+    def render(blocks: List[Block]) -> str:
+        title = blocks[0].section["title"]
+        body = "\n\n".join(block.render() for block in blocks)
+        return f"Según la base de conocimiento de SIPH (sección «{title}»):\n\n{body}"
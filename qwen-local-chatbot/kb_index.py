@@ -0,0 +1,206 @@
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+# =========================================================
+# ÍNDICE DE LA BASE DE CONOCIMIENTO (compilado una vez)
+# =========================================================
+# Todo lo que antes se recalculaba por mensaje (normalizar títulos, contenido y
+# keywords de cada sección) se hace aquí al arrancar. Por consulta solo se
+# recorre el mensaje: Aho-Corasick para frases clave + índice invertido por token.
+#
+# Pesos (compatibles con el ranking anterior):
+# - keyword compuesta (espacio, "/" o "_") presente en el mensaje: +16
+# - keyword simple presente en el mensaje: +8
+# - token del mensaje en el título: +6
+# - token del mensaje en las keywords: +4
+# - token del mensaje en el contenido: BM25 (reemplaza el conteo plano con tope 12)
+# - sección por defecto: +1
+
+PHRASE_WEIGHT = 16.0
+KEYWORD_WEIGHT = 8.0
+TITLE_TOKEN_WEIGHT = 6.0
+KEYWORD_TOKEN_WEIGHT = 4.0
+BODY_WEIGHT = 1.0
+DEFAULT_BONUS = 1.0
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# postings por token ordenados por impacto y recortados: un token muy común
+# ("de", "que") no obliga a recorrer toda la KB
+MAX_POSTINGS = 32
+
+Section = Dict[str, object]
+
+
+# =========================================================
+# NORMALIZACIÓN
+# =========================================================
+def normalize_text(text: str) -> str:
+    text = text or ""
+    text = unicodedata.normalize("NFKD", text)
+    text = text.encode("ascii", "ignore").decode("utf-8")
+    text = text.lower().strip()
+    text = re.sub(r"[^a-z0-9:/._#\-\+\s]", " ", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+def tokenize(text: str) -> Set[str]:
+    return set(normalize_text(text).split())
+
+
+def is_phrase(kw_norm: str) -> bool:
+    return " " in kw_norm or "/" in kw_norm or "_" in kw_norm
+
+
+# =========================================================
+# AHO-CORASICK (frases clave como subcadenas del mensaje)
+# =========================================================
+class PhraseMatcher:
+    """Trie de caracteres con enlaces de fallo: O(len(mensaje) + coincidencias)."""
+
+    def __init__(self, phrases: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self.phrases: List[str] = []
+
+        for phrase in phrases:
+            if not phrase:
+                continue
+            node = 0
+            for ch in phrase:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = nxt
+            self._out[node] = self._out[node] + (len(self.phrases),)
+            self.phrases.append(phrase)
+
+        # BFS: enlaces de fallo y salidas heredadas
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Set[int]:
+        found: Set[int] = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+# =========================================================
+# ÍNDICE
+# =========================================================
+class KBIndex:
+    def __init__(self, sections: Sequence[Section], default_ids: Iterable[str] = ()):
+        self.sections: List[Section] = list(sections)
+        self.default_ids = set(default_ids)
+        self.blocks: List[str] = [
+            f"## {s['title']}\n{str(s['content']).strip()}" for s in self.sections
+        ]
+        self._defaults = [i for i, s in enumerate(self.sections) if s["id"] in self.default_ids]
+
+        # --- frases clave: kw normalizada -> [(sección, peso)] ---
+        phrase_postings: Dict[str, Dict[int, float]] = defaultdict(lambda: defaultdict(float))
+        # --- tokens: token -> {sección: peso} ---
+        postings: Dict[str, Dict[int, float]] = defaultdict(lambda: defaultdict(float))
+
+        body_tf: List[Counter] = []
+        for i, s in enumerate(self.sections):
+            keyword_tokens: Set[str] = set()
+            for kw in s.get("keywords", []) or []:
+                kw_norm = normalize_text(str(kw))
+                if not kw_norm:
+                    continue
+                # cada keyword de la lista suma (aunque dos normalicen igual)
+                phrase_postings[kw_norm][i] += PHRASE_WEIGHT if is_phrase(kw_norm) else KEYWORD_WEIGHT
+                keyword_tokens |= set(kw_norm.split())
+
+            for t in tokenize(str(s["title"])):
+                postings[t][i] += TITLE_TOKEN_WEIGHT
+            for t in keyword_tokens:
+                postings[t][i] += KEYWORD_TOKEN_WEIGHT
+
+            body_tf.append(Counter(normalize_text(str(s["content"])).split()))
+
+        # BM25 del contenido (el mensaje se trata como conjunto de términos)
+        n_docs = len(self.sections)
+        avg_len = (sum(sum(tf.values()) for tf in body_tf) / n_docs) if n_docs else 0.0
+        df: Counter = Counter()
+        for tf in body_tf:
+            df.update(tf.keys())
+        for i, tf in enumerate(body_tf):
+            doc_len = sum(tf.values())
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len / avg_len) if avg_len else BM25_K1
+            for term, f in tf.items():
+                idf = math.log(1 + (n_docs - df[term] + 0.5) / (df[term] + 0.5))
+                postings[term][i] += BODY_WEIGHT * idf * f * (BM25_K1 + 1) / (f + norm)
+
+        self._phrases = PhraseMatcher(phrase_postings.keys())
+        self._phrase_postings: List[Tuple[Tuple[int, float], ...]] = [
+            tuple(heapq.nlargest(MAX_POSTINGS, phrase_postings[p].items(), key=lambda kv: kv[1]))
+            for p in self._phrases.phrases
+        ]
+        self._postings: Dict[str, Tuple[Tuple[int, float], ...]] = {
+            t: tuple(heapq.nlargest(MAX_POSTINGS, docs.items(), key=lambda kv: kv[1]))
+            for t, docs in postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    def scores(self, query: str) -> Dict[int, float]:
+        q_norm = normalize_text(query)
+        acc: Dict[int, float] = defaultdict(float)
+
+        for pid in self._phrases.find(q_norm):
+            for i, w in self._phrase_postings[pid]:
+                acc[i] += w
+
+        for t in set(q_norm.split()):
+            for i, w in self._postings.get(t, ()):
+                acc[i] += w
+
+        for i in self._defaults:
+            acc[i] += DEFAULT_BONUS
+        return acc
+
+    def search(self, query: str, top_k: int = 6) -> List[Tuple[float, int]]:
+        """(score, índice de sección) de mayor a menor; empates en orden del KB."""
+        acc = self.scores(query)
+        best = heapq.nlargest(top_k, acc.items(), key=lambda kv: (kv[1], -kv[0]))
+        return [(score, i) for i, score in best if score > 0]
+
+    def select(self, query: str, top_k: int = 6) -> List[int]:
+        chosen = [i for _, i in self.search(query, top_k)]
+        return chosen or list(self._defaults)
+
+    def render(self, indices: Sequence[int]) -> str:
+        return "\n\n".join(self.blocks[i] for i in indices)
+
@@ -0,0 +1,322 @@
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+from transformers import AutoModel, AutoTokenizer
+
+from kb_index import KBIndex
+
+# =========================================================
+# ÍNDICE VECTORIAL DE LA KB (construido offline)
+# =========================================================
+# build_kb_vectors.py parte cada sección en chunks, los embebe con un modelo
+# de frases en CPU y guarda:
+#   <dir>/vectors-<hash>.npy -> float32 [n_chunks, dim], normalizados (se abre con mmap)
+#   <dir>/meta.json          -> modelo, huella de la KB, archivo de vectores,
+#                               chunk -> sección y hash de cada chunk
+#
+# Reconstruir es incremental: los chunks cuyo texto no cambió reutilizan su
+# vector del índice anterior (mismo modelo) y solo se embeben los nuevos.
+# Cada build escribe un archivo de vectores con nombre nuevo y después cambia
+# meta.json de forma atómica: nunca se pisa un .npy que otro proceso (o el
+# retriever en uso) tenga abierto por mmap, cosa que en Windows falla. Los
+# .npy viejos se borran después; si siguen abiertos quedan para el próximo build.
+#
+# En runtime solo se embebe la pregunta y se hace un producto punto.
+
+DEFAULT_EMBED_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+# nombre de los índices anteriores a vectors-<hash>.npy (se sigue leyendo)
+VECTORS_FILE = "vectors.npy"
+META_FILE = "meta.json"
+
+CHUNK_MAX_WORDS = 90
+
+
+# =========================================================
+# CHUNKS / HUELLA
+# =========================================================
+def kb_fingerprint(sections: Sequence[Dict]) -> str:
+    raw = json.dumps(
+        [[s["id"], s["title"], s["content"]] for s in sections],
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def chunk_section(section: Dict, max_words: int = CHUNK_MAX_WORDS) -> List[str]:
+    """Agrupa párrafos/listas de la sección en chunks de hasta `max_words` palabras."""
+    title = str(section["title"]).strip()
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", str(section["content"])) if p.strip()]
+
+    chunks: List[str] = []
+    current: List[str] = []
+    words = 0
+    for p in paragraphs:
+        n = len(p.split())
+        if current and words + n > max_words:
+            chunks.append("\n".join(current))
+            current, words = [], 0
+        current.append(p)
+        words += n
+    if current:
+        chunks.append("\n".join(current))
+
+    # el título da contexto a cada chunk
+    return [f"{title}\n{c}" for c in chunks] or [title]
+
+
+# =========================================================
+# EMBEDDINGS (mean pooling, CPU)
+# =========================================================
+class SentenceEmbedder:
+    def __init__(self, model_name: str = DEFAULT_EMBED_MODEL, max_length: int = 256):
+        self.model_name = model_name
+        self.max_length = max_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+        self.model = AutoModel.from_pretrained(model_name)
+        self.model.to("cpu")
+        self.model.eval()
+
+    @torch.inference_mode()
+    def encode(self, texts: Sequence[str], batch_size: int = 32) -> np.ndarray:
+        out: List[np.ndarray] = []
+        for i in range(0, len(texts), batch_size):
+            batch = self.tokenizer(
+                list(texts[i : i + batch_size]),
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="pt",
+            )
+            hidden = self.model(**batch).last_hidden_state
+            mask = batch["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            pooled = torch.nn.functional.normalize(pooled, p=2, dim=1)
+            out.append(pooled.cpu().numpy().astype(np.float32))
+        if not out:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.concatenate(out, axis=0)
+
+
+# =========================================================
+# ÍNDICE EN DISCO
+# =========================================================
+def chunk_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _vectors_path(index_dir: str, meta: Dict) -> str:
+    return os.path.join(index_dir, os.path.basename(meta.get("vectors_file") or VECTORS_FILE))
+
+
+def _remove_stale_vectors(out_dir: str, keep: str) -> None:
+    """Borra los .npy de builds anteriores (en Windows no se puede si siguen mapeados)."""
+    for name in os.listdir(out_dir):
+        if name == keep or not (name.startswith("vectors") and name.endswith((".npy", ".npy.tmp"))):
+            continue
+        try:
+            os.remove(os.path.join(out_dir, name))
+        except OSError:
+            pass  # abierto por mmap en otro proceso: se reintenta en el próximo build
+
+
+def _previous_vectors(out_dir: str, model_name: str) -> Dict[str, np.ndarray]:
+    """hash de chunk -> vector del índice ya construido (si es del mismo modelo)."""
+    meta_path = os.path.join(out_dir, META_FILE)
+    if not os.path.exists(meta_path):
+        return {}
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("model") != model_name or "chunk_hashes" not in meta:
+            return {}
+        vectors = np.load(_vectors_path(out_dir, meta))
+    except (OSError, ValueError):
+        return {}
+    if len(vectors) != len(meta["chunk_hashes"]):
+        return {}
+    return {h: vectors[i] for i, h in enumerate(meta["chunk_hashes"])}
+
+
+def build_vector_index(
+    sections: Sequence[Dict],
+    out_dir: str,
+    model_name: str = DEFAULT_EMBED_MODEL,
+    embedder: Optional[SentenceEmbedder] = None,
+) -> Tuple[int, int, int]:
+    """Escribe el índice de `sections` en `out_dir`. Devuelve (n_chunks, dim, chunks embebidos)."""
+    texts: List[str] = []
+    chunk_sections: List[str] = []
+    for s in sections:
+        for c in chunk_section(s):
+            texts.append(c)
+            chunk_sections.append(s["id"])
+    hashes = [chunk_hash(t) for t in texts]
+
+    previous = _previous_vectors(out_dir, model_name)
+    todo = [i for i, h in enumerate(hashes) if h not in previous]
+    fresh: Dict[str, np.ndarray] = {}
+    if todo:
+        if embedder is None or embedder.model_name != model_name:
+            embedder = SentenceEmbedder(model_name)
+        encoded = embedder.encode([texts[i] for i in todo])
+        fresh = {hashes[i]: encoded[k] for k, i in enumerate(todo)}
+
+    rows = [fresh[h] if h in fresh else previous[h] for h in hashes]
+    vectors = np.stack(rows).astype(np.float32) if rows else np.zeros((0, 0), dtype=np.float32)
+
+    os.makedirs(out_dir, exist_ok=True)
+    # nombre por contenido: mismos vectores -> mismo archivo (no se reescribe)
+    vectors_file = f"vectors-{hashlib.sha1(vectors.tobytes()).hexdigest()[:16]}.npy"
+    meta = {
+        "model": model_name,
+        "dim": int(vectors.shape[1]) if vectors.size else 0,
+        "kb_fingerprint": kb_fingerprint(sections),
+        "vectors_file": vectors_file,
+        "chunk_sections": chunk_sections,
+        "chunk_hashes": hashes,
+    }
+    vectors_path = os.path.join(out_dir, vectors_file)
+    if not os.path.exists(vectors_path):
+        vectors_tmp = vectors_path + ".tmp"
+        with open(vectors_tmp, "wb") as f:
+            np.save(f, vectors)
+        os.replace(vectors_tmp, vectors_path)  # nombre nuevo: nadie lo tiene abierto
+    meta_tmp = os.path.join(out_dir, META_FILE + ".tmp")
+    with open(meta_tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    # primero los vectores: un meta nuevo nunca apunta a vectores que no existen
+    os.replace(meta_tmp, os.path.join(out_dir, META_FILE))
+    _remove_stale_vectors(out_dir, keep=vectors_file)
+    return len(texts), meta["dim"], len(todo)
+
+
+class VectorIndex:
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        meta: Dict,
+        embedder: SentenceEmbedder,
+        n_sections: int,
+        chunk_pos: np.ndarray,
+    ):
+        self.vectors = vectors
+        self.meta = meta
+        self.embedder = embedder
+        self.n_sections = n_sections
+        # chunk -> posición de su sección en la KB
+        self.chunk_pos = chunk_pos
+        # la misma pregunta se embebe una vez (ranking + caché de respuestas)
+        self.embed_query = lru_cache(maxsize=256)(self._embed_query)
+
+    def _embed_query(self, query: str) -> np.ndarray:
+        return self.embedder.encode([query])[0]
+
+    @classmethod
+    def load(
+        cls,
+        index_dir: str,
+        sections: Sequence[Dict],
+        embedder: Optional[SentenceEmbedder] = None,
+    ) -> Optional["VectorIndex"]:
+        """None si no existe o quedó desactualizado respecto a la KB actual.
+
+        `embedder` permite reutilizar uno ya cargado (recarga de la KB) si es del mismo modelo.
+        """
+        meta_path = os.path.join(index_dir, META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        vectors_path = _vectors_path(index_dir, meta)
+        if not os.path.exists(vectors_path):
+            return None
+        if meta.get("kb_fingerprint") != kb_fingerprint(sections):
+            print("[LOAD] Índice vectorial desactualizado (corre build_kb_vectors.py). Solo keywords.")
+            return None
+
+        pos = {s["id"]: i for i, s in enumerate(sections)}
+        chunk_pos = np.array([pos[sid] for sid in meta["chunk_sections"]], dtype=np.int64)
+        vectors = np.load(vectors_path, mmap_mode="r")
+        if embedder is None or embedder.model_name != meta["model"]:
+            embedder = SentenceEmbedder(meta["model"])
+        return cls(vectors, meta, embedder, len(sections), chunk_pos)
+
+    def section_scores(self, query: str) -> np.ndarray:
+        """Similitud coseno por sección (máximo entre sus chunks); -1 si no tiene chunks."""
+        q = self.embed_query(query)
+        sims = np.asarray(self.vectors @ q, dtype=np.float32)
+        best = np.full(self.n_sections, -1.0, dtype=np.float32)
+        np.maximum.at(best, self.chunk_pos, sims)
+        return best
+
+
+# =========================================================
+# RANKING HÍBRIDO
+# =========================================================
+class HybridRetriever:
+    """
+    score = alpha * coseno + (1 - alpha) * keywords/max(keywords).
+    Solo entran secciones cerca de la mejor (>= min_ratio * mejor), así el
+    prompt lleva menos secciones y más precisas.
+    """
+
+    def __init__(
+        self,
+        kb_index: KBIndex,
+        vector_index: Optional[VectorIndex] = None,
+        alpha: float = 0.6,
+        min_ratio: float = 0.75,
+        min_similarity: float = 0.25,
+    ):
+        self.kb_index = kb_index
+        self.vector_index = vector_index
+        self.alpha = alpha
+        self.min_ratio = min_ratio
+        self.min_similarity = min_similarity
+
+    def select(self, query: str, top_k: int = 6) -> List[int]:
+        return [i for i, _ in self.select_scored(query, top_k)]
+
+    def _keyword_scored(self, query: str, top_k: int) -> List[Tuple[int, float]]:
+        hits = self.kb_index.search(query, top_k)
+        if hits:
+            return [(i, round(score, 4)) for score, i in hits]
+        # secciones por defecto: sin score
+        return [(i, 0.0) for i in self.kb_index.select(query, top_k=top_k)]
+
+    def select_scored(self, query: str, top_k: int = 6) -> List[Tuple[int, float]]:
+        """(posición, score) en orden de ranking; score 0 = sección por defecto."""
+        if self.vector_index is None:
+            return self._keyword_scored(query, top_k)
+
+        keyword = self.kb_index.scores(query)
+        kw_max = max(keyword.values(), default=0.0) or 1.0
+        sims = self.vector_index.section_scores(query)
+
+        # candidatas: mejores por vector + las que tocó el índice de keywords
+        n_vec = min(len(sims), top_k * 4)
+        candidates = set(np.argpartition(-sims, n_vec - 1)[:n_vec].tolist()) if n_vec else set()
+        candidates |= keyword.keys()
+
+        combined: List[Tuple[float, int]] = []
+        for i in candidates:
+            sim = float(sims[i])
+            kw = keyword.get(i, 0.0) / kw_max
+            if sim < self.min_similarity and kw == 0.0:
+                continue
+            combined.append((self.alpha * max(sim, 0.0) + (1 - self.alpha) * kw, i))
+
+        ranked = sorted(combined, key=lambda x: (-x[0], x[1]))[:top_k]
+        if not ranked:
+            return self._keyword_scored(query, top_k)
+
+        cutoff = ranked[0][0] * self.min_ratio
+        return [(i, round(score, 4)) for score, i in ranked if score >= cutoff]
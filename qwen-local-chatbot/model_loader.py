@@ -0,0 +1,95 @@
+from typing import Callable, Tuple
+
+import torch
+from transformers import AutoModelForCausalLM, AutoTokenizer
+
+# =========================================================
+# CARGA DEL MODELO (tokenizer + backend de inferencia)
+# =========================================================
+# Backends en CPU (CPU_BACKEND):
+# - fp32: float32, el comportamiento original.
+# - bf16: bfloat16 (mitad de RAM); si la CPU no lo soporta bien, cae a fp32.
+# - int8: cuantización dinámica int8 de las capas Linear (torch.ao), pesos ~4x menores.
+# Con CUDA siempre se usa float16 + device_map="auto".
+#
+# Primero se intenta solo con la caché local (sin red); safetensors se abre por
+# mmap y low_cpu_mem_usage evita una segunda copia de los pesos en RAM.
+
+CPU_BACKENDS = ("fp32", "bf16", "int8")
+
+
+def _local_first(load: Callable, model_name: str, allow_download: bool, **kwargs):
+    try:
+        return load(model_name, local_files_only=True, **kwargs)
+    except OSError:
+        if not allow_download:
+            raise
+        print(f"[LOAD] {model_name} no está en la caché local, descargando...")
+        return load(model_name, **kwargs)
+
+
+def load_tokenizer(model_name: str, allow_download: bool = True):
+    tokenizer = _local_first(
+        AutoTokenizer.from_pretrained, model_name, allow_download, use_fast=True
+    )
+
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    # batches: padding a la izquierda para que todas las filas generen desde el final
+    tokenizer.padding_side = "left"
+    return tokenizer
+
+
+def cpu_supports_bf16() -> bool:
+    try:
+        a = torch.ones((8, 8), dtype=torch.bfloat16)
+        return bool(torch.isfinite((a @ a).float()).all())
+    except Exception:
+        return False
+
+
+def _from_pretrained(model_name: str, dtype, use_cuda: bool, allow_download: bool = True):
+    def load(name, **kwargs):
+        try:
+            return AutoModelForCausalLM.from_pretrained(name, dtype=dtype, **kwargs)
+        except TypeError:
+            return AutoModelForCausalLM.from_pretrained(name, torch_dtype=dtype, **kwargs)
+
+    load_kwargs = {"low_cpu_mem_usage": True}
+    if use_cuda:
+        load_kwargs["device_map"] = "auto"
+    return _local_first(load, model_name, allow_download, **load_kwargs)
+
+
+def load_model(
+    model_name: str,
+    use_cuda: bool,
+    cpu_backend: str = "fp32",
+    allow_download: bool = True,
+) -> Tuple[object, str]:
+    """Devuelve (modelo en eval, backend efectivo)."""
+    if use_cuda:
+        model = _from_pretrained(model_name, torch.float16, True, allow_download)
+        model.eval()
+        return model, "cuda-fp16"
+
+    backend = (cpu_backend or "fp32").lower()
+    if backend not in CPU_BACKENDS:
+        print(f"[LOAD] CPU_BACKEND desconocido '{cpu_backend}', se usa fp32")
+        backend = "fp32"
+    if backend == "bf16" and not cpu_supports_bf16():
+        print("[LOAD] La CPU no soporta bfloat16, se usa fp32")
+        backend = "fp32"
+
+    dtype = torch.bfloat16 if backend == "bf16" else torch.float32
+    model = _from_pretrained(model_name, dtype, False, allow_download)
+    model.to("cpu")
+    model.eval()
+
+    if backend == "int8":
+        model = torch.ao.quantization.quantize_dynamic(
+            model,
+            {torch.nn.Linear},
+            dtype=torch.qint8,
+        )
+    return model, backend
@@ -0,0 +1,214 @@
+import os
+import secrets
+import socket
+import threading
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+# =========================================================
+# SERVIDOR DEL MODELO <-> FRONTENDS (socket local)
+# =========================================================
+# Un solo proceso tiene los pesos (ASSISTANT_MODE=model); los frontends
+# (ASSISTANT_MODE=frontend: UI de Gradio + API HTTP) no cargan el modelo y le
+# reenvían cada turno por un socket local. Así se agregan procesos de frontend
+# sin multiplicar la RAM del modelo, y el scheduler sigue agrupando en batches
+# los turnos de todos los frontends.
+#
+# multiprocessing.connection: Unix socket si la dirección es una ruta,
+# TCP si es "host:puerto" (Windows). Los mensajes son dicts serializados con
+# pickle, así que quien pase el handshake puede ejecutar código en el proceso
+# del modelo: la `authkey` nunca tiene un valor por defecto (ver load_authkey)
+# y el Unix socket queda solo para el usuario dueño (0600).
+#   petición:  {"op": str, "args": tuple}
+#   respuesta: {"result": ...} | {"error": str}
+#   streaming: {"text": str}* y al final {"done": True, "turn": dict}
+
+Address = Union[str, Tuple[str, int]]
+
+
+def parse_address(spec: str) -> Address:
+    """'/tmp/siph-model.sock' -> ruta (Unix socket); '127.0.0.1:7862' -> (host, puerto)."""
+    host, sep, port = spec.rpartition(":")
+    if sep and port.isdigit() and "/" not in spec:
+        return host or "127.0.0.1", int(port)
+    return spec
+
+
+def _check_private(path: str) -> None:
+    """El archivo de la clave tiene que ser del usuario y no legible por otros (POSIX)."""
+    if os.name != "posix":
+        return  # Windows: el perfil del usuario ya restringe el acceso por ACL
+    st = os.stat(path)
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(
+            f"{path} debe pertenecer al usuario actual y tener permisos 0600 "
+            f"(tiene {oct(st.st_mode & 0o777)})"
+        )
+
+
+def load_authkey(secret: str, key_file: str, create: bool) -> bytes:
+    """
+    Clave compartida entre el proceso del modelo y los frontends:
+    - `secret` (MODEL_SOCKET_AUTHKEY) si se definió;
+    - si no, la de `key_file`; con `create=True` (proceso del modelo) se genera
+      una aleatoria la primera vez y se guarda con permisos 0600.
+    """
+    if secret:
+        return secret.encode()
+    if os.path.exists(key_file):
+        _check_private(key_file)
+        with open(key_file, "rb") as f:
+            key = f.read().strip()
+        if key:
+            return key
+        raise RuntimeError(f"{key_file} está vacío: bórralo y reinicia el proceso del modelo")
+    if not create:
+        raise RuntimeError(
+            f"No existe {key_file}: arranca primero el proceso del modelo "
+            "(ASSISTANT_MODE=model) o define MODEL_SOCKET_AUTHKEY"
+        )
+    key = secrets.token_hex(32).encode()
+    # O_EXCL: si otro proceso lo creó entre medio, no se pisa
+    fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    print(f"[BOOT] Clave del socket del modelo generada en {key_file}")
+    return key
+
+
+def _unix_socket_alive(path: str) -> bool:
+    """True si hay un proceso escuchando en el Unix socket (sin hacer el handshake)."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        probe.settimeout(1.0)
+        try:
+            probe.connect(path)
+        except OSError:
+            return False  # nadie acepta: archivo huérfano de una ejecución anterior
+    return True
+
+
+class ModelServer:
+    """
+    `calls`: op -> función que devuelve un valor.
+    `streams`: op -> generador de texto acumulado que acepta `turn=` (telemetría).
+    """
+
+    def __init__(
+        self,
+        address: str,
+        authkey: bytes,
+        calls: Dict[str, Callable[..., Any]],
+        streams: Dict[str, Callable[..., Iterator[str]]],
+    ):
+        self.address = parse_address(address)
+        self.authkey = authkey
+        self.calls = calls
+        self.streams = streams
+        self._listener: Optional[Listener] = None
+        self._closed = False
+
+    def start(self) -> "ModelServer":
+        if not self.authkey:
+            raise ValueError("ModelServer necesita una authkey (ver load_authkey)")
+        unix = isinstance(self.address, str)
+        if unix and os.path.exists(self.address):
+            if _unix_socket_alive(self.address):
+                raise RuntimeError(f"Ya hay un servidor del modelo escuchando en {self.address}")
+            os.unlink(self.address)  # socket de una ejecución anterior que no cerró
+        # con TCP, un puerto ocupado ya hace fallar a Listener
+        self._listener = Listener(self.address, authkey=self.authkey)
+        if unix:
+            os.chmod(self.address, 0o600)
+        threading.Thread(target=self._accept_loop, name="model-server", daemon=True).start()
+        return self
+
+    def _accept_loop(self) -> None:
+        while True:
+            try:
+                conn = self._listener.accept()
+            except Exception as e:
+                if self._closed:
+                    return
+                # authkey incorrecta o handshake cortado: se descarta esa conexión
+                print(f"[RPC] Conexión rechazada: {e}")
+                continue
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: Connection) -> None:
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                op, args = request.get("op"), tuple(request.get("args", ()))
+                if op in self.streams:
+                    if not self._stream(conn, op, args):
+                        return
+                    continue
+                try:
+                    if op not in self.calls:
+                        raise KeyError(f"operación desconocida: {op}")
+                    conn.send({"result": self.calls[op](*args)})
+                except (EOFError, OSError):
+                    return
+                except Exception as e:
+                    conn.send({"error": f"{type(e).__name__}: {e}"})
+
+    def _stream(self, conn: Connection, op: str, args: tuple) -> bool:
+        """False si el frontend se desconectó a mitad de la respuesta."""
+        turn: Dict = {}
+        gen = self.streams[op](*args, turn=turn)
+        try:
+            for text in gen:
+                conn.send({"text": text})
+            conn.send({"done": True, "turn": turn})
+            return True
+        except (EOFError, OSError):
+            return False  # el usuario cerró la pestaña o el cliente HTTP se fue
+        except Exception as e:
+            conn.send({"error": f"{type(e).__name__}: {e}"})
+            return True
+        finally:
+            gen.close()  # cierra stream_reply: registra la telemetría del turno
+
+    def close(self) -> None:
+        self._closed = True
+        if self._listener is not None:
+            self._listener.close()
+
+
+class ModelClient:
+    """Lado del frontend: una conexión por llamada (Unix socket local: conectar es barato)."""
+
+    def __init__(self, address: str, authkey: bytes, timeout: float = 120.0):
+        self.address = parse_address(address)
+        self.authkey = authkey
+        self.timeout = timeout
+
+    def _connect(self) -> Connection:
+        return Client(self.address, authkey=self.authkey)
+
+    def _recv(self, conn: Connection) -> Dict:
+        if not conn.poll(self.timeout):
+            raise TimeoutError(f"el servidor del modelo no respondió en {self.timeout:.0f} s")
+        msg = conn.recv()
+        if "error" in msg:
+            raise RuntimeError(f"servidor del modelo: {msg['error']}")
+        return msg
+
+    def call(self, op: str, *args) -> Any:
+        with self._connect() as conn:
+            conn.send({"op": op, "args": args})
+            return self._recv(conn)["result"]
+
+    def stream(self, op: str, *args, turn: Optional[Dict] = None) -> Iterator[str]:
+        with self._connect() as conn:
+            conn.send({"op": op, "args": args})
+            while True:
+                msg = self._recv(conn)
+                if msg.get("done"):
+                    if turn is not None:
+                        turn.update(msg.get("turn", {}))
+                    return
+                yield msg["text"]
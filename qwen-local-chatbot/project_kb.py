@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+# =========================================================
+# BASE DE CONOCIMIENTO SIPH (archivos en kb/)
+# =========================================================
+# Una sección por archivo Markdown; el orden es el de las rutas (kb/01-*.md, ...).
+# Cabecera entre líneas "---":
+#
+#   ---
+#   id: overview
+#   title: Visión general del proyecto SIPH
+#   default: true          # entra en el contexto cuando nada coincide
+#   keywords:
+#     - siph
+#     - que es siph
+#   ---
+#   Texto de la sección...
+#
+# Editar un archivo no requiere reiniciar: KBWatcher detecta el cambio y app.py
+# recompila el índice sin tocar el modelo.
+
+KB_DIR = os.getenv("KB_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "kb"))
+KB_EXT = ".md"
+_FENCE = "---"
+
+
+class KBFormatError(ValueError):
+    pass
+
+
+# =========================================================
+# PARSEO / ESCRITURA
+# =========================================================
+def parse_section(text: str, source: str = "") -> Tuple[Dict, bool]:
+    """(sección, es_default) a partir del texto de un archivo."""
+    lines = text.replace("\r\n", "\n").split("\n")
+    if not lines or lines[0].strip() != _FENCE:
+        raise KBFormatError(f"{source}: falta la cabecera '---'")
+    try:
+        end = next(i for i in range(1, len(lines)) if lines[i].strip() == _FENCE)
+    except StopIteration:
+        raise KBFormatError(f"{source}: cabecera sin cerrar")
+
+    meta: Dict = {}
+    current_list: Optional[List[str]] = None
+    for raw in lines[1:end]:
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("- "):
+            if current_list is None:
+                raise KBFormatError(f"{source}: elemento de lista fuera de una clave: {line}")
+            current_list.append(line[2:].strip())
+            continue
+        key, sep, value = line.partition(":")
+        if not sep:
+            raise KBFormatError(f"{source}: línea inválida en la cabecera: {line}")
+        key, value = key.strip(), value.strip()
+        if value:
+            meta[key] = value
+            current_list = None
+        else:
+            current_list = meta[key] = []
+
+    for key in ("id", "title"):
+        if not meta.get(key):
+            raise KBFormatError(f"{source}: falta '{key}'")
+
+    section = {
+        "id": meta["id"],
+        "title": meta["title"],
+        "keywords": list(meta.get("keywords") or []),
+        "content": "\n".join(lines[end + 1 :]).strip("\n") + "\n",
+    }
+    return section, str(meta.get("default", "")).lower() == "true"
+
+
+def render_section(section: Dict, default: bool = False) -> str:
+    head = [_FENCE, f"id: {section['id']}", f"title: {section['title']}"]
+    if default:
+        head.append("default: true")
+    head.append("keywords:")
+    head.extend(f"  - {k}" for k in section.get("keywords", []))
+    head.append(_FENCE)
+    return "\n".join(head) + "\n" + str(section["content"]).strip("\n") + "\n"
+
+
+# =========================================================
+# CARGA DEL DIRECTORIO
+# =========================================================
+def kb_files(kb_dir: str = KB_DIR) -> List[str]:
+    paths: List[str] = []
+    for root, _dirs, files in os.walk(kb_dir):
+        paths.extend(os.path.join(root, f) for f in files if f.endswith(KB_EXT))
+    return sorted(paths, key=lambda p: os.path.relpath(p, kb_dir))
+
+
+def kb_signature(kb_dir: str = KB_DIR) -> Tuple:
+    """Cambia si se agrega, borra o modifica algún archivo de la KB."""
+    sig = []
+    for path in kb_files(kb_dir):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        sig.append((path, st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+def load_kb(kb_dir: str = KB_DIR) -> Tuple[List[Dict], Set[str]]:
+    """(secciones en orden, ids por defecto). Lanza KBFormatError si algo está mal."""
+    sections: List[Dict] = []
+    default_ids: Set[str] = set()
+    seen: Dict[str, str] = {}
+    for path in kb_files(kb_dir):
+        with open(path, "r", encoding="utf-8") as f:
+            section, is_default = parse_section(f.read(), source=path)
+        if section["id"] in seen:
+            raise KBFormatError(f"{path}: id '{section['id']}' repetido (ya está en {seen[section['id']]})")
+        seen[section["id"]] = path
+        sections.append(section)
+        if is_default:
+            default_ids.add(section["id"])
+    if not sections:
+        raise KBFormatError(f"{kb_dir}: no hay secciones {KB_EXT}")
+    return sections, default_ids
+
+
+# =========================================================
+# RECARGA EN CALIENTE
+# =========================================================
+class KBWatcher:
+    """
+    Revisa kb_dir cada `interval` segundos (mtime/tamaño, sin dependencias).
+    Espera a que la firma se estabilice un ciclo antes de recargar, así un
+    editor que guarda en varios pasos no dispara recargas a medias. Si la
+    nueva KB no parsea, se registra el error y se sigue con la anterior.
+    """
+
+    def __init__(
+        self,
+        on_change: Callable[[List[Dict], Set[str]], None],
+        kb_dir: str = KB_DIR,
+        interval: float = 1.0,
+    ):
+        self.on_change = on_change
+        self.kb_dir = kb_dir
+        self.interval = max(0.1, interval)
+        self._signature = kb_signature(kb_dir)
+        self._failed = None  # firma cuya carga ya falló (para no repetir el aviso)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="kb-watcher", daemon=True)
+
+    def start(self) -> "KBWatcher":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def check(self) -> bool:
+        """Recarga si la KB cambió y quedó estable. True si se aplicó una nueva KB."""
+        sig = kb_signature(self.kb_dir)
+        if sig == self._signature:
+            return False
+        time.sleep(self.interval)
+        if kb_signature(self.kb_dir) != sig:
+            return False  # todavía la están escribiendo
+        # la firma se guarda solo si la recarga se aplicó: si falla, el
+        # próximo ciclo lo vuelve a intentar aunque nadie toque los archivos
+        try:
+            sections, default_ids = load_kb(self.kb_dir)
+        except (OSError, KBFormatError) as e:
+            if sig != self._failed:
+                print(f"[KB] Cambio ignorado, se mantiene la KB anterior: {e}")
+            self._failed = sig
+            return False
+        self.on_change(sections, default_ids)
+        self._signature = sig
+        self._failed = None
+        return True
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"[KB] Error recargando la KB: {e}")
+
+
+PROJECT_KB, DEFAULT_CONTEXT_IDS = load_kb(KB_DIR)
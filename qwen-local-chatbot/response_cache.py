@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from kb_index import normalize_text
+
+# =========================================================
+# CACHÉ DE RESPUESTAS
+# =========================================================
+# Clave: pregunta normalizada + ids de secciones KB elegidas + huella del
+# historial que entra al prompt ("" = sin historial; ver history_key).
+# - LRU en memoria (max_entries).
+# - Persistencia opcional en JSONL (append; se compacta al crecer).
+# - Búsqueda semántica opcional: misma lista de secciones y coseno >= similarity.
+# `namespace` (modelo + huella de la KB) invalida todo si cambia cualquiera de los dos.
+
+
+def history_key(messages: Sequence[Dict[str, str]]) -> str:
+    """
+    Huella de la conversación previa (mensajes recientes + resumidos). Con
+    RESPONSE_CACHE_WITH_HISTORY, "¿y el siguiente paso?" solo comparte
+    respuesta con la misma conversación.
+    """
+    if not messages:
+        return ""
+    raw = json.dumps([[m["role"], m["content"]] for m in messages], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        max_entries: int = 256,
+        path: str = "",
+        namespace: str = "",
+        similarity: float = 0.0,
+        embed: Optional[Callable[[str], np.ndarray]] = None,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.path = path
+        self.namespace = namespace
+        self.similarity = similarity
+        self.embed = embed if similarity > 0 else None
+
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        # (secciones, huella del historial) -> claves, para la búsqueda semántica
+        self._buckets: Dict[Tuple[Tuple[str, ...], str], Set[str]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._appended = 0
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+        if self.path:
+            self._load()
+
+    # --- claves ---
+    @staticmethod
+    def make_key(question: str, section_ids: Sequence[str], history: str) -> str:
+        raw = json.dumps(
+            [normalize_text(question), list(section_ids), history],
+            ensure_ascii=False,
+        )
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    # --- consulta ---
+    def get(self, question: str, section_ids: Sequence[str], history: str) -> Optional[str]:
+        key = self.make_key(question, section_ids, history)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry["answer"]
+            bucket = list(self._buckets.get((tuple(section_ids), history), ()))
+
+        if self.embed is not None and bucket:
+            answer = self._semantic_get(question, bucket)
+            if answer is not None:
+                return answer
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _semantic_get(self, question: str, keys: List[str]) -> Optional[str]:
+        q = self.embed(question)
+        best_key, best_sim = None, self.similarity
+        with self._lock:
+            for k in keys:
+                entry = self._entries.get(k)
+                vec = entry.get("vector") if entry else None
+                if vec is None:
+                    continue
+                sim = float(np.dot(vec, q))
+                if sim >= best_sim:
+                    best_key, best_sim = k, sim
+            if best_key is None:
+                return None
+            self._entries.move_to_end(best_key)
+            self.semantic_hits += 1
+            return self._entries[best_key]["answer"]
+
+    # --- escritura ---
+    def put(self, question: str, section_ids: Sequence[str], history: str, answer: str) -> None:
+        entry = {
+            "key": self.make_key(question, section_ids, history),
+            "namespace": self.namespace,
+            "question": question,
+            "sections": list(section_ids),
+            "history": history,
+            "answer": answer,
+            "created_at": time.time(),
+        }
+        vector = self.embed(question) if self.embed is not None else None
+        with self._lock:
+            self._insert(entry, vector)
+            if self.path:
+                self._append(entry, vector)
+
+    def _insert(self, entry: Dict, vector: Optional[np.ndarray]) -> None:
+        key = entry["key"]
+        if vector is not None:
+            entry = dict(entry, vector=np.asarray(vector, dtype=np.float32))
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._buckets[(tuple(entry["sections"]), entry["history"])].add(key)
+
+        while len(self._entries) > self.max_entries:
+            old_key, old = self._entries.popitem(last=False)
+            self._buckets[(tuple(old["sections"]), old["history"])].discard(old_key)
+
+    # --- disco ---
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                # filas de antes de la huella del historial: la clave ya no coincide
+                if row.get("namespace") != self.namespace or "history" not in row:
+                    continue
+                vector = row.pop("vector", None)
+                self._insert(row, np.asarray(vector, dtype=np.float32) if vector else None)
+        self._compact()
+        print(f"[CACHE] Respuestas cargadas de disco: {len(self._entries)}")
+
+    def _row(self, entry: Dict, vector: Optional[np.ndarray]) -> str:
+        row = {k: v for k, v in entry.items() if k != "vector"}
+        if vector is not None:
+            row["vector"] = [round(float(x), 6) for x in vector]
+        return json.dumps(row, ensure_ascii=False)
+
+    def _append(self, entry: Dict, vector: Optional[np.ndarray]) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(self._row(entry, vector) + "\n")
+        self._appended += 1
+        if self._appended > self.max_entries:
+            self._compact()
+
+    def _compact(self) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for entry in self._entries.values():
+                f.write(self._row(entry, entry.get("vector")) + "\n")
+        os.replace(tmp, self.path)
+        self._appended = 0
+
+    def set_namespace(self, namespace: str) -> None:
+        """Cambió el modelo o la KB: las respuestas guardadas ya no valen."""
+        with self._lock:
+            if namespace == self.namespace:
+                return
+            self.namespace = namespace
+            self._entries.clear()
+            self._buckets.clear()
+            if self.path and os.path.exists(self.path):
+                self._compact()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Tuple
+
+# =========================================================
+# SESIONES EN EL SERVIDOR
+# =========================================================
+# El historial vive aquí, no en gr.State ni en el cliente:
+# - cada sesión guarda como mucho `max_messages` mensajes (anillo);
+# - lo que sale del anillo deja solo la pregunta del usuario en `evicted`
+#   (también acotado), que luego se resume en el prompt;
+# - las sesiones se expulsan por LRU (max_sessions) y por inactividad (ttl_s).
+# Así el tamaño por sesión y por turno es constante aunque el chat sea largo.
+
+Message = Dict[str, str]
+
+
+class Session:
+    def __init__(self, session_id: str, max_messages: int, max_evicted: int):
+        self.id = session_id
+        self.messages: Deque[Message] = deque(maxlen=max_messages)
+        self.evicted: Deque[Message] = deque(maxlen=max_evicted)
+        self.turns = 0
+        self.updated_at = time.time()
+        # un turno a la vez por sesión (doble clic, dos pestañas con la misma sesión)
+        self.turn_lock = threading.Lock()
+
+    def snapshot(self) -> Tuple[List[Message], List[Message]]:
+        """(mensajes en el anillo, preguntas ya expulsadas)."""
+        return list(self.messages), list(self.evicted)
+
+    def add_turn(self, user_msg: str, answer: str) -> None:
+        for m in ({"role": "user", "content": user_msg}, {"role": "assistant", "content": answer}):
+            if len(self.messages) == self.messages.maxlen:
+                old = self.messages.popleft()
+                if old["role"] == "user":
+                    self.evicted.append(old)
+            self.messages.append(m)
+        self.turns += 1
+        self.updated_at = time.time()
+
+
+class SessionStore:
+    def __init__(
+        self,
+        max_messages: int = 16,
+        max_evicted: int = 6,
+        max_sessions: int = 1000,
+        ttl_s: float = 3600.0,
+    ):
+        self.max_messages = max(2, max_messages)
+        self.max_evicted = max(0, max_evicted)
+        self.max_sessions = max(1, max_sessions)
+        self.ttl_s = ttl_s
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Session:
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = Session(session_id, self.max_messages, self.max_evicted)
+                self._sessions[session_id] = session
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            self._sessions.move_to_end(session_id)
+            session.updated_at = time.time()
+            return session
+
+    def clear(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _expire(self) -> None:
+        if self.ttl_s <= 0:
+            return
+        limit = time.time() - self.ttl_s
+        # el OrderedDict va del menos al más reciente
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.updated_at >= limit:
+                break
+            self._sessions.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "messages": sum(len(s.messages) for s in self._sessions.values()),
+            }
@@ -0,0 +1,126 @@
+import bisect
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# =========================================================
+# TELEMETRÍA POR TURNO
+# =========================================================
+# Cada turno del asistente produce un registro (dict) con secciones KB y scores,
+# tokens de prompt y de respuesta, tiempos de cola / prefill / decode y si vino
+# de la caché. El registro:
+#   - se agrega como una línea JSON a `path` (si está configurado);
+#   - alimenta métricas en formato de texto Prometheus (sin dependencias).
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048)
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # último = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name: str) -> List[str]:
+        out, acc = [], 0
+        for bound, n in zip(self.buckets, self.counts):
+            acc += n
+            out.append(f'{name}_bucket{{le="{bound}"}} {acc}')
+        out.append(f'{name}_bucket{{le="+Inf"}} {self.count}')
+        out.append(f"{name}_sum {self.sum:.6f}")
+        out.append(f"{name}_count {self.count}")
+        return out
+
+
+# (nombre, ayuda, buckets, clave del registro, factor para pasar a unidades base)
+HISTOGRAMS: Tuple[Tuple[str, str, Sequence[float], str, float], ...] = (
+    ("siph_assistant_prompt_tokens", "Tokens del prompt por turno", TOKEN_BUCKETS, "prompt_tokens", 1.0),
+    ("siph_assistant_new_tokens", "Tokens generados por turno", TOKEN_BUCKETS, "new_tokens", 1.0),
+    ("siph_assistant_queue_seconds", "Espera en el scheduler", LATENCY_BUCKETS, "queue_ms", 1e-3),
+    ("siph_assistant_prefill_seconds", "Prefill hasta el primer token", LATENCY_BUCKETS, "prefill_ms", 1e-3),
+    ("siph_assistant_decode_seconds", "Decode después del primer token", LATENCY_BUCKETS, "decode_ms", 1e-3),
+    ("siph_assistant_turn_seconds", "Duración total del turno", LATENCY_BUCKETS, "total_ms", 1e-3),
+)
+
+
+class Telemetry:
+    def __init__(self, path: str = ""):
+        self.path = path
+        self._lock = threading.Lock()
+        self._outcomes: Dict[str, int] = defaultdict(int)
+        self._sections: Dict[str, int] = defaultdict(int)
+        self._stops: Dict[str, int] = defaultdict(int)
+        self._histograms = {name: Histogram(buckets) for name, _, buckets, _, _ in HISTOGRAMS}
+        self._gauges: List[Tuple[str, str, Callable[[], float]]] = []
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+    def add_gauge(self, name: str, help_text: str, read: Callable[[], float]) -> None:
+        self._gauges.append((name, help_text, read))
+
+    def record(self, turn: Dict) -> None:
+        turn.setdefault("ts", round(time.time(), 3))
+        line = json.dumps(turn, ensure_ascii=False) if self.path else ""
+        with self._lock:
+            self._outcomes[turn.get("outcome", "desconocido")] += 1
+            for s in turn.get("sections", []):
+                self._sections[s["id"]] += 1
+            if turn.get("stop_reason"):
+                self._stops[turn["stop_reason"]] += 1
+            for name, _, _, key, factor in HISTOGRAMS:
+                value = turn.get(key)
+                if value is not None:
+                    self._histograms[name].observe(value * factor)
+            if line:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+
+    def prometheus(self) -> str:
+        out: List[str] = []
+        with self._lock:
+            out += [
+                "# HELP siph_assistant_turns_total Turnos por resultado (model, fast_path, cache, loading, timeout, error)",
+                "# TYPE siph_assistant_turns_total counter",
+            ]
+            out += [f'siph_assistant_turns_total{{outcome="{k}"}} {v}' for k, v in sorted(self._outcomes.items())]
+            total = sum(self._outcomes.values())
+            out += [
+                "# HELP siph_assistant_fast_path_ratio Parte de los turnos respondidos desde el KB sin el modelo",
+                "# TYPE siph_assistant_fast_path_ratio gauge",
+                f"siph_assistant_fast_path_ratio {self._outcomes.get('fast_path', 0) / total if total else 0.0:.4f}",
+            ]
+            out += [
+                "# HELP siph_assistant_section_selected_total Veces que cada sección KB quedó en el ranking del turno",
+                "# TYPE siph_assistant_section_selected_total counter",
+            ]
+            out += [
+                f'siph_assistant_section_selected_total{{section="{k}"}} {v}'
+                for k, v in sorted(self._sections.items())
+            ]
+            out += [
+                "# HELP siph_assistant_stop_total Motivo de fin (eos, budget, stop_sequence, structure)",
+                "# TYPE siph_assistant_stop_total counter",
+            ]
+            out += [
+                f'siph_assistant_stop_total{{reason="{k}"}} {v}' for k, v in sorted(self._stops.items())
+            ]
+            for name, help_text, _, _, _ in HISTOGRAMS:
+                out += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                out += self._histograms[name].lines(name)
+        for name, help_text, read in self._gauges:
+            try:
+                value = float(read())
+            except Exception:
+                continue
+            out += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+        return "\n".join(out) + "\n"
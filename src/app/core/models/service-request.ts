@@ -68,6 +68,12 @@ export interface ServiceRequest {
   contact_pref?: ContactPref | null;
 
   status: RequestStatus;
+
+  // 🧭 Matching
+  assigned_tech_id?: number | null;
+  assigned_at?: string | null;
+  match_score?: number | null;
+
   created_at?: string;
   updated_at?: string;
 }
@@ -1,2 +1,33 @@
+export type TechLevel = 'BASIC' | 'TRUST' | 'PRO' | 'PAY';
+
+// ✅ Directorio público (/workers)
 export interface Worker {
+  tech_id: number;
+  public_name: string;
+  public_photo_url?: string | null;
+  city?: string | null;
+  radius_km?: number | null;
+  categories: string[];
+
+  specialty?: string | null;
+  years_experience?: number | null;
+  bio?: string | null;
+
+  badge_level: TechLevel;
+  rating?: number | null;
+  reviews_count: number;
+
+  verified_at?: string | null;
+}
+
+export interface WorkerDirectoryPage {
+  items: Worker[];
+  next_cursor?: string | null;
+}
+
+export interface WorkerDirectoryQuery {
+  city?: string;
+  category?: string;
+  limit?: number;
+  cursor?: string | null;
 }
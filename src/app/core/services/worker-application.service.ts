@@ -48,6 +48,33 @@ export interface AdminWorkerApplication extends WorkerApplication {
   user?: AuthUser | null;
 }
 
+export type AdminSortKey = 'updated_at' | 'name' | 'status' | 'years_experience';
+
+export interface WorkerAppStatusCounts {
+  PENDING: number;
+  APPROVED: number;
+  REJECTED: number;
+  total: number;
+}
+
+/**
+ * ✅ Listado admin paginado (keyset): orden en servidor + conteos por estado
+ */
+export interface AdminWorkerApplicationPage {
+  items: AdminWorkerApplication[];
+  next_cursor?: string | null;
+  counts: WorkerAppStatusCounts;
+}
+
+export interface AdminListQuery {
+  status_filter?: WorkerAppStatus;
+  q?: string;
+  sort?: AdminSortKey;
+  order?: 'asc' | 'desc';
+  limit?: number;
+  cursor?: string | null;
+}
+
 /**
  * ✅ Backend espera: { decision: 'APPROVE'|'REJECT', admin_notes? }
  */
@@ -70,16 +97,27 @@ export class WorkerApplicationService {
     return this.http.get<WorkerApplication>(`${this.baseUrl}/worker-applications/me`);
   }
 
-  adminList(status_filter?: WorkerAppStatus): Observable<AdminWorkerApplication[]> {
+  adminList(query: AdminListQuery = {}): Observable<AdminWorkerApplicationPage> {
     let params = new HttpParams();
-    if (status_filter) params = params.set('status_filter', status_filter);
-
-    return this.http.get<AdminWorkerApplication[]>(
+    if (query.status_filter) params = params.set('status_filter', query.status_filter);
+    if (query.q) params = params.set('q', query.q);
+    if (query.sort) params = params.set('sort', query.sort);
+    if (query.order) params = params.set('order', query.order);
+    if (query.limit) params = params.set('limit', query.limit);
+    if (query.cursor) params = params.set('cursor', query.cursor);
+
+    return this.http.get<AdminWorkerApplicationPage>(
       `${this.baseUrl}/admin/worker-applications`,
       { params }
     );
   }
 
+  adminGet(appId: number): Observable<AdminWorkerApplication> {
+    return this.http.get<AdminWorkerApplication>(
+      `${this.baseUrl}/admin/worker-applications/${appId}`
+    );
+  }
+
   adminDecide(appId: number, payload: WorkerApplicationDecision): Observable<AdminWorkerApplication> {
     return this.http.patch<AdminWorkerApplication>(
       `${this.baseUrl}/admin/worker-applications/${appId}`,
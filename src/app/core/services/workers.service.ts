@@ -1,9 +1,29 @@
 import { Injectable } from '@angular/core';
+import { HttpClient, HttpParams } from '@angular/common/http';
+import { Observable } from 'rxjs';
+import { environment } from '../../../environments/environment';
+import { Worker, WorkerDirectoryPage, WorkerDirectoryQuery } from '../models/worker';
 
 @Injectable({
   providedIn: 'root'
 })
 export class WorkersService {
+  private base = environment.apiUrl || 'http://localhost:8000';
 
-  constructor() { }
+  constructor(private http: HttpClient) { }
+
+  // ✅ keyset pagination: pasa next_cursor de la página anterior
+  list(query: WorkerDirectoryQuery = {}): Observable<WorkerDirectoryPage> {
+    let params = new HttpParams();
+    if (query.city) params = params.set('city', query.city);
+    if (query.category) params = params.set('category', query.category);
+    if (query.limit) params = params.set('limit', query.limit);
+    if (query.cursor) params = params.set('cursor', query.cursor);
+
+    return this.http.get<WorkerDirectoryPage>(`${this.base}/workers`, { params });
+  }
+
+  get(techId: number): Observable<Worker> {
+    return this.http.get<Worker>(`${this.base}/workers/${techId}`);
+  }
 }
@@ -71,10 +71,10 @@ export class WorkerApplicationAdminDetailComponent implements OnInit {
     this.errorMsg = '';
     this.toastMsg = '';
 
-    this.api.adminList().subscribe({
+    // ✅ detalle directo (antes se descargaba todo el listado)
+    this.api.adminGet(this.id).subscribe({
       next: (data) => {
-        const list = data ?? [];
-        const found = list.find((x: any) => Number(x?.id) === this.id) ?? null;
+        const found = data ?? null;
 
         if (!found) {
           this.app = null;
@@ -105,9 +105,12 @@ export class WorkerApplicationAdminDetailComponent implements OnInit {
       },
       error: (err) => {
         this.loading = false;
+        this.app = null;
         this.errorMsg =
-          err?.error?.detail ||
-          'No se pudo cargar el detalle. Revisa backend y sesión.';
+          err?.status === 404
+            ? `No se encontró la solicitud #${this.id}.`
+            : err?.error?.detail ||
+              'No se pudo cargar el detalle. Revisa backend y sesión.';
       },
     });
   }
@@ -1,4 +1,4 @@
-import { Component, OnInit } from '@angular/core';
+import { Component, OnDestroy, OnInit } from '@angular/core';
 import { CommonModule } from '@angular/common';
 import { FormsModule } from '@angular/forms';
 import { Router } from '@angular/router';
@@ -7,7 +7,9 @@ import { forkJoin, of, catchError } from 'rxjs';
 import {
   WorkerApplicationService,
   AdminWorkerApplication,
+  AdminSortKey,
   WorkerAppStatus,
+  WorkerAppStatusCounts,
 } from '../../../../core/services/worker-application.service';
 
 // UI Components
@@ -21,6 +23,10 @@ import { AdminAppsTableComponent } from './ui/admin-apps-table/admin-apps-table.
 type FilterStatus = WorkerAppStatus | 'ALL';
 type Decision = 'APPROVE' | 'REJECT';
 
+const PAGE_SIZE = 50;
+// la búsqueda va al servidor: espera a que el admin deje de escribir
+const SEARCH_DEBOUNCE_MS = 300;
+
 @Component({
   selector: 'app-worker-applications-admin',
   standalone: true,
@@ -37,9 +43,14 @@ type Decision = 'APPROVE' | 'REJECT';
   templateUrl: './worker-applications-admin.component.html',
   styleUrl: './worker-applications-admin.component.scss',
 })
-export class WorkerApplicationsAdminComponent implements OnInit {
+export class WorkerApplicationsAdminComponent implements OnInit, OnDestroy {
   apps: AdminWorkerApplication[] = [];
 
+  // paginación (keyset) + conteos del servidor
+  nextCursor: string | null = null;
+  loadingMore = false;
+  serverCounts: WorkerAppStatusCounts = { PENDING: 0, APPROVED: 0, REJECTED: 0, total: 0 };
+
   loading = false;
   errorMsg = '';
   toastMsg = '';
@@ -49,9 +60,12 @@ export class WorkerApplicationsAdminComponent implements OnInit {
   notesById: Record<number, string> = {};
   busyById: Record<number, boolean> = {};
 
-  // búsqueda / orden
+  // búsqueda / orden (en el servidor)
   searchTerm = '';
-  sortKey: 'updated_at' | 'name' | 'status' | 'years_experience' = 'updated_at';
+  private searchTimer: ReturnType<typeof setTimeout> | null = null;
+  // descarta respuestas de listados viejos (otra búsqueda / filtro / orden)
+  private listSeq = 0;
+  sortKey: AdminSortKey = 'updated_at';
   sortDir: 'asc' | 'desc' = 'desc';
 
   // selección
@@ -64,27 +78,30 @@ export class WorkerApplicationsAdminComponent implements OnInit {
     this.load();
   }
 
+  ngOnDestroy(): void {
+    if (this.searchTimer) clearTimeout(this.searchTimer);
+  }
+
   load(): void {
+    const seq = ++this.listSeq;
     this.loading = true;
     this.errorMsg = '';
     this.toastMsg = '';
 
-    const status = this.statusFilter === 'ALL' ? undefined : this.statusFilter;
-
-    this.api.adminList(status).subscribe({
-      next: (data) => {
-        this.apps = data ?? [];
+    this.api.adminList(this.listQuery()).subscribe({
+      next: (page) => {
+        if (seq !== this.listSeq) return;
+        this.apps = page?.items ?? [];
+        this.nextCursor = page?.next_cursor ?? null;
+        if (page?.counts) this.serverCounts = page.counts;
 
-        for (const a of this.apps) {
-          if (this.notesById[a.id] == null) {
-            this.notesById[a.id] = a.admin_notes ?? '';
-          }
-        }
+        this.syncNotes(this.apps);
 
         this.selectedIds.clear();
         this.loading = false;
       },
       error: (err) => {
+        if (seq !== this.listSeq) return;
         this.loading = false;
         this.errorMsg =
           err?.error?.detail ||
@@ -93,66 +110,89 @@ export class WorkerApplicationsAdminComponent implements OnInit {
     });
   }
 
-  // KPIs
-  get counts() {
-    const pending = this.apps.filter((a) => a.status === 'PENDING').length;
-    const approved = this.apps.filter((a) => a.status === 'APPROVED').length;
-    const rejected = this.apps.filter((a) => a.status === 'REJECTED').length;
-    return { pending, approved, rejected };
+  loadMore(): void {
+    if (!this.nextCursor || this.loadingMore) return;
+
+    const seq = this.listSeq;
+    this.loadingMore = true;
+    this.errorMsg = '';
+
+    this.api.adminList(this.listQuery(this.nextCursor)).subscribe({
+      next: (page) => {
+        this.loadingMore = false;
+        if (seq !== this.listSeq) return;
+        const more = page?.items ?? [];
+        this.apps = [...this.apps, ...more];
+        this.nextCursor = page?.next_cursor ?? null;
+        if (page?.counts) this.serverCounts = page.counts;
+
+        this.syncNotes(more);
+      },
+      error: (err) => {
+        this.loadingMore = false;
+        this.errorMsg = err?.error?.detail || 'No se pudieron cargar más solicitudes.';
+      },
+    });
   }
 
-  // listado filtrado/ordenado
-  get viewApps(): AdminWorkerApplication[] {
-    const q = (this.searchTerm || '').trim().toLowerCase();
-    let list = [...(this.apps ?? [])];
-
-    if (q) {
-      list = list.filter((a) => {
-        const name = this.userName(a).toLowerCase();
-        const email = (a.user?.email || '').toLowerCase();
-        const city = (a.city || '').toLowerCase();
-        const spec = (a.specialty || '').toLowerCase();
-        const bio = (a.bio || '').toLowerCase();
-        return (
-          name.includes(q) ||
-          email.includes(q) ||
-          city.includes(q) ||
-          spec.includes(q) ||
-          bio.includes(q)
-        );
-      });
-    }
+  private listQuery(cursor?: string | null) {
+    return {
+      status_filter: this.statusFilter === 'ALL' ? undefined : this.statusFilter,
+      q: this.searchTerm.trim() || undefined,
+      sort: this.sortKey,
+      order: this.sortDir,
+      limit: PAGE_SIZE,
+      cursor: cursor ?? null,
+    };
+  }
 
-    const dir = this.sortDir === 'asc' ? 1 : -1;
+  private syncNotes(list: AdminWorkerApplication[]): void {
+    for (const a of list) {
+      if (this.notesById[a.id] == null) {
+        this.notesById[a.id] = a.admin_notes ?? '';
+      }
+    }
+  }
 
-    list.sort((a, b) => {
-      switch (this.sortKey) {
-        case 'name':
-          return this.userName(a).localeCompare(this.userName(b)) * dir;
+  onStatusFilterChange(status: FilterStatus): void {
+    this.statusFilter = status;
+    this.load();
+  }
 
-        case 'status':
-          return ((a.status || '') as string).localeCompare((b.status || '') as string) * dir;
+  onSortKeyChange(key: AdminSortKey): void {
+    this.sortKey = key;
+    this.load();
+  }
 
-        case 'years_experience':
-          return ((a.years_experience ?? 0) - (b.years_experience ?? 0)) * dir;
+  // KPIs (✅ conteos globales del servidor, no solo de la página cargada)
+  get counts() {
+    return {
+      pending: this.serverCounts.PENDING,
+      approved: this.serverCounts.APPROVED,
+      rejected: this.serverCounts.REJECTED,
+    };
+  }
 
-        default: {
-          const da = new Date(a.updated_at).getTime() || 0;
-          const db = new Date(b.updated_at).getTime() || 0;
-          return (da - db) * dir;
-        }
-      }
-    });
+  // listado: búsqueda y orden ya vienen del servidor (mismo orden que el cursor)
+  get viewApps(): AdminWorkerApplication[] {
+    return this.apps ?? [];
+  }
 
-    return list;
+  onSearchTermChange(term: string): void {
+    this.searchTerm = term;
+    if (this.searchTimer) clearTimeout(this.searchTimer);
+    this.searchTimer = setTimeout(() => this.load(), SEARCH_DEBOUNCE_MS);
   }
 
   clearSearch(): void {
+    if (this.searchTimer) clearTimeout(this.searchTimer);
     this.searchTerm = '';
+    this.load();
   }
 
   toggleSortDir(): void {
     this.sortDir = this.sortDir === 'asc' ? 'desc' : 'asc';
+    this.load();
   }
 
   // selección